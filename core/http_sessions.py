@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP Session Registry
+مدیریت sessionهای ماندگار aiohttp بر اساس کاربرد (market، news، media، ...)
+هر پروفایل connector، DNS cache و timeout مخصوص خود را دارد و اتصال‌های TCP/TLS
+بین درخواست‌ها دوباره استفاده می‌شوند.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+BROWSER_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+)
+
+# پروفایل‌های پیش‌فرض sessionها
+DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'limit': 50, 'limit_per_host': 10, 'ttl_dns_cache': 300, 'timeout': 15},
+    'market': {'limit': 20, 'limit_per_host': 5, 'ttl_dns_cache': 600, 'timeout': 10},
+    'news': {
+        'limit': 30, 'limit_per_host': 4, 'ttl_dns_cache': 600, 'timeout': 15,
+        'headers': {'User-Agent': 'Mozilla/5.0 (compatible; BotNewsFetcher/1.0)'},
+    },
+    'media': {
+        'limit': 10, 'limit_per_host': 4, 'ttl_dns_cache': 600, 'timeout': 30, 'ssl': False,
+        'headers': {'User-Agent': BROWSER_USER_AGENT},
+    },
+    'tradingview': {
+        'limit': 20, 'limit_per_host': 8, 'ttl_dns_cache': 600, 'timeout': 15,
+        'headers': {'User-Agent': BROWSER_USER_AGENT},
+    },
+    'sports': {'limit': 20, 'limit_per_host': 6, 'ttl_dns_cache': 600, 'timeout': 15},
+    'ocr': {'limit': 10, 'limit_per_host': 4, 'ttl_dns_cache': 600, 'timeout': 60},
+    'external_api': {'limit': 30, 'limit_per_host': 10, 'ttl_dns_cache': 300, 'timeout': 60, 'trust_env': True},
+    'function_proxy': {'limit': 20, 'limit_per_host': 20, 'ttl_dns_cache': 300, 'timeout': 3600, 'trust_env': True},
+}
+
+
+class HttpSessionRegistry:
+    """رجیستری sessionهای مشترک aiohttp با آمار استفاده مجدد از اتصال‌ها"""
+
+    def __init__(self, profiles: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.profiles: Dict[str, Dict[str, Any]] = {
+            name: dict(options) for name, options in (profiles or DEFAULT_PROFILES).items()
+        }
+        # کلید: (نام پروفایل، شناسه event loop) - سرور health در thread جداگانه loop خودش را دارد
+        self._sessions: Dict[Tuple[str, int], aiohttp.ClientSession] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self.started_at: Optional[float] = None
+
+    # -----------------------------
+    # 📌 تنظیمات پروفایل
+    # -----------------------------
+    def register(self, name: str, **options: Any) -> None:
+        """ثبت یا بازنویسی پروفایل session"""
+        self.profiles[name] = options
+
+    def _profile(self, name: str) -> Dict[str, Any]:
+        return self.profiles.get(name) or self.profiles['default']
+
+    def _metric(self, name: str) -> Dict[str, float]:
+        if name not in self._metrics:
+            self._metrics[name] = {
+                'requests': 0,
+                'connections_created': 0,
+                'connections_reused': 0,
+                'errors': 0,
+                'total_latency': 0.0,
+            }
+        return self._metrics[name]
+
+    def _build_trace_config(self, name: str) -> aiohttp.TraceConfig:
+        """ثبت رویدادهای اتصال برای محاسبه نرخ استفاده مجدد"""
+        trace_config = aiohttp.TraceConfig()
+        metric = self._metric(name)
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.monotonic()
+            metric['requests'] += 1
+
+        async def on_request_end(session, ctx, params):
+            metric['total_latency'] += time.monotonic() - getattr(ctx, 'started', time.monotonic())
+
+        async def on_request_exception(session, ctx, params):
+            metric['errors'] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            metric['connections_created'] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            metric['connections_reused'] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _create_session(self, name: str) -> aiohttp.ClientSession:
+        profile = self._profile(name)
+        connector = aiohttp.TCPConnector(
+            limit=profile.get('limit', 50),
+            limit_per_host=profile.get('limit_per_host', 10),
+            ttl_dns_cache=profile.get('ttl_dns_cache', 300),
+            ssl=profile.get('ssl', None),
+            keepalive_timeout=profile.get('keepalive_timeout', 30),
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=profile.get('timeout', 15)),
+            headers=profile.get('headers'),
+            trust_env=profile.get('trust_env', False),
+            trace_configs=[self._build_trace_config(name)],
+        )
+
+    # -----------------------------
+    # 📌 دسترسی به sessionها
+    # -----------------------------
+    def get(self, name: str = 'default') -> aiohttp.ClientSession:
+        """دریافت session مشترک (در صورت نیاز ساخته می‌شود)"""
+        loop = asyncio.get_running_loop()
+        key = (name, id(loop))
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = self._create_session(name)
+            self._sessions[key] = session
+        return session
+
+    @asynccontextmanager
+    async def session(self, name: str = 'default'):
+        """
+        جایگزین `async with aiohttp.ClientSession() as session`
+        session مشترک را برمی‌گرداند و در پایان بسته نمی‌شود.
+        """
+        yield self.get(name)
+
+    async def start(self, names: Optional[list] = None) -> None:
+        """باز کردن sessionها هنگام راه‌اندازی برنامه"""
+        for name in names or list(self.profiles.keys()):
+            self.get(name)
+        self.started_at = time.time()
+        logger.info(f"🌐 {len(self._sessions)} session HTTP مشترک آماده شد")
+
+    async def close(self) -> None:
+        """بستن تمام sessionهای event loop جاری هنگام خاموشی"""
+        loop_id = id(asyncio.get_running_loop())
+        for key in [k for k in self._sessions if k[1] == loop_id]:
+            session = self._sessions.pop(key)
+            if not session.closed:
+                await session.close()
+        # فرصت برای بسته شدن اتصال‌های TLS
+        await asyncio.sleep(0.25)
+        logger.info("🌐 sessionهای HTTP بسته شدند")
+
+    # -----------------------------
+    # 📌 آمار
+    # -----------------------------
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """آمار درخواست‌ها و استفاده مجدد از اتصال برای هر پروفایل"""
+        result = {}
+        for name, metric in self._metrics.items():
+            connections = metric['connections_created'] + metric['connections_reused']
+            requests_count = metric['requests']
+            result[name] = {
+                'requests': int(requests_count),
+                'connections_created': int(metric['connections_created']),
+                'connections_reused': int(metric['connections_reused']),
+                'reuse_ratio': round(metric['connections_reused'] / connections, 3) if connections else 0.0,
+                'errors': int(metric['errors']),
+                'avg_latency_ms': round(metric['total_latency'] * 1000 / requests_count, 1) if requests_count else 0.0,
+            }
+        return result
+
+    def format_metrics(self) -> str:
+        """متن خلاصه آمار برای پنل ادمین"""
+        metrics = self.get_metrics()
+        if not metrics:
+            return "• هنوز درخواستی ثبت نشده"
+        lines = []
+        for name, data in sorted(metrics.items()):
+            lines.append(
+                f"• {name.replace('_', '-')}: {data['requests']} درخواست، "
+                f"استفاده مجدد {data['reuse_ratio'] * 100:.0f}٪، "
+                f"{data['errors']} خطا، {data['avg_latency_ms']}ms"
+            )
+        return "\n".join(lines)
+
+
+http_sessions = HttpSessionRegistry()
@@ -14,7 +14,6 @@ import logging
 import json
 import os
 import re
-import difflib
 import datetime
 import asyncio
 import requests
@@ -25,12 +24,13 @@ from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import (Application, CommandHandler, ContextTypes, 
                           MessageHandler, filters, CallbackQueryHandler, ConversationHandler)
+from telegram.error import BadRequest
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 import pytz
 import dateutil.parser as parser  # For datetime conversion
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # Load environment variables
 load_dotenv()
@@ -54,15 +54,21 @@ from handlers.public import (
     PublicMenuManager
 )
 from core.logger_system import bot_logger
+from core.http_sessions import http_sessions
 from handlers.ai.ai_chat_handler import GeminiChatHandler, AIChatStateManager
 from handlers.ai.ai_image_generator import AIImageGenerator
 from handlers.ai.ocr_handler import OCRHandler
 from handlers.sports import SportsHandler
 from services.crypto_service import (
-    fetch_fear_greed_index,
-    download_fear_greed_chart,
+    fear_greed_service,
     format_fear_greed_message
 )
+from services.market_snapshot_service import market_snapshot_service
+from services.price_history_service import price_history_service
+from services.media_cache_service import media_cache
+from services.symbol_index_service import symbol_index
+from services.price_alert_service import price_alert_service, describe_alert, format_price
+from services.ocr_service import ocr_service
 from services.spam_service import (
     check_spam_and_handle,
     send_spam_block_notification,
@@ -118,6 +124,8 @@ gemini_chat = GeminiChatHandler(db_manager=db_manager)
 ai_chat_state = AIChatStateManager(db_manager)
 ai_image_gen = AIImageGenerator()
 ocr_handler = OCRHandler()
+# فاصله بروزرسانی پیام جایگاه در صف OCR (ثانیه)
+OCR_POSITION_UPDATE_INTERVAL = 5
 
 # Initialize Sports Handler
 sports_handler = SportsHandler(db_manager=db_manager)
@@ -125,6 +133,7 @@ sports_handler = SportsHandler(db_manager=db_manager)
 # Initialize TradingView fetcher if available
 if TRADINGVIEW_AVAILABLE and TradingViewAnalysisFetcher:
     tradingview_fetcher = TradingViewAnalysisFetcher()
+    admin_panel.set_tradingview_fetcher(tradingview_fetcher)
 else:
     tradingview_fetcher = None
 
@@ -132,6 +141,14 @@ SPORTS_REMINDER_STATE_KEY = "sports_reminder_state"
 SPORTS_REMINDER_CANCEL_WORDS = {"انصراف", "لغو", "cancel", "Cancel"}
 TEHRAN_TZ = pytz.timezone('Asia/Tehran')
 
+# موضوعات اشتراک اخبار (ترتیب این دیکشنری ترتیب ارسال است)
+NEWS_TOPICS: Dict[str, str] = {
+    'general': '📺 اخبار عمومی',
+    'crypto': '💰 اخبار کریپتو',
+    'ai': '🤖 اخبار هوش مصنوعی',
+    'sports': '⚽ اخبار ورزشی',
+}
+
 SPORTS_REMINDERS_DISABLED = True
 SPORTS_REMINDER_MAINTENANCE_MESSAGE = (
     "⏳ این بخش در حال به‌روزرسانی است."
@@ -176,314 +193,6 @@ async def check_spam_and_handle_wrapper(update: Update, context: ContextTypes.DE
 # Keep original function name for compatibility
 check_spam_and_handle = check_spam_and_handle_wrapper
 
-# Functions for Fear & Greed Index
-async def fetch_fear_greed_index():
-    """دریافت شاخص ترس و طمع بازار کریپتو از alternative.me"""
-    import aiohttp
-    import json
-    from datetime import datetime
-    
-    try:
-        # API alternative.me برای شاخص ترس و طمع
-        api_url = "https://api.alternative.me/fng/"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if data and 'data' in data and len(data['data']) > 0:
-                        index_data = data['data'][0]
-                        
-                        # استخراج اطلاعات
-                        value = int(index_data['value'])
-                        classification = index_data['value_classification']
-                        timestamp = int(index_data['timestamp'])
-                        
-                        # تبدیل timestamp به تاریخ
-                        update_time = datetime.fromtimestamp(timestamp)
-                        
-                        # تعیین ایموجی و رنگ براساس مقدار
-                        if value <= 20:
-                            emoji = "😱"
-                            mood = "ترس شدید"
-                            color = "🔴"
-                        elif value <= 40:
-                            emoji = "😰"
-                            mood = "ترس"
-                            color = "🟠"
-                        elif value <= 60:
-                            emoji = "😐"
-                            mood = "خنثی"
-                            color = "🟡"
-                        elif value <= 80:
-                            emoji = "😊"
-                            mood = "طمع"
-                            color = "🟢"
-                        else:
-                            emoji = "🤑"
-                            mood = "طمع شدید"
-                            color = "💚"
-                        
-                        return {
-                            'value': value,
-                            'classification': classification,
-                            'mood_fa': mood,
-                            'emoji': emoji,
-                            'color': color,
-                            'update_time': update_time,
-                            'success': True
-                        }
-                    else:
-                        raise Exception("Invalid API response format")
-                else:
-                    raise Exception(f"API request failed with status {response.status}")
-                    
-    except Exception as e:
-        print(f"خطا در دریافت شاخص ترس و طمع: {e}")
-        return {
-            'value': 50,
-            'classification': 'Neutral',
-            'mood_fa': 'خنثی',
-            'emoji': '😐',
-            'color': '🟡',
-            'update_time': datetime.now(),
-            'success': False,
-            'error': str(e)
-        }
-
-async def download_fear_greed_chart():
-    """دانلود تصویر چارت شاخص ترس و طمع از منابع مختلف"""
-    import aiohttp
-    import os
-    import tempfile
-    
-    # لیست منابع مختلف برای تصویر
-    image_sources = [
-        "https://alternative.me/crypto/fear-and-greed-index.png",
-        "https://alternative.me/images/fng/crypto-fear-and-greed-index.png", 
-        "https://api.alternative.me/fng/png"
-    ]
-    
-    # استفاده از پوشه موقت سیستم برای جلوگیری از مشکلات مجوز
-    temp_dir = tempfile.gettempdir()
-    chart_path = os.path.join(temp_dir, "fear_greed_chart.png")
-    
-    # Headers برای شبیه‌سازی درخواست مرورگر
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
-        'Accept': 'image/png,image/webp,image/jpeg,image/*,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Sec-Fetch-Dest': 'image',
-        'Sec-Fetch-Mode': 'no-cors',
-        'Sec-Fetch-Site': 'cross-site',
-    }
-    
-    for i, chart_url in enumerate(image_sources, 1):
-        try:
-            print(f"تلاش {i}: دانلود از {chart_url}")
-            
-            async with aiohttp.ClientSession(
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
-                connector=aiohttp.TCPConnector(ssl=False)
-            ) as session:
-                async with session.get(chart_url) as response:
-                    print(f"وضعیت پاسخ: {response.status}")
-                    
-                    if response.status == 200:
-                        content = await response.read()
-                        print(f"حجم محتوا: {len(content)} بایت")
-                        
-                        # بررسی اینکه محتوا یک تصویر واقعی است
-                        if len(content) > 1000:  # حداقل 1KB برای تصویر
-                            # بررسی magic bytes برای PNG
-                            if content.startswith(b'\x89PNG') or content.startswith(b'\xff\xd8\xff'):
-                                with open(chart_path, 'wb') as f:
-                                    f.write(content)
-                                
-                                if os.path.exists(chart_path) and os.path.getsize(chart_path) > 1000:
-                                    print(f"✅ تصویر با موفقیت دانلود شد: {chart_path}")
-                                    return chart_path
-                                else:
-                                    print("❌ مشکل در ذخیره فایل")
-                            else:
-                                print("❌ محتوا تصویر معتبری نیست")
-                        else:
-                            print(f"❌ حجم محتوا خیلی کم است: {len(content)} بایت")
-                    else:
-                        print(f"❌ کد خطای HTTP: {response.status}")
-                        
-        except Exception as e:
-            print(f"❌ خطا در منبع {i}: {e}")
-            continue
-    
-    print("❌ هیچ منبعی کار نکرد - ایجاد تصویر ساده...")
-    return await create_simple_fear_greed_image()
-
-async def create_simple_fear_greed_image():
-    """ایجاد تصویر ساده شاخص ترس و طمع"""
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-        import math
-        import os
-        
-        # دریافت مقدار فعلی شاخص
-        index_data = await fetch_fear_greed_index()
-        value = index_data.get('value', 50)
-        
-        # ایجاد canvas
-        width, height = 400, 300
-        img = Image.new('RGB', (width, height), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        # رنگ براساس مقدار
-        if value <= 25:
-            color = '#FF0000'  # قرمز - ترس شدید
-        elif value <= 45:
-            color = '#FF8000'  # نارنجی - ترس
-        elif value <= 55:
-            color = '#FFFF00'  # زرد - خنثی
-        elif value <= 75:
-            color = '#80FF00'  # سبز روشن - طمع
-        else:
-            color = '#00FF00'  # سبز - طمع شدید
-        
-        # رسم دایره اصلی
-        center_x, center_y = width // 2, height // 2 + 20
-        radius = 100
-        
-        # رسم قوس نیم دایره
-        for angle in range(180):
-            end_x = center_x + radius * math.cos(math.radians(180 - angle))
-            end_y = center_y - radius * math.sin(math.radians(180 - angle))
-            
-            # رنگ گرادیانت
-            progress = angle / 180
-            if progress < 0.25:
-                arc_color = '#FF0000'
-            elif progress < 0.45:
-                arc_color = '#FF8000'
-            elif progress < 0.55:
-                arc_color = '#FFFF00'
-            elif progress < 0.75:
-                arc_color = '#80FF00'
-            else:
-                arc_color = '#00FF00'
-            
-            draw.line([(center_x, center_y), (end_x, end_y)], fill=arc_color, width=3)
-        
-        # رسم عقربه
-        needle_angle = 180 - (value * 180 / 100)
-        needle_x = center_x + (radius - 10) * math.cos(math.radians(needle_angle))
-        needle_y = center_y - (radius - 10) * math.sin(math.radians(needle_angle))
-        draw.line([(center_x, center_y), (needle_x, needle_y)], fill='black', width=5)
-        
-        # نوشتن متن
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-        except:
-            font = ImageFont.load_default()
-        
-        # نوشتن مقدار
-        text = f"{value}"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        draw.text((center_x - text_width//2, center_y + 30), text, fill='black', font=font)
-        
-        # نوشتن برچسب‌ها
-        try:
-            small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-        except:
-            small_font = ImageFont.load_default()
-        
-        draw.text((30, center_y + 10), "Fear", fill='red', font=small_font)
-        draw.text((width - 70, center_y + 10), "Greed", fill='green', font=small_font)
-        
-        # ذخیره فایل در پوشه موقت سیستم
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        chart_path = os.path.join(temp_dir, "fear_greed_chart.png")
-        img.save(chart_path, 'PNG')
-        
-        if os.path.exists(chart_path):
-            print(f"✅ تصویر ساده ایجاد شد: {chart_path}")
-            return chart_path
-        else:
-            print("❌ مشکل در ایجاد تصویر ساده")
-            return None
-            
-    except Exception as e:
-        print(f"❌ خطا در ایجاد تصویر ساده: {e}")
-        return None
-
-def format_fear_greed_message(index_data):
-    """فرمت کردن پیام شاخص ترس و طمع"""
-    
-    if not index_data['success']:
-        return f"""😨 شاخص ترس و طمع بازار کریپتو
-
-❌ متاسفانه در حال حاضر امکان دریافت اطلاعات وجود ندارد.
-
-🔄 لطفاً چند دقیقه بعد دوباره تلاش کنید.
-
-📊 منبع: Alternative.me"""
-
-    # توضیحات براساس مقدار شاخص
-    if index_data['value'] <= 20:
-        description = """🔍 وضعیت بازار:
-• سطح ترس بسیار بالا در بازار
-• احتمال فرصت خرید مناسب
-• سرمایه‌گذاران بسیار محتاط هستند
-• قیمت‌ها ممکن است به کف رسیده باشند"""
-    elif index_data['value'] <= 40:
-        description = """🔍 وضعیت بازار:
-• سطح ترس نسبتاً بالا
-• بازار در حالت فروش
-• سرمایه‌گذاران نگران هستند  
-• ممکن است فرصت خرید باشد"""
-    elif index_data['value'] <= 60:
-        description = """🔍 وضعیت بازار:
-• بازار در حالت خنثی و متعادل
-• عدم وجود احساسات شدید
-• تصمیم‌گیری براساس تحلیل تکنیکال
-• وضعیت نرمال بازار"""
-    elif index_data['value'] <= 80:
-        description = """🔍 وضعیت بازار:
-• سطح طمع نسبتاً بالا
-• بازار در حالت خرید
-• سرمایه‌گذاران خوش‌بین هستند
-• احتمال اصلاح قیمت وجود دارد"""
-    else:
-        description = """🔍 وضعیت بازار:
-• سطح طمع بسیار بالا
-• احتمال حباب قیمتی
-• سرمایه‌گذاران بسیار خوش‌بین
-• زمان مناسب برای فروش ممکن است"""
-
-    # فرمت پیام نهایی
-    message = f"""😨 شاخص ترس و طمع بازار کریپتو
-
-{index_data['color']} <b>مقدار فعلی: {index_data['value']}/100</b>
-
-{index_data['emoji']} <b>وضعیت: {index_data['mood_fa']}</b>
-
-{description}
-
-📅 آخرین به‌روزرسانی: {index_data['update_time'].strftime('%Y/%m/%d - %H:%M')}
-
-📊 منبع: Alternative.me Fear & Greed Index
-
-⚠️ توجه: این شاخص صرفاً جهت اطلاع‌رسانی است و توصیه سرمایه‌گذاری نمی‌باشد."""
-
-    return message
-
-
-
-
-
 # Signal message formatting removed - will be re-implemented later
 
 # Handler برای دستور /start
@@ -736,6 +445,16 @@ async def tradingview_analysis_process(update: Update, context: ContextTypes.DEF
             await update.message.reply_text("❌ سرویس تحلیل TradingView در دسترس نیست.")
             return ConversationHandler.END
         
+        # جفت ارز ناموجود: پیشنهاد نزدیک‌ترین جفت ارزها بدون درخواست به TradingView
+        if not symbol_index.is_valid_pair(message_clean):
+            suggestions = symbol_index.suggest(message_clean)
+            not_found_message = f"❌ جفت ارز `{message_clean}` یافت نشد."
+            if suggestions:
+                not_found_message += "\n\n💡 **منظورتان این بود؟**\n" + "\n".join(f"• `{pair}`" for pair in suggestions)
+            not_found_message += "\n\nلطفاً دوباره تلاش کنید یا /cancel برای لغو بفرستید."
+            await update.message.reply_text(not_found_message, parse_mode='Markdown')
+            return TRADINGVIEW_ANALYSIS
+        
         # نمایش پیام در حال بارگذاری
         loading_message = await update.message.reply_text("⏳ در حال دریافت آخرین تحلیل کامیونیتی از TradingView...\n\nلطفاً چند ثانیه صبر کنید.")
         
@@ -784,8 +503,10 @@ async def tradingview_analysis_process(update: Update, context: ContextTypes.DEF
                     # ارسال جدیدترین تحلیل (با یا بدون عکس)
                     if recent.get('image_url'):
                         try:
-                            await update.message.reply_photo(
-                                photo=recent['image_url'],
+                            await media_cache.send_photo(
+                                update.message.reply_photo,
+                                tradingview_fetcher.get_image(recent['image_url']),
+                                cache_key=media_cache.make_key(recent['image_url']),
                                 caption=recent_message,
                                 parse_mode='Markdown'
                             )
@@ -805,8 +526,10 @@ async def tradingview_analysis_process(update: Update, context: ContextTypes.DEF
                     # ارسال محبوب‌ترین تحلیل (با یا بدون عکس)
                     if popular.get('image_url'):
                         try:
-                            await update.message.reply_photo(
-                                photo=popular['image_url'],
+                            await media_cache.send_photo(
+                                update.message.reply_photo,
+                                tradingview_fetcher.get_image(popular['image_url']),
+                                cache_key=media_cache.make_key(popular['image_url']),
                                 caption=popular_message,
                                 parse_mode='Markdown'
                             )
@@ -828,8 +551,10 @@ async def tradingview_analysis_process(update: Update, context: ContextTypes.DEF
                     if analysis_data.get('image_url'):
                         # ارسال با عکس
                         try:
-                            await update.message.reply_photo(
-                                photo=analysis_data['image_url'],
+                            await media_cache.send_photo(
+                                update.message.reply_photo,
+                                tradingview_fetcher.get_image(analysis_data['image_url']),
+                                cache_key=media_cache.make_key(analysis_data['image_url']),
                                 caption=analysis_message,
                                 parse_mode='Markdown'
                             )
@@ -888,9 +613,13 @@ async def tradingview_analysis_process(update: Update, context: ContextTypes.DEF
 • `dotusdt` - پولکادات
 • `avaxusdt` - اولانچ
 
-⚠️ **توجه:** فقط حروف کوچک، بدون فاصله یا نشانه خاص
-
-لطفاً دوباره تلاش کنید یا /cancel برای لغو بفرستید."""
+⚠️ **توجه:** فقط حروف کوچک، بدون فاصله یا نشانه خاص"""
+            
+            # پیشنهاد جفت ارز بر اساس ورودی (مثلاً BTC/USDT ← btcusdt)
+            suggestions = symbol_index.suggest(message_clean)
+            if suggestions:
+                error_message += "\n\n💡 **منظورتان این بود؟**\n" + "\n".join(f"• `{pair}`" for pair in suggestions)
+            error_message += "\n\nلطفاً دوباره تلاش کنید یا /cancel برای لغو بفرستید."
             
             await update.message.reply_text(error_message, parse_mode='Markdown')
             return TRADINGVIEW_ANALYSIS
@@ -967,6 +696,24 @@ async def news_subscription_callback(update: Update, context: ContextTypes.DEFAU
                 text="❌ خطا در لغو اشتراک. لطفاً دوباره تلاش کنید."
             )
     
+    elif query.data.startswith("news_sub_topic_"):
+        # تغییر موضوعات انتخاب‌شده
+        topic = query.data[len("news_sub_topic_"):]
+        if topic not in NEWS_TOPICS:
+            return
+        
+        selected = set(_get_user_news_topics(user.id))
+        if topic in selected and len(selected) > 1:
+            selected.discard(topic)
+        else:
+            selected.add(topic)
+        
+        topics = [key for key in NEWS_TOPICS if key in selected]
+        if db_manager.set_news_topics(user.id, topics):
+            bot_logger.log_user_action(user.id, "NEWS_TOPICS_UPDATED", ",".join(topics))
+        
+        await query.edit_message_reply_markup(reply_markup=build_news_subscription_keyboard(topics))
+    
     elif query.data == "news_sub_back":
         # بازگشت
         bot_logger.log_user_action(user.id, "NEWS_SUBSCRIPTION_BACK", "بازگشت از مدیریت اشتراک")
@@ -976,72 +723,225 @@ async def news_subscription_callback(update: Update, context: ContextTypes.DEFAU
             parse_mode='Markdown'
         )
 
+PRICE_ALERT_USAGE = """🔔 *هشدار قیمت*
+
+برای ثبت هشدار از دستور /alert استفاده کنید:
+• `/alert BTC above 70000` - وقتی قیمت بالاتر رفت
+• `/alert ETH below 3000` - وقتی قیمت پایین‌تر آمد
+• `/alert SOL 5%` - وقتی قیمت 5٪ نسبت به الان تغییر کرد
+
+📋 لیست هشدارها: /alerts"""
+
+PRICE_ALERT_DIRECTIONS = {
+    'above': 'above', 'بالای': 'above', 'بالاتر': 'above', '>': 'above',
+    'below': 'below', 'زیر': 'below', 'پایین': 'below', '<': 'below',
+}
+
+
+def build_price_alerts_keyboard(alerts: List[Dict[str, Any]]) -> Optional[InlineKeyboardMarkup]:
+    """دکمه حذف برای هر هشدار فعال"""
+    if not alerts:
+        return None
+    keyboard = [
+        [InlineKeyboardButton(f"🗑 {describe_alert(alert)}", callback_data=f"price_alert_del_{alert['id']}")]
+        for alert in alerts
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def show_price_alerts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """نمایش هشدارهای فعال کاربر و راهنمای ثبت هشدار"""
+    user = update.effective_user
+    if not await check_user_access(user.id):
+        return
+    
+    alerts = price_alert_service.get_user_alerts(user.id)
+    if alerts:
+        message = PRICE_ALERT_USAGE + f"\n\n✅ *{len(alerts)} هشدار فعال دارید* (برای حذف روی هر مورد بزنید):"
+    else:
+        message = PRICE_ALERT_USAGE + "\n\n📭 هنوز هشداری ثبت نکرده‌اید."
+    
+    await update.message.reply_text(
+        message,
+        reply_markup=build_price_alerts_keyboard(alerts),
+        parse_mode='Markdown'
+    )
+
+
+async def price_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """ثبت هشدار قیمت: /alert BTC above 70000 یا /alert BTC 5%"""
+    user = update.effective_user
+    if not await check_user_access(user.id):
+        return
+    
+    args = context.args or []
+    alert_type = None
+    threshold = None
+    try:
+        if len(args) == 2 and args[1].endswith('%'):
+            alert_type, threshold = 'percent', float(args[1].rstrip('%'))
+        elif len(args) == 3 and args[1].lower() in PRICE_ALERT_DIRECTIONS:
+            alert_type, threshold = PRICE_ALERT_DIRECTIONS[args[1].lower()], float(args[2].replace(',', ''))
+    except ValueError:
+        alert_type = None
+    
+    if not alert_type:
+        await update.message.reply_text(PRICE_ALERT_USAGE, parse_mode='Markdown')
+        return
+    
+    result = await price_alert_service.add_alert(user.id, args[0], alert_type, threshold)
+    if not result['success']:
+        await update.message.reply_text(f"❌ {result['error']}")
+        return
+    
+    bot_logger.log_user_action(user.id, "PRICE_ALERT_ADDED", describe_alert(result['alert']))
+    await update.message.reply_text(
+        f"✅ هشدار ثبت شد:\n📌 {describe_alert(result['alert'])}\n💵 قیمت فعلی: {format_price(result['current_price'])}"
+    )
+
+
+async def price_alert_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """حذف هشدار قیمت از لیست کاربر"""
+    query = update.callback_query
+    user = update.effective_user
+    
+    try:
+        alert_id = int(query.data.rsplit('_', 1)[-1])
+    except ValueError:
+        await query.answer(text="داده نامعتبر است", show_alert=True)
+        return
+    
+    removed = await price_alert_service.remove_alert(user.id, alert_id)
+    await query.answer(text="هشدار حذف شد" if removed else "هشدار پیدا نشد")
+    
+    alerts = price_alert_service.get_user_alerts(user.id)
+    await query.edit_message_reply_markup(reply_markup=build_price_alerts_keyboard(alerts))
+
+
+def _get_user_news_topics(user_id: int) -> List[str]:
+    """موضوعات اخبار کاربر (در صورت نبود پشتیبانی دیتابیس، فقط اخبار عمومی)"""
+    try:
+        topics = db_manager.get_news_topics(user_id)
+    except AttributeError:
+        topics = ['general']
+    return [topic for topic in NEWS_TOPICS if topic in topics] or ['general']
+
+
+def build_news_subscription_keyboard(selected_topics: List[str]) -> InlineKeyboardMarkup:
+    """کیبورد مدیریت اشتراک اخبار با انتخاب موضوعات"""
+    topic_buttons = [
+        InlineKeyboardButton(
+            f"{'✅' if topic in selected_topics else '⬜️'} {title}",
+            callback_data=f"news_sub_topic_{topic}"
+        )
+        for topic, title in NEWS_TOPICS.items()
+    ]
+    keyboard = _chunk_list(topic_buttons, 2)
+    keyboard.extend([
+        [InlineKeyboardButton("✅ فعال‌سازی اشتراک", callback_data="news_sub_enable")],
+        [InlineKeyboardButton("❌ غیرفعال‌سازی اشتراک", callback_data="news_sub_disable")],
+        [InlineKeyboardButton("🔙 بازگشت", callback_data="news_sub_back")]
+    ])
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def _render_news_topic_digest(topic: str) -> Optional[str]:
+    """دریافت و فرمت یک بار خلاصه اخبار هر موضوع در هر دور ارسال"""
+    try:
+        if topic == 'general':
+            news_list = await public_menu.fetch_general_news()
+            return public_menu.format_general_news_message(news_list) if news_list else None
+        if topic == 'crypto':
+            news_list = await public_menu.fetch_crypto_news()
+            return public_menu.format_crypto_news_message(news_list) if news_list else None
+        if topic == 'ai':
+            news_list = await public_menu.fetch_ai_news()
+            return public_menu.format_ai_news_message(news_list) if news_list else None
+        if topic == 'sports':
+            news_result = await sports_handler.get_persian_news(limit=10)
+            return sports_handler.format_news_message(news_result) if news_result.get('success') else None
+    except Exception as e:
+        logger.error(f"❌ خطا در آماده‌سازی اخبار موضوع {topic}: {e}")
+    return None
+
+
 # تابع ارسال خودکار اخبار برای مشترکان
 async def send_scheduled_news(context: ContextTypes.DEFAULT_TYPE) -> None:
     """ارسال خودکار اخبار برای مشترکان (فراخوانی توسط scheduler)"""
     try:
         logger.info("📡 شروع ارسال خودکار اخبار...")
         
-        # دریافت لیست مشترکان
-        subscribers = db_manager.get_news_subscribers()
+        # دریافت مشترکان گروه‌بندی‌شده بر اساس مجموعه موضوعات
+        try:
+            groups = db_manager.get_news_subscribers_by_topics()
+        except AttributeError:
+            groups = {'general': db_manager.get_news_subscribers()}
+        groups = {topics: user_ids for topics, user_ids in groups.items() if user_ids}
         
-        if not subscribers:
+        if not groups:
             logger.info("⚠️ هیچ مشترکی برای اخبار وجود ندارد")
             return
         
-        logger.info(f"👥 تعداد مشترکان: {len(subscribers)}")
-        
-        # دریافت آخرین اخبار
-        from handlers.public.public_menu import PublicMenuManager
-        public_menu_temp = PublicMenuManager(db_manager)
-        news_list = await public_menu_temp.fetch_general_news()
-        
-        if not news_list:
-            logger.error("❌ خطا در دریافت اخبار برای ارسال خودکار")
-            return
+        total_subscribers = sum(len(user_ids) for user_ids in groups.values())
+        logger.info(f"👥 تعداد مشترکان: {total_subscribers} در {len(groups)} گروه موضوعی")
         
-        # فرمت کردن پیام اخبار با تابع صحیح از public_menu
-        news_message = public_menu_temp.format_general_news_message(news_list)
+        # هر موضوع فقط یک بار در هر دور دریافت، ترجمه و فرمت می‌شود
+        needed_topics = [
+            topic for topic in NEWS_TOPICS
+            if any(topic in topics.split(',') for topics in groups)
+        ]
+        rendered = await asyncio.gather(*(_render_news_topic_digest(topic) for topic in needed_topics))
         
-        # اضافه کردن یک هدر برای ارسال خودکار
         header = f"""🔔 **اخبار خودکار - {datetime.datetime.now().strftime('%Y/%m/%d %H:%M')}**
 
 """
-        full_message = header + news_message
+        digests = {
+            topic: header + message
+            for topic, message in zip(needed_topics, rendered)
+            if message
+        }
+        
+        if not digests:
+            logger.error("❌ خطا در دریافت اخبار برای ارسال خودکار")
+            return
         
         # شمارنده برای ارسال موفق و ناموفق
         success_count = 0
         failed_count = 0
         
-        # ارسال برای هر مشترک
-        for user_id in subscribers:
-            try:
-                await context.bot.send_message(
-                    chat_id=user_id,
-                    text=full_message,
-                    parse_mode='Markdown',
-                    disable_web_page_preview=False
-                )
-                success_count += 1
-                logger.info(f"✅ اخبار برای کاربر {user_id} ارسال شد")
-                
-                # تاخیر کوتاه برای جلوگیری از flood
-                await asyncio.sleep(0.05)  # 50ms delay
-                
-            except Exception as e:
-                failed_count += 1
-                logger.warning(f"⚠️ خطا در ارسال برای کاربر {user_id}: {e}")
-                
-                # اگر کاربر ربات رو بلاک کرده (احتمالاً Forbidden error)
-                if "Forbidden" in str(e):
-                    # غیرفعال کردن اشتراک برای این کاربر
-                    db_manager.disable_news_subscription(user_id)
-                    logger.info(f"🚫 اشتراک کاربر {user_id} به دلیل بلاک کردن ربات غیرفعال شد")
+        # ارسال برای هر گروه موضوعی
+        for topics, user_ids in groups.items():
+            messages = [digests[topic] for topic in NEWS_TOPICS if topic in topics.split(',') and topic in digests]
+            if not messages:
+                continue
+            
+            for user_id in user_ids:
+                try:
+                    for message in messages:
+                        await context.bot.send_message(
+                            chat_id=user_id,
+                            text=message,
+                            parse_mode='Markdown',
+                            disable_web_page_preview=False
+                        )
+                        # تاخیر کوتاه برای جلوگیری از flood
+                        await asyncio.sleep(0.05)  # 50ms delay
+                    success_count += 1
+                    
+                except Exception as e:
+                    failed_count += 1
+                    logger.warning(f"⚠️ خطا در ارسال برای کاربر {user_id}: {e}")
+                    
+                    # اگر کاربر ربات رو بلاک کرده (احتمالاً Forbidden error)
+                    if "Forbidden" in str(e):
+                        # غیرفعال کردن اشتراک برای این کاربر
+                        db_manager.disable_news_subscription(user_id)
+                        logger.info(f"🚫 اشتراک کاربر {user_id} به دلیل بلاک کردن ربات غیرفعال شد")
         
         # لاگ نتیجه نهایی
         logger.info(
             f"✅ ارسال خودکار اخبار کامل شد | "
-            f"موفق: {success_count} | ناموفق: {failed_count}"
+            f"موفق: {success_count} | ناموفق: {failed_count} | موضوعات: {', '.join(digests)}"
         )
         
         # ارسال گزارش به ادمین
@@ -1052,7 +952,8 @@ async def send_scheduled_news(context: ContextTypes.DEFAULT_TYPE) -> None:
 ⏰ زمان: {datetime.datetime.now().strftime('%Y/%m/%d %H:%M')}
 ✅ موفق: {success_count}
 ❌ ناموفق: {failed_count}
-👥 جمع مشترکان: {len(subscribers)}""",
+👥 جمع مشترکان: {total_subscribers}
+🗂️ گروه‌های موضوعی: {len(groups)}""",
             parse_mode='Markdown'
         )
         
@@ -1122,6 +1023,66 @@ def _build_reminder_panel_text(header: Optional[str], favorites: List[Dict[str,
     return "\n\n".join(sections)
 
 
+def build_fixtures_pages_keyboard(views: Dict[str, List[str]], view: str, page: int) -> Optional[InlineKeyboardMarkup]:
+    """کیبورد صفحه‌بندی و انتخاب لیگ برای پیام برنامه هفتگی"""
+    buttons: List[List[InlineKeyboardButton]] = []
+    total = len(views.get(view, []))
+    if total > 1:
+        nav_row = []
+        if page > 0:
+            nav_row.append(InlineKeyboardButton("◀️ قبلی", callback_data=f"sports_fixtures_{view}_{page - 1}"))
+        nav_row.append(InlineKeyboardButton(f"📄 {page + 1}/{total}", callback_data=f"sports_fixtures_{view}_{page}"))
+        if page < total - 1:
+            nav_row.append(InlineKeyboardButton("بعدی ▶️", callback_data=f"sports_fixtures_{view}_{page + 1}"))
+        buttons.append(nav_row)
+
+    league_keys = [key for key in views if key != 'all']
+    if len(league_keys) > 1:
+        current_row: List[InlineKeyboardButton] = []
+        for key in ['all'] + league_keys:
+            if key == view:
+                continue
+            label = "📋 همه لیگ‌ها" if key == 'all' else sports_handler.league_display_names.get(key, key)
+            current_row.append(InlineKeyboardButton(label, callback_data=f"sports_fixtures_{key}_0"))
+            if len(current_row) == 2:
+                buttons.append(current_row)
+                current_row = []
+        if current_row:
+            buttons.append(current_row)
+
+    return InlineKeyboardMarkup(buttons) if buttons else None
+
+
+async def handle_sports_fixtures_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """نمایش صفحه دیگری از برنامه هفتگی یا برنامه یک لیگ"""
+    query = update.callback_query
+    view, _, page_raw = query.data.replace('sports_fixtures_', '', 1).rpartition('_')
+    try:
+        page = int(page_raw)
+    except ValueError:
+        await query.answer(text="داده نامعتبر است", show_alert=True)
+        return
+
+    fixtures_pages = await sports_handler.get_fixtures_pages()
+    if fixtures_pages is None or view not in fixtures_pages['views']:
+        await query.answer(text="برنامه بازی‌ها بروزرسانی شده؛ دوباره «📅 بازی‌های هفتگی» را بزنید", show_alert=True)
+        return
+
+    pages = fixtures_pages['views'][view]
+    page = max(0, min(page, len(pages) - 1))
+    await query.answer()
+    try:
+        await query.edit_message_text(
+            pages[page],
+            parse_mode='Markdown',
+            reply_markup=build_fixtures_pages_keyboard(fixtures_pages['views'], view, page)
+        )
+    except BadRequest as e:
+        # همان صفحه فعلی دوباره انتخاب شده
+        if 'not modified' not in str(e).lower():
+            raise
+
+
 def build_sports_league_keyboard(include_back: bool = True) -> InlineKeyboardMarkup:
     seen: set[str] = set()
     league_keys: List[str] = []
@@ -1436,6 +1397,7 @@ async def handle_sports_league_callback(update: Update, context: ContextTypes.DE
         success, msg = db_manager.remove_sports_favorite_team_by_id(user.id, team_id)
         if success:
             db_manager.delete_match_reminders_for_team(user.id, team_id)
+            sports_handler.reminder_dispatcher.invalidate(user.id)
 
         favorites = db_manager.get_sports_favorite_teams(user.id)
         reminders = db_manager.get_user_match_reminders(user.id, include_sent=False)
@@ -1500,11 +1462,12 @@ async def process_team_selection(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("✅ عملیات افزودن تیم لغو شد.")
         return True
 
-    teams = state.get('teams', [])
-    team_match = next((team for team in teams if team['team_name'].lower() == message_text.lower()), None)
+    league_key = state.get('league_key')
+    team_index = sports_handler.get_team_index(league_key, state.get('teams', []))
+    team_match = team_index.find(message_text)
 
     if not team_match:
-        suggestions = difflib.get_close_matches(message_text, [team['team_name'] for team in teams], n=3, cutoff=0.7)
+        suggestions = team_index.suggest(message_text, limit=3)
         suggestion_text = "\n".join(f"• {sugg}" for sugg in suggestions) if suggestions else ""
         extra_hint = f"\n\nشاید منظور شما یکی از موارد زیر باشد:\n{suggestion_text}" if suggestion_text else ""
         await update.message.reply_text(
@@ -1512,7 +1475,6 @@ async def process_team_selection(update: Update, context: ContextTypes.DEFAULT_T
         )
         return True
 
-    league_key = state.get('league_key')
     league_id = sports_handler.league_ids.get(league_key)
     league_name = state.get('league_name', league_key)
 
@@ -1547,42 +1509,6 @@ async def process_team_selection(update: Update, context: ContextTypes.DEFAULT_T
     return True
 
 
-def serialize_weekly_fixtures_for_cache(fixtures: Dict[str, Any]) -> Dict[str, Any]:
-    leagues = {}
-    for key, league in fixtures.get('leagues', {}).items():
-        matches_serialized = []
-        for match in league.get('matches', []):
-            match_dt = match.get('datetime')
-            match_iso = match_dt.isoformat() if isinstance(match_dt, datetime.datetime) else None
-            matches_serialized.append({
-                'fixture_id': match.get('fixture_id'),
-                'home_team_id': match.get('home_team_id'),
-                'home_team': match.get('home_team'),
-                'away_team_id': match.get('away_team_id'),
-                'away_team': match.get('away_team'),
-                'league_id': match.get('league_id'),
-                'league_name': match.get('league_name'),
-                'date': match.get('date'),
-                'datetime': match_iso,
-                'status': match.get('status'),
-                'venue': match.get('venue'),
-                'score': match.get('score')
-            })
-
-        leagues[key] = {
-            'name': league.get('name'),
-            'count': league.get('count'),
-            'matches': matches_serialized
-        }
-
-    return {
-        'success': fixtures.get('success', False),
-        'total_matches': fixtures.get('total_matches', 0),
-        'period': fixtures.get('period', ''),
-        'leagues': leagues
-    }
-
-
 def format_match_reminder_message(reminder: Dict[str, Any]) -> str:
     match_dt = reminder.get('match_datetime')
     if match_dt:
@@ -1622,15 +1548,11 @@ async def _upsert_weekly_fixtures_cache(base_date: Optional[datetime.datetime] =
 
     week_start_dt, week_end_dt = _compute_week_range(tehran_now)
 
+    # بازی‌ها در get_all_weekly_fixtures سطر به سطر در جدول sports_fixtures ذخیره می‌شوند
     fixtures = await sports_handler.get_all_weekly_fixtures(base_date=tehran_now, use_cache=False)
 
     if fixtures.get('success'):
-        cache_payload = serialize_weekly_fixtures_for_cache(fixtures)
-        db_manager.upsert_weekly_fixtures_cache(week_start_dt, week_end_dt, cache_payload)
-        try:
-            db_manager.purge_old_weekly_fixtures_cache(week_start_dt)
-        except AttributeError:
-            logger.warning("⚠️ متد purge_old_weekly_fixtures_cache در db_manager در دسترس نیست")
+        await asyncio.to_thread(sports_handler.purge_old_fixtures, week_start_dt)
 
         try:
             message = (
@@ -1646,18 +1568,18 @@ async def _upsert_weekly_fixtures_cache(base_date: Optional[datetime.datetime] =
         return fixtures
 
     logger.warning(f"⚠️ عدم موفقیت در دریافت فیکسچرهای هفتگی: {fixtures.get('error')}")
-    cached = db_manager.get_weekly_fixtures_cache(week_start_dt, week_end_dt)
-    if cached and cached.get('payload'):
+    cached = await asyncio.to_thread(sports_handler.load_weekly_fixtures, week_start_dt, week_end_dt)
+    if cached:
         logger.info("♻️ استفاده از کش فیکسچرهای هفتگی قبلی")
         try:
             message = (
                 "⚠️ دریافت جدید برنامه هفتگی ناموفق بود؛ از کش قبلی استفاده شد.\n"
-                f"📅 بازه: {cached.get('payload', {}).get('period', 'نامشخص')}"
+                f"📅 بازه: {cached.get('period', 'نامشخص')}"
             )
             await bot.send_message(chat_id=ADMIN_USER_ID, text=message)
         except Exception as notify_error:
             logger.error(f"❌ خطا در ارسال پیام استفاده از کش قبلی به ادمین: {notify_error}")
-        return cached['payload']
+        return cached
 
     try:
         message = (
@@ -1676,10 +1598,7 @@ def _get_cached_weekly_fixtures(base_date: Optional[datetime.datetime] = None) -
     tehran_now = base_date or utc_now.astimezone(TEHRAN_TZ)
 
     week_start_dt, week_end_dt = _compute_week_range(tehran_now)
-    cached = db_manager.get_weekly_fixtures_cache(week_start_dt, week_end_dt)
-    if cached and cached.get('payload'):
-        return cached['payload']
-    return None
+    return sports_handler.load_weekly_fixtures(week_start_dt, week_end_dt)
 
 
 # ثبت تابع بروزرسانی کش برای استفاده در پنل ادمین
@@ -1712,59 +1631,83 @@ def _hydrate_match_datetime(match: Dict[str, Any]) -> Optional[datetime.datetime
     return dt.astimezone(TEHRAN_TZ)
 
 
-def _generate_user_team_reminders(user_id: int, favorites: List[Dict[str, Any]], leagues_data: Dict[str, Any]) -> int:
-    created_count = 0
-    now_utc = datetime.datetime.now(pytz.UTC)
-    finished_statuses = {
-        "FT", "AET", "PEN", "PST", "CANC", "ABD", "AWD", "WO"
-    }
+FINISHED_MATCH_STATUSES = frozenset({
+    "FT", "AET", "PEN", "PST", "CANC", "ABD", "AWD", "WO"
+})
 
-    for fav in favorites:
-        db_manager.delete_match_reminders_for_team(user_id, fav['team_id'])
 
-    for league_key, league_info in leagues_data.items():
-        matches = league_info.get('matches', [])
-        for match in matches:
-            match_dt_utc = _hydrate_match_datetime(match)
-            match_status = (match.get('status') or "").upper()
+# تعداد بازی‌های پیش‌روی هر تیم که برای یادآوری بررسی می‌شود
+REMINDER_FIXTURES_PER_TEAM = 5
 
-            if match_status in finished_statuses:
+
+def _build_team_fixture_index(team_ids: Iterable[int]) -> Dict[int, List[Tuple[Dict[str, Any], datetime.datetime, str]]]:
+    """
+    ساخت ایندکس team_id -> بازی‌های آینده فقط برای تیم‌های محبوب کاربران
+    (هر تیم با یک جستجوی ایندکسی روی جدول بازی‌ها، بدون پیمایش کل برنامه هفته)
+    """
+    now_utc = datetime.datetime.now(pytz.UTC)
+    index: Dict[int, List[Tuple[Dict[str, Any], datetime.datetime, str]]] = {}
+
+    for team_id in team_ids:
+        for match in sports_handler.get_team_fixtures(team_id, REMINDER_FIXTURES_PER_TEAM):
+            if (match.get('status') or "").upper() in FINISHED_MATCH_STATUSES:
                 continue
 
-            if not match_dt_utc or match_dt_utc <= now_utc:
+            match_dt = _hydrate_match_datetime(match)
+            if not match_dt or match_dt <= now_utc:
                 continue
 
-            for fav in favorites:
-                team_id = fav['team_id']
-                if match.get('home_team_id') != team_id and match.get('away_team_id') != team_id:
-                    continue
+            index.setdefault(team_id, []).append((match, match_dt, match.get('league_key')))
 
-                opponent_team_id = match['away_team_id'] if match.get('home_team_id') == team_id else match.get('home_team_id')
-                opponent_team_name = match['away_team'] if match.get('home_team_id') == team_id else match['home_team']
+    return index
 
-                extra_info = {
+
+def _build_match_reminders(
+    favorites: List[Dict[str, Any]],
+    fixture_index: Dict[int, List[Tuple[Dict[str, Any], datetime.datetime, str]]]
+) -> List[Dict[str, Any]]:
+    """محاسبه مجموعه کامل یادآوری‌های مطلوب همه کاربران در حافظه"""
+    reminders = []
+    for fav in favorites:
+        team_id = fav['team_id']
+        for match, match_dt, league_key in fixture_index.get(team_id, ()):
+            is_home = match.get('home_team_id') == team_id
+            opponent_team_id = match.get('away_team_id') if is_home else match.get('home_team_id')
+            opponent_team_name = match.get('away_team') if is_home else match.get('home_team')
+
+            reminders.append({
+                'user_id': fav['user_id'],
+                'fixture_id': match.get('fixture_id'),
+                'team_id': team_id,
+                'team_name': fav['team_name'],
+                'opponent_team_id': opponent_team_id,
+                'opponent_team_name': opponent_team_name,
+                'league_id': match.get('league_id'),
+                'league_name': match.get('league_name'),
+                'match_datetime': match_dt,
+                'reminder_datetime': match_dt,
+                'extra_info': {
                     'league_key': league_key,
                     'opponent_id': opponent_team_id
                 }
+            })
+    return reminders
 
-                success, _ = db_manager.create_match_reminder(
-                    user_id=user_id,
-                    fixture_id=match.get('fixture_id'),
-                    team_id=team_id,
-                    team_name=fav['team_name'],
-                    opponent_team_id=opponent_team_id,
-                    opponent_team_name=opponent_team_name,
-                    league_id=match.get('league_id'),
-                    league_name=match.get('league_name'),
-                    match_datetime=match_dt_utc,
-                    reminder_datetime=match_dt_utc,
-                    extra_info=extra_info
-                )
 
-                if success:
-                    created_count += 1
+async def _sync_sports_reminders() -> Optional[Dict[str, int]]:
+    """بازسازی یادآوری‌های همه کاربران از جدول بازی‌ها با یک همگام‌سازی گروهی"""
+    favorites = await asyncio.to_thread(db_manager.get_all_sports_favorites)
+    if not favorites:
+        logger.info("ℹ️ کاربری برای یادآوری‌های ورزشی ثبت نشده است.")
+        return None
 
-    return created_count
+    team_ids = {fav['team_id'] for fav in favorites}
+    fixture_index = await asyncio.to_thread(_build_team_fixture_index, team_ids)
+    reminders = _build_match_reminders(favorites, fixture_index)
+    result = await asyncio.to_thread(db_manager.sync_match_reminders, reminders)
+    if result and any(result.values()):
+        sports_handler.reminder_dispatcher.invalidate()
+    return result
 
 
 async def refresh_weekly_sports_reminders(app: Application) -> None:
@@ -1773,20 +1716,12 @@ async def refresh_weekly_sports_reminders(app: Application) -> None:
         if not fixtures:
             return
 
-        users = db_manager.get_users_with_sports_favorites()
-        if not users:
-            logger.info("ℹ️ کاربری برای یادآوری‌های ورزشی ثبت نشده است.")
-            return
-
-        leagues_data = fixtures.get('leagues', {})
-
-        for user_id in users:
-            favorites = db_manager.get_sports_favorite_teams(user_id)
-            if not favorites:
-                continue
-
-            created_count = _generate_user_team_reminders(user_id, favorites, leagues_data)
-            logger.info(f"✅ یادآوری‌های جدید برای کاربر {user_id} ثبت شد: {created_count}")
+        result = await _sync_sports_reminders()
+        if result:
+            logger.info(
+                f"✅ یادآوری‌های ورزشی به‌روزرسانی شد: {result['inserted']} جدید، "
+                f"{result['updated']} تغییر زمان، {result['deleted']} حذف"
+            )
 
     except Exception as e:
         logger.error(f"❌ خطا در به‌روزرسانی یادآوری‌های ورزشی: {e}")
@@ -1799,54 +1734,17 @@ async def refresh_daily_sports_reminders(app: Application) -> None:
             logger.warning("⚠️ کش فیکسچرهای هفتگی یافت نشد؛ یادآوری روزانه اجرا نشد")
             return
 
-        users = db_manager.get_users_with_sports_favorites()
-        if not users:
-            return
-
-        leagues_data = fixtures.get('leagues', {})
-
-        for user_id in users:
-            favorites = db_manager.get_sports_favorite_teams(user_id)
-            if not favorites:
-                continue
-
-            created_count = _generate_user_team_reminders(user_id, favorites, leagues_data)
-            logger.info(f"🔁 یادآوری‌های روزانه برای کاربر {user_id} به‌روزرسانی شد: {created_count}")
+        result = await _sync_sports_reminders()
+        if result:
+            logger.info(
+                f"🔁 یادآوری‌های روزانه به‌روزرسانی شد: {result['inserted']} جدید، "
+                f"{result['updated']} تغییر زمان، {result['deleted']} حذف"
+            )
 
     except Exception as e:
         logger.error(f"❌ خطا در به‌روزرسانی روزانه یادآوری‌های ورزشی: {e}")
 
 
-async def process_due_sports_reminders(app: Application) -> None:
-    try:
-        now_utc = datetime.datetime.now(pytz.UTC)
-        due_reminders = db_manager.get_pending_match_reminders(now_utc)
-        if not due_reminders:
-            return
-
-        for reminder in due_reminders:
-            message = format_match_reminder_message(reminder)
-            try:
-                await app.bot.send_message(
-                    chat_id=reminder['user_id'],
-                    text=message,
-                    parse_mode='Markdown'
-                )
-                marked = db_manager.mark_match_reminder_sent(reminder['id'])
-                if not marked:
-                    logger.warning(f"⚠️ بروزرسانی وضعیت یادآوری {reminder['id']} ناموفق بود")
-                deleted = False
-                try:
-                    deleted = db_manager.delete_match_reminder(reminder['id'])
-                except AttributeError:
-                    logger.warning("⚠️ متد delete_match_reminder در db_manager در دسترس نیست")
-                if not deleted:
-                    logger.warning(f"⚠️ حذف یادآوری ارسال‌شده {reminder['id']} ناموفق بود")
-            except Exception as send_error:
-                logger.error(f"❌ خطا در ارسال یادآوری بازی برای کاربر {reminder['user_id']}: {send_error}")
-
-    except Exception as e:
-        logger.error(f"❌ خطا در پردازش یادآوری‌های ورزشی: {e}")
 # Handler برای پیام‌های متنی (echo)
 async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """راهنمایی برای پیام‌های ناشناخته"""
@@ -2011,7 +1909,7 @@ async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             message = public_menu.format_crypto_message(crypto_data)
             
             # ویرایش پیام با نتایج (بدون parse_mode برای جلوگیری از خطای entities)
-            await loading_message.edit_text(message)
+            await loading_message.edit_text(message, reply_markup=public_menu.create_crypto_prices_keyboard())
             
         except Exception as e:
             error_message = f"❌ خطا در دریافت قیمت‌ها:\n{str(e)}"
@@ -2019,6 +1917,10 @@ async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         
         return
     
+    elif message_text == "🔔 هشدار قیمت":
+        await show_price_alerts(update, context)
+        return
+    
     elif message_text == "📰 اخبار کریپتو":
         # نمایش پیام در حال بارگذاری
         loading_message = await update.message.reply_text("⏳ در حال دریافت آخرین اخبار کریپتو...\n\nلطفاً چند ثانیه صبر کنید.")
@@ -2051,49 +1953,36 @@ async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         loading_message = await update.message.reply_text("⏳ در حال دریافت آخرین شاخص ترس و طمع بازار...\n\nلطفاً چند ثانیه صبر کنید.")
         
         try:
-            # دریافت شاخص ترس و طمع
-            index_data = await fetch_fear_greed_index()
+            # دریافت شاخص ترس و طمع (کش‌شده تا بروزرسانی بعدی alternative.me)
+            index_data = await fear_greed_service.get_index()
             message = format_fear_greed_message(index_data)
             
-            # دانلود تصویر چارت
-            chart_path = await download_fear_greed_chart()
+            # چارت: بایت‌های تصویر در حافظه (ارسال با file_id کش‌شده در صورت وجود)
+            chart = await fear_greed_service.get_chart()
             
             # حذف پیام loading
             await loading_message.delete()
             
             # ارسال پیام همراه با تصویر
-            if chart_path and os.path.exists(chart_path):
+            if chart:
                 try:
-                    # بررسی حجم فایل
-                    file_size = os.path.getsize(chart_path)
-                    print(f"📊 ارسال تصویر شاخص - حجم: {file_size} بایت")
-                    
-                    # ارسال تصویر همراه با متن در کپشن
-                    with open(chart_path, 'rb') as photo:
-                        await update.message.reply_photo(
-                            photo=photo,
-                            caption=message,
-                            parse_mode='HTML'
-                        )
-                    print("✅ عکس شاخص ترس و طمع با موفقیت ارسال شد")
+                    await media_cache.send_photo(
+                        update.message.reply_photo,
+                        chart['bytes'],
+                        caption=message,
+                        parse_mode='HTML'
+                    )
                     
                 except Exception as photo_error:
-                    print(f"❌ خطا در ارسال عکس: {photo_error}")
+                    logger.error(f"❌ خطا در ارسال عکس شاخص ترس و طمع: {photo_error}")
                     # اگر ارسال عکس ناموفق بود، متن را ارسال کن
                     await update.message.reply_text(
                         f"🔄 **مشکل در نمایش تصویر**\n\n{message}\n\n_تصویر در حال حاضر در دسترس نیست_",
                         parse_mode='HTML',
                         disable_web_page_preview=True
                     )
-                
-                # حذف فایل موقت
-                try:
-                    os.remove(chart_path)
-                    print("🗑️ فایل موقت حذف شد")
-                except:
-                    pass
             else:
-                print("❌ هیچ تصویری دانلود نشد - ارسال فقط متن")
+                logger.warning("❌ تصویر شاخص ترس و طمع در دسترس نیست - ارسال فقط متن")
                 # اگر تصویر دانلود نشد، فقط متن ارسال کن
                 await update.message.reply_text(
                     f"📊 **شاخص ترس و طمع بازار کریپتو**\n\n{message}\n\n_⚠️ تصویر در حال حاضر در دسترس نیست_",
@@ -2176,20 +2065,15 @@ async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 • 🌃 شب: 20:00
 
 📰 **محتوا:**
-سرتیتر آخرین اخبار روز از منابع معتبر فارسی
+موضوعات دلخواه خود را انتخاب کنید: اخبار عمومی، کریپتو، هوش مصنوعی و ورزشی
 
 ✅ **رایگان** و **بدون محدودیت**
 
 لطفاً یکی از گزینه‌های زیر را انتخاب کنید:
         """
         
-        # دکمه‌های فعال/غیرفعال و بازگشت
-        keyboard = [
-            [InlineKeyboardButton("✅ فعال‌سازی اشتراک", callback_data="news_sub_enable")],
-            [InlineKeyboardButton("❌ غیرفعال‌سازی اشتراک", callback_data="news_sub_disable")],
-            [InlineKeyboardButton("🔙 بازگشت", callback_data="news_sub_back")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        # دکمه‌های موضوعات، فعال/غیرفعال و بازگشت
+        reply_markup = build_news_subscription_keyboard(_get_user_news_topics(user.id))
         
         await update.message.reply_text(
             info_message,
@@ -2288,17 +2172,27 @@ async def fallback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         loading_message = await update.message.reply_text("🔄 در حال دریافت برنامه بازی‌های همه لیگ‌ها...")
         
         try:
-            # دریافت همه لیگ‌ها یکجا
-            all_fixtures = await sports_handler.get_all_weekly_fixtures()
-            fixtures_message = sports_handler.format_all_fixtures_message(all_fixtures)
+            # صفحه‌های از پیش ساخته‌شده؛ فقط اگر برنامه این هفته هنوز دریافت نشده باشد از API گرفته می‌شود
+            fixtures_pages = await sports_handler.get_fixtures_pages()
+            if fixtures_pages is None:
+                all_fixtures = await sports_handler.get_all_weekly_fixtures()
+                if all_fixtures.get('success'):
+                    fixtures_pages = await sports_handler.get_fixtures_pages()
             
             await loading_message.delete()
             
-            # ارسال در یک پیام
-            await update.message.reply_text(
-                fixtures_message,
-                parse_mode='Markdown'
-            )
+            if fixtures_pages is None:
+                await update.message.reply_text(
+                    sports_handler.format_all_fixtures_message(all_fixtures),
+                    parse_mode='Markdown'
+                )
+            else:
+                pages = fixtures_pages['views']['all']
+                await update.message.reply_text(
+                    pages[0],
+                    parse_mode='Markdown',
+                    reply_markup=build_fixtures_pages_keyboard(fixtures_pages['views'], 'all', 0)
+                )
         except Exception as e:
             await loading_message.delete()
             await update.message.reply_text(
@@ -2585,6 +2479,49 @@ async def ai_vision_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
             f"❌ خطا در پردازش تصویر:\n{str(e)}\n\n💡 لطفاً دوباره تلاش کنید."
         )
 
+async def _deliver_ocr_result(update: Update, loading_message, job: Dict[str, Any]) -> None:
+    """نمایش جایگاه در صف OCR تا شروع پردازش و ارسال نتیجه"""
+    user = update.effective_user
+    try:
+        position = job['position']
+        while position > 0:
+            await loading_message.edit_text(
+                f"⏳ صف پردازش شلوغ است. جایگاه شما در صف: {position}\nپس از رسیدن نوبت، پردازش به‌طور خودکار انجام می‌شود."
+            )
+            # پیام فقط با تغییر جایگاه ویرایش می‌شود
+            new_position = position
+            while new_position == position and not job['future'].done():
+                await asyncio.wait({job['future']}, timeout=OCR_POSITION_UPDATE_INTERVAL)
+                new_position = ocr_service.position(job['job_id'])
+            if new_position == 0 and not job['future'].done():
+                await loading_message.edit_text("🔄 در حال پردازش تصویر...")
+            position = new_position
+
+        result = await job['future']
+        
+        # حذف پیام loading
+        await loading_message.delete()
+        
+        # نمایش نتیجه
+        formatted_result = ocr_handler.format_ocr_result(result)
+        await update.message.reply_text(
+            formatted_result,
+            parse_mode='Markdown'
+        )
+        
+        # لاگ کردن عملیات
+        bot_logger.log_user_action(user.id, "OCR_PROCESSED", "تصویر پردازش شد")
+        
+    except Exception as e:
+        logger.error(f"خطا در ارسال نتیجه OCR: {e}")
+        try:
+            await loading_message.delete()
+        except Exception:
+            pass
+        await update.message.reply_text(
+            "❌ متاسفانه در پردازش تصویر خطایی رخ داد. لطفاً دوباره تلاش کنید."
+        )
+
 # OCR Handler for Image Processing  
 async def ocr_image_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """هندلر پردازش تصاویر برای OCR"""
@@ -2607,22 +2544,18 @@ async def ocr_image_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         image_bytes = await file.download_as_bytearray()
         image_data = bytes(image_bytes)
         
-        # پردازش OCR
-        result = ocr_handler.extract_text_from_image(image_data)
-        
-        # حذف پیام loading
-        await loading_message.delete()
+        # ثبت در صف OCR (پردازش در worker های پس‌زمینه)
+        job = ocr_service.submit(user.id, image_data)
+        if not job['success']:
+            await loading_message.edit_text(f"⚠️ {job['error']}")
+            return
         
-        # نمایش نتیجه
-        formatted_result = ocr_handler.format_ocr_result(result)
-        await update.message.reply_text(
-            formatted_result,
-            parse_mode='Markdown'
+        # انتظار برای نتیجه خارج از مسیر پردازش update ها (سایر پیام‌ها منتظر OCR نمی‌مانند)
+        context.application.create_task(
+            _deliver_ocr_result(update, loading_message, job),
+            update=update
         )
         
-        # لاگ کردن عملیات
-        bot_logger.log_user_action(user.id, "OCR_PROCESSED", "تصویر پردازش شد")
-        
     except Exception as e:
         await loading_message.delete()
         logger.error(f"خطا در پردازش OCR: {e}")
@@ -2942,12 +2875,36 @@ async def run_database_migrations():
                 else:
                     logger.info("✅ فیلد news_subscription_enabled قبلاً با نوع صحیح وجود دارد")
             
+            # Migration: موضوعات اخبار هر کاربر + index جزئی روی مشترکان
+            cursor.execute("""
+                ALTER TABLE users 
+                ADD COLUMN IF NOT EXISTS news_topics TEXT DEFAULT 'general'
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_news_subscribers
+                ON users(news_topics, user_id)
+                WHERE news_subscription_enabled = TRUE AND is_blocked = FALSE
+            """)
+            conn.commit()
+            logger.info("✅ ستون news_topics و index مشترکان اخبار بررسی شد")
+            
             cursor.close()
             db_manager.return_connection(conn)
             
     except Exception as e:
         logger.error(f"❌ خطا در migration: {e}")
 
+async def shutdown_background_services(app: Application) -> None:
+    """توقف سرویس‌های پس‌زمینه و بستن sessionهای HTTP هنگام خاموش شدن Application"""
+    await market_snapshot_service.stop()
+    await price_alert_service.stop()
+    await sports_handler.live_poller.stop()
+    await sports_handler.reminder_dispatcher.stop()
+    await ocr_service.stop()
+    await price_history_service.persist()
+    price_history_service.shutdown()
+    await http_sessions.close()
+
 async def main() -> None:
     """تابع اصلی برای راه‌اندازی ربات"""
     global scheduler
@@ -2968,10 +2925,38 @@ async def main() -> None:
     logger.info("⏳ آماده‌سازی اتصال...")
     
     # ایجاد Application با token ربات
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = Application.builder().token(BOT_TOKEN).post_shutdown(shutdown_background_services).build()
     
     # مقداردهی application (async)
     await application.initialize()
+    
+    # باز کردن sessionهای HTTP مشترک (market، news، media، ...)
+    await http_sessions.start()
+    
+    # file_id رسانه‌های ارسال‌شده بین اجراها حفظ می‌شوند
+    media_cache.set_db_manager(db_manager)
+    
+    # تاریخچه قیمت از snapshotهای بازار تغذیه می‌شود
+    price_history_service.set_db_manager(db_manager)
+    await asyncio.to_thread(price_history_service.load)
+    market_snapshot_service.add_listener(price_history_service.on_snapshot)
+    
+    # هشدارهای قیمت روی هر snapshot یکجا بررسی می‌شوند
+    price_alert_service.set_db_manager(db_manager)
+    await asyncio.to_thread(price_alert_service.load)
+    price_alert_service.start(application.bot)
+    market_snapshot_service.add_listener(price_alert_service.on_snapshot)
+    # فهرست نمادهای معتبر TradingView با ارزهای برتر هر snapshot بروز می‌شود
+    market_snapshot_service.add_listener(symbol_index.on_snapshot)
+    
+    # شروع دریافت دوره‌ای snapshot بازار (CoinGecko، CodeBazan، تترلند)
+    market_snapshot_service.start()
+
+    # صف OCR با worker های محدود (هر تصویر در پس‌زمینه پردازش می‌شود)
+    ocr_service.start(ocr_handler)
+
+    # poller مشترک بازی‌های زنده؛ فقط در بازه بازی‌های کش هفتگی به API درخواست می‌دهد
+    sports_handler.live_poller.start(application.bot, _get_cached_weekly_fixtures)
 
     # Handler های دستورات اصلی
     application.add_handler(CommandHandler("start", start))
@@ -2980,6 +2965,8 @@ async def main() -> None:
     application.add_handler(CommandHandler("status", status_command))
     # Signal command handler removed
     application.add_handler(CommandHandler("admin", admin_command))
+    application.add_handler(CommandHandler("alert", price_alert_command))
+    application.add_handler(CommandHandler("alerts", show_price_alerts))
     
     # Handler برای پنل ادمین (callback queries)
     application.add_handler(CallbackQueryHandler(admin_panel.handle_admin_callback, pattern="^(admin_|sys_|users_|user_|logs_)"))
@@ -2990,6 +2977,12 @@ async def main() -> None:
     # Handler برای لیگ‌های یادآوری ورزشی
     application.add_handler(CallbackQueryHandler(handle_sports_league_callback, pattern=r"^sports_reminder_(league|team|back|cancel|remove)"))
     
+    # Handler برای صفحه‌بندی برنامه بازی‌های هفتگی
+    application.add_handler(CallbackQueryHandler(handle_sports_fixtures_callback, pattern=r"^sports_fixtures_\w+_\d+$"))
+    
+    # Handler برای حذف هشدارهای قیمت
+    application.add_handler(CallbackQueryHandler(price_alert_callback, pattern=r"^price_alert_del_\d+$"))
+    
     # Handler برای اشتراک اخبار (callback queries)
     application.add_handler(CallbackQueryHandler(news_subscription_callback, pattern="^news_sub_"))
     
@@ -3045,7 +3038,9 @@ async def main() -> None:
             "service": "telegram-bot", 
             "timestamp": datetime.datetime.now().isoformat(),
             "uptime": "running",
-            "mode": "webhook" if os.getenv('USE_WEBHOOK') == 'true' else "polling"
+            "mode": "webhook" if os.getenv('USE_WEBHOOK') == 'true' else "polling",
+            "http_sessions": http_sessions.get_metrics(),
+            "media_cache": media_cache.get_stats()
         }
         return web.json_response(health_data)
     
@@ -3224,16 +3219,30 @@ async def main() -> None:
         replace_existing=True
     )
 
-    # اضافه کردن job دوره‌ای برای ارسال یادآوری‌های رسیده (هر 5 دقیقه)
-    # موقتاً غیرفعال شد بر اساس درخواست ادمین
-    # scheduler.add_job(
-    #     process_due_sports_reminders,
-    #     trigger=CronTrigger(minute='*/5', timezone='Asia/Tehran'),
-    #     args=[application],
-    #     id='sports_reminder_dispatch',
-    #     name='ارسال یادآوری‌های ورزشی',
-    #     replace_existing=True
-    # )
+    # ذخیره دوره‌ای تاریخچه قیمت در دیتابیس (هر 10 دقیقه)
+    scheduler.add_job(
+        price_history_service.persist,
+        trigger=IntervalTrigger(minutes=10),
+        id='price_history_persist',
+        name='ذخیره تاریخچه قیمت',
+        replace_existing=True
+    )
+
+    # گرم نگه داشتن کش تحلیل TradingView برای جفت ارزهای پرتقاضا
+    if tradingview_fetcher:
+        scheduler.add_job(
+            tradingview_fetcher.warm_cache,
+            trigger=IntervalTrigger(minutes=tradingview_fetcher.warm_interval),
+            id='tradingview_warm_cache',
+            name='گرم‌سازی کش تحلیل TradingView',
+            next_run_time=datetime.datetime.now(pytz.timezone('Asia/Tehran')),
+            replace_existing=True
+        )
+
+    # زمان‌بند ارسال یادآوری‌های رسیده (دقیق در زمان سررسید، بدون poll دوره‌ای)
+    # به‌طور پیش‌فرض غیرفعال بر اساس درخواست ادمین؛ با SPORTS_REMINDER_DISPATCH=true فعال می‌شود
+    if os.getenv('SPORTS_REMINDER_DISPATCH', 'false').lower() == 'true':
+        sports_handler.reminder_dispatcher.start(application.bot, format_match_reminder_message)
     
     # شروع scheduler
     scheduler.start()
@@ -3275,6 +3284,8 @@ async def main() -> None:
             logger.error(f"❌ خطا در webhook mode: {e}")
             await application.bot.delete_webhook()
             bot_logger.log_error("خطا در webhook mode", e)
+        finally:
+            await shutdown_background_services(application)
     else:
         # اجرای ربات با Polling (حالت عادی)
         try:
@@ -59,10 +59,21 @@ class DatabaseManager:
                         join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         message_count INTEGER DEFAULT 0,
-                        news_subscription_enabled INTEGER DEFAULT 0
+                        news_subscription_enabled INTEGER DEFAULT 0,
+                        news_topics TEXT DEFAULT 'general'
                     )
                 ''')
                 
+                # Migration: ستون موضوعات اخبار برای دیتابیس‌های قدیمی
+                cursor.execute('PRAGMA table_info(users)')
+                if 'news_topics' not in [row['name'] for row in cursor.fetchall()]:
+                    cursor.execute("ALTER TABLE users ADD COLUMN news_topics TEXT DEFAULT 'general'")
+                
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_users_news_subscribers
+                    ON users(news_subscription_enabled, news_topics)
+                ''')
+                
                 # جدول لاگ‌ها
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS logs (
@@ -103,6 +114,96 @@ class DatabaseManager:
                         PRIMARY KEY (week_start, week_end)
                     )
                 ''')
+
+                # جدول هشدارهای قیمت کاربران
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS price_alerts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        symbol TEXT NOT NULL,
+                        alert_type TEXT NOT NULL,
+                        threshold REAL NOT NULL,
+                        base_price REAL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_alerts_user ON price_alerts(user_id)')
+
+                # جدول کش file_id رسانه‌های تلگرام
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS media_file_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        file_id TEXT NOT NULL,
+                        file_size INTEGER DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # جدول تاریخچه فشرده قیمت ارزها
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS price_history (
+                        symbol TEXT PRIMARY KEY,
+                        timestamps BLOB NOT NULL,
+                        prices BLOB NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # جدول نرمال‌شده بازی‌ها (kickoff به صورت ISO در UTC ذخیره می‌شود)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS sports_fixtures (
+                        fixture_id INTEGER PRIMARY KEY,
+                        league_key TEXT NOT NULL,
+                        league_id INTEGER,
+                        league_name TEXT,
+                        home_team_id INTEGER,
+                        home_team TEXT,
+                        away_team_id INTEGER,
+                        away_team TEXT,
+                        kickoff TEXT NOT NULL,
+                        status TEXT,
+                        venue TEXT,
+                        score_home INTEGER,
+                        score_away INTEGER,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_sports_fixtures_kickoff ON sports_fixtures(kickoff)'
+                )
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_sports_fixtures_home_team ON sports_fixtures(home_team_id, kickoff)'
+                )
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_sports_fixtures_away_team ON sports_fixtures(away_team_id, kickoff)'
+                )
+
+                # جدول کش ماندگار داده‌های کم‌تغییر API ورزشی (تیم‌ها، فصل‌ها، اطلاعات لیگ)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS sports_api_cache (
+                        cache_type TEXT NOT NULL,
+                        cache_key TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        version INTEGER DEFAULT 1,
+                        fetched_at TEXT NOT NULL,
+                        expires_at TEXT NOT NULL,
+                        PRIMARY KEY (cache_type, cache_key)
+                    )
+                ''')
+
+                # جدول مصرف روزانه سهمیه کلیدهای API
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS api_quota_usage (
+                        provider TEXT NOT NULL,
+                        key_id TEXT NOT NULL,
+                        usage_day TEXT NOT NULL,
+                        used INTEGER DEFAULT 0,
+                        request_limit INTEGER,
+                        remaining INTEGER,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (provider, key_id, usage_day)
+                    )
+                ''')
                 
                 conn.commit()
                 logger.info("دیتابیس با موفقیت مقداردهی شد")
@@ -368,6 +469,383 @@ class DatabaseManager:
             logger.error(f"خطا در دریافت لیست مشترکان اخبار: {e}")
             return []
 
+    def get_news_topics(self, user_id: int) -> List[str]:
+        """دریافت موضوعات اخبار انتخاب‌شده کاربر"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT news_topics FROM users WHERE user_id = ?', (user_id,))
+                result = cursor.fetchone()
+                topics = (result['news_topics'] if result else None) or 'general'
+                return [topic for topic in topics.split(',') if topic]
+        except Exception as e:
+            logger.error(f"خطا در دریافت موضوعات اخبار: {e}")
+            return ['general']
+    
+    def set_news_topics(self, user_id: int, topics: List[str]) -> bool:
+        """ذخیره موضوعات اخبار کاربر"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('UPDATE users SET news_topics = ? WHERE user_id = ?', (','.join(topics), user_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"خطا در ذخیره موضوعات اخبار: {e}")
+            return False
+    
+    def get_news_subscribers_by_topics(self) -> Dict[str, List[int]]:
+        """دریافت مشترکان اخبار گروه‌بندی‌شده بر اساس مجموعه موضوعات"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT COALESCE(NULLIF(news_topics, ''), 'general') AS topics, user_id FROM users
+                    WHERE news_subscription_enabled = 1 AND is_blocked = 0
+                ''')
+                groups: Dict[str, List[int]] = {}
+                for row in cursor.fetchall():
+                    groups.setdefault(row['topics'], []).append(row['user_id'])
+                return groups
+        except Exception as e:
+            logger.error(f"خطا در دریافت گروه‌های مشترکان اخبار: {e}")
+            return {}
+
+    def save_price_history(self, rows: List[tuple]) -> bool:
+        """ذخیره تاریخچه قیمت ارزها (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO price_history (symbol, timestamps, prices, updated_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [(symbol, sqlite3.Binary(ts), sqlite3.Binary(pr)) for symbol, ts, pr in rows])
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"خطا در ذخیره تاریخچه قیمت: {e}")
+            return False
+
+    def load_price_history(self) -> List[Dict[str, Any]]:
+        """بارگذاری تاریخچه قیمت ذخیره‌شده (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT symbol, timestamps, prices FROM price_history')
+                return [
+                    {'symbol': row['symbol'], 'timestamps': bytes(row['timestamps']), 'prices': bytes(row['prices'])}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            logger.error(f"خطا در بارگذاری تاریخچه قیمت: {e}")
+            return []
+
+    def get_media_file_id(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """دریافت file_id ذخیره‌شده برای کلید رسانه (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT file_id, file_size FROM media_file_cache WHERE cache_key = ?', (cache_key,))
+                row = cursor.fetchone()
+                return {'file_id': row['file_id'], 'file_size': row['file_size']} if row else None
+        except Exception as e:
+            logger.error(f"خطا در دریافت file_id رسانه: {e}")
+            return None
+
+    def save_media_file_id(self, cache_key: str, file_id: str, file_size: int = 0) -> bool:
+        """ذخیره file_id رسانه آپلودشده (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO media_file_cache (cache_key, file_id, file_size, created_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (cache_key, file_id, file_size))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"خطا در ذخیره file_id رسانه: {e}")
+            return False
+
+    def delete_media_file_id(self, cache_key: str) -> bool:
+        """حذف file_id نامعتبر (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM media_file_cache WHERE cache_key = ?', (cache_key,))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"خطا در حذف file_id رسانه: {e}")
+            return False
+
+    def add_price_alert(self, user_id: int, symbol: str, alert_type: str,
+                        threshold: float, base_price: float) -> Optional[int]:
+        """ثبت هشدار قیمت (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO price_alerts (user_id, symbol, alert_type, threshold, base_price)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (user_id, symbol, alert_type, threshold, base_price))
+                conn.commit()
+                return cursor.lastrowid
+        except Exception as e:
+            logger.error(f"خطا در ثبت هشدار قیمت: {e}")
+            return None
+
+    def load_price_alerts(self) -> List[Dict[str, Any]]:
+        """دریافت همه هشدارهای قیمت فعال (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT id, user_id, symbol, alert_type, threshold, base_price FROM price_alerts')
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"خطا در دریافت هشدارهای قیمت: {e}")
+            return []
+
+    def delete_price_alerts(self, alert_ids: List[int]) -> int:
+        """حذف گروهی هشدارها با یک دستور (SQLite)"""
+        if not alert_ids:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'DELETE FROM price_alerts WHERE id IN (SELECT value FROM json_each(?))',
+                    (json.dumps(list(alert_ids)),)
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"خطا در حذف هشدارهای قیمت: {e}")
+            return 0
+
+    def get_sports_api_cache(self, cache_type: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """دریافت یک ورودی کش API ورزشی (حتی منقضی‌شده)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT payload, version, fetched_at, expires_at
+                    FROM sports_api_cache
+                    WHERE cache_type = ? AND cache_key = ?
+                ''', (cache_type, cache_key))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                return {
+                    'payload': json.loads(row['payload']),
+                    'version': row['version'],
+                    'fetched_at': datetime.datetime.fromisoformat(row['fetched_at']),
+                    'expires_at': datetime.datetime.fromisoformat(row['expires_at'])
+                }
+        except Exception as e:
+            logger.error(f"خطا در دریافت کش API ورزشی: {e}")
+            return None
+
+    def upsert_sports_api_cache(self, cache_type: str, cache_key: str, payload: Any,
+                                expires_at: datetime.datetime) -> Optional[int]:
+        """ذخیره ورودی کش API ورزشی؛ شماره نسخه جدید را برمی‌گرداند"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO sports_api_cache (cache_type, cache_key, payload, version, fetched_at, expires_at)
+                    VALUES (?, ?, ?, 1, ?, ?)
+                    ON CONFLICT(cache_type, cache_key)
+                    DO UPDATE SET payload = excluded.payload,
+                                  version = sports_api_cache.version + 1,
+                                  fetched_at = excluded.fetched_at,
+                                  expires_at = excluded.expires_at
+                ''', (cache_type, cache_key, json.dumps(payload, ensure_ascii=False),
+                      datetime.datetime.now().isoformat(), expires_at.isoformat()))
+                cursor.execute(
+                    'SELECT version FROM sports_api_cache WHERE cache_type = ? AND cache_key = ?',
+                    (cache_type, cache_key)
+                )
+                version = cursor.fetchone()['version']
+                conn.commit()
+                return version
+        except Exception as e:
+            logger.error(f"خطا در ذخیره کش API ورزشی: {e}")
+            return None
+
+    def get_api_quota_usage(self, provider: str, usage_day: datetime.date) -> List[Dict[str, Any]]:
+        """مصرف سهمیه کلیدهای یک سرویس در یک روز (UTC)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT key_id, used, request_limit, remaining
+                    FROM api_quota_usage
+                    WHERE provider = ? AND usage_day = ?
+                ''', (provider, usage_day.isoformat()))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"خطا در دریافت مصرف سهمیه API: {e}")
+            return []
+
+    def save_api_quota_usage(self, provider: str, key_id: str, usage_day: datetime.date, used: int,
+                             request_limit: Optional[int], remaining: Optional[int]) -> bool:
+        """ذخیره مصرف سهمیه یک کلید برای روز جاری"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO api_quota_usage (provider, key_id, usage_day, used, request_limit, remaining, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(provider, key_id, usage_day)
+                    DO UPDATE SET used = excluded.used,
+                                  request_limit = excluded.request_limit,
+                                  remaining = excluded.remaining,
+                                  updated_at = CURRENT_TIMESTAMP
+                ''', (provider, key_id, usage_day.isoformat(), used, request_limit, remaining))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"خطا در ذخیره مصرف سهمیه API: {e}")
+            return False
+
+    @staticmethod
+    def _fixture_time_key(value: datetime.datetime) -> str:
+        """کلید متنی قابل مقایسه زمان بازی (ISO در UTC)"""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.astimezone(datetime.timezone.utc).isoformat()
+
+    def _fixture_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        fixture = dict(row)
+        fixture['kickoff'] = datetime.datetime.fromisoformat(fixture['kickoff'])
+        return fixture
+
+    def upsert_sports_fixtures(self, fixtures: List[Dict[str, Any]]) -> int:
+        """درج یا بروزرسانی گروهی بازی‌ها (SQLite)"""
+        rows = [
+            (
+                fixture['fixture_id'], fixture['league_key'], fixture.get('league_id'),
+                fixture.get('league_name'), fixture.get('home_team_id'), fixture.get('home_team'),
+                fixture.get('away_team_id'), fixture.get('away_team'),
+                self._fixture_time_key(fixture['kickoff']),
+                fixture.get('status'), fixture.get('venue'),
+                fixture.get('score_home'), fixture.get('score_away')
+            )
+            for fixture in fixtures
+            if fixture.get('fixture_id') and fixture.get('kickoff')
+        ]
+        if not rows:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO sports_fixtures
+                        (fixture_id, league_key, league_id, league_name, home_team_id, home_team,
+                         away_team_id, away_team, kickoff, status, venue, score_home, score_away)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fixture_id)
+                    DO UPDATE SET league_key = excluded.league_key,
+                                  league_name = excluded.league_name,
+                                  home_team = excluded.home_team,
+                                  away_team = excluded.away_team,
+                                  kickoff = excluded.kickoff,
+                                  status = excluded.status,
+                                  venue = excluded.venue,
+                                  score_home = excluded.score_home,
+                                  score_away = excluded.score_away,
+                                  updated_at = CURRENT_TIMESTAMP
+                ''', rows)
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"خطا در ذخیره بازی‌ها: {e}")
+            return 0
+
+    def get_sports_fixtures(self, start: datetime.datetime, end: datetime.datetime,
+                            league_keys: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """بازی‌های بازه [start, end) به ترتیب زمان شروع (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                query = '''
+                    SELECT * FROM sports_fixtures
+                    WHERE kickoff >= ? AND kickoff < ?
+                '''
+                params: List[Any] = [self._fixture_time_key(start), self._fixture_time_key(end)]
+                if league_keys:
+                    query += f" AND league_key IN ({','.join('?' for _ in league_keys)})"
+                    params.extend(league_keys)
+                query += " ORDER BY kickoff, fixture_id"
+                cursor.execute(query, params)
+                return [self._fixture_row(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"خطا در دریافت بازی‌های بازه: {e}")
+            return []
+
+    def get_team_fixtures(self, team_id: int, start: datetime.datetime,
+                          limit: int = 5) -> List[Dict[str, Any]]:
+        """بازی‌های بعدی یک تیم از زمان start (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                start_key = self._fixture_time_key(start)
+                cursor.execute('''
+                    SELECT * FROM (
+                        SELECT * FROM (
+                            SELECT * FROM sports_fixtures
+                            WHERE home_team_id = ? AND kickoff >= ?
+                            ORDER BY kickoff LIMIT ?
+                        )
+                        UNION ALL
+                        SELECT * FROM (
+                            SELECT * FROM sports_fixtures
+                            WHERE away_team_id = ? AND kickoff >= ?
+                            ORDER BY kickoff LIMIT ?
+                        )
+                    )
+                    ORDER BY kickoff
+                    LIMIT ?
+                ''', (team_id, start_key, limit, team_id, start_key, limit, limit))
+                return [self._fixture_row(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"خطا در دریافت بازی‌های تیم {team_id}: {e}")
+            return []
+
+    def delete_missing_sports_fixtures(self, start: datetime.datetime, end: datetime.datetime,
+                                       keep_ids: List[int]) -> int:
+        """حذف بازی‌های بازه [start, end) که در دریافت تازه آن بازه نبودند (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                query = 'DELETE FROM sports_fixtures WHERE kickoff >= ? AND kickoff < ?'
+                params: List[Any] = [self._fixture_time_key(start), self._fixture_time_key(end)]
+                if keep_ids:
+                    query += f" AND fixture_id NOT IN ({','.join('?' for _ in keep_ids)})"
+                    params.extend(keep_ids)
+                cursor.execute(query, params)
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"خطا در حذف بازی‌های حذف‌شده از برنامه: {e}")
+            return 0
+
+    def purge_old_sports_fixtures(self, before: datetime.datetime) -> int:
+        """حذف بازی‌هایی که پیش از زمان مشخص شروع شده‌اند (SQLite)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'DELETE FROM sports_fixtures WHERE kickoff < ?',
+                    (self._fixture_time_key(before),)
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"خطا در پاکسازی بازی‌های قدیمی: {e}")
+            return 0
+
     def upsert_weekly_fixtures_cache(self, week_start: datetime.date, week_end: datetime.date,
                                      payload: Dict[str, Any]) -> bool:
         """ذخیره یا بروزرسانی کش فیکسچر هفتگی (SQLite)"""
@@ -10,7 +10,7 @@ import os
 import logging
 import asyncio
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from psycopg2 import pool
 import datetime
 from typing import Optional, List, Tuple, Dict, Any
@@ -170,6 +170,103 @@ class PostgreSQLManager:
                     PRIMARY KEY (week_start, week_end)
                 )
             ''')
+
+            # جدول نرمال‌شده بازی‌ها (هر fixture یک سطر) برای جستجوی هفتگی و هر تیم
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sports_fixtures (
+                    fixture_id BIGINT PRIMARY KEY,
+                    league_key VARCHAR(50) NOT NULL,
+                    league_id BIGINT,
+                    league_name TEXT,
+                    home_team_id BIGINT,
+                    home_team TEXT,
+                    away_team_id BIGINT,
+                    away_team TEXT,
+                    kickoff TIMESTAMPTZ NOT NULL,
+                    status VARCHAR(10),
+                    venue TEXT,
+                    score_home SMALLINT,
+                    score_away SMALLINT,
+                    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sports_fixtures_kickoff
+                ON sports_fixtures(kickoff)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sports_fixtures_home_team
+                ON sports_fixtures(home_team_id, kickoff)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sports_fixtures_away_team
+                ON sports_fixtures(away_team_id, kickoff)
+            ''')
+
+            # جدول تاریخچه فشرده قیمت ارزها (آرایه‌های float64 به صورت باینری)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS price_history (
+                    symbol VARCHAR(20) PRIMARY KEY,
+                    timestamps BYTEA NOT NULL,
+                    prices BYTEA NOT NULL,
+                    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # جدول هشدارهای قیمت کاربران
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS price_alerts (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL,
+                    symbol VARCHAR(20) NOT NULL,
+                    alert_type VARCHAR(10) NOT NULL,
+                    threshold DOUBLE PRECISION NOT NULL,
+                    base_price DOUBLE PRECISION,
+                    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_price_alerts_user
+                ON price_alerts(user_id)
+            ''')
+            
+            # جدول کش file_id رسانه‌های تلگرام
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS media_file_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    file_id TEXT NOT NULL,
+                    file_size INTEGER DEFAULT 0,
+                    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # جدول کش ماندگار داده‌های کم‌تغییر API ورزشی (تیم‌ها، فصل‌ها، اطلاعات لیگ)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sports_api_cache (
+                    cache_type VARCHAR(50) NOT NULL,
+                    cache_key VARCHAR(100) NOT NULL,
+                    payload JSONB NOT NULL,
+                    version INTEGER DEFAULT 1,
+                    fetched_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    PRIMARY KEY (cache_type, cache_key)
+                )
+            ''')
+            
+            # جدول مصرف روزانه سهمیه کلیدهای API
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS api_quota_usage (
+                    provider VARCHAR(50) NOT NULL,
+                    key_id VARCHAR(32) NOT NULL,
+                    usage_day DATE NOT NULL,
+                    used INTEGER DEFAULT 0,
+                    request_limit INTEGER,
+                    remaining INTEGER,
+                    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (provider, key_id, usage_day)
+                )
+            ''')
             
             # تنظیمات پیش‌فرض
             cursor.execute('''
@@ -877,6 +974,132 @@ class PostgreSQLManager:
                 cursor.close()
                 self.return_connection(conn)
 
+    def get_all_sports_favorites(self) -> List[Dict[str, Any]]:
+        """دریافت تیم‌های مورد علاقه همه کاربران با یک کوئری"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            cursor.execute(
+                '''
+                SELECT user_id, league_id, league_name, team_id, team_name
+                FROM sports_favorite_teams
+                '''
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت تیم‌های مورد علاقه کاربران: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
+    def sync_match_reminders(self, reminders: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """
+        همگام‌سازی گروهی یادآوری‌ها با مجموعه مطلوب در یک تراکنش
+
+        - یادآوری‌های تیم‌های مورد علاقه که در مجموعه جدید نیستند حذف می‌شوند
+        - یادآوری‌های جدید درج و تغییر زمان/حریف بازی‌های موجود به‌روزرسانی می‌شود
+
+        Returns:
+            تعداد درج، به‌روزرسانی و حذف یا None در صورت خطا
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TEMP TABLE tmp_match_reminders (
+                    user_id BIGINT NOT NULL,
+                    fixture_id BIGINT NOT NULL,
+                    team_id BIGINT NOT NULL,
+                    team_name TEXT,
+                    opponent_team_id BIGINT,
+                    opponent_team_name TEXT,
+                    league_id BIGINT,
+                    league_name TEXT,
+                    match_datetime TIMESTAMPTZ,
+                    reminder_datetime TIMESTAMPTZ,
+                    extra_info JSONB
+                ) ON COMMIT DROP
+            ''')
+
+            execute_values(
+                cursor,
+                '''
+                INSERT INTO tmp_match_reminders
+                    (user_id, fixture_id, team_id, team_name, opponent_team_id,
+                     opponent_team_name, league_id, league_name, match_datetime,
+                     reminder_datetime, extra_info)
+                VALUES %s
+                ''',
+                [
+                    (
+                        row['user_id'], row['fixture_id'], row['team_id'], row['team_name'],
+                        row['opponent_team_id'], row['opponent_team_name'],
+                        row['league_id'], row['league_name'],
+                        row['match_datetime'], row['reminder_datetime'],
+                        Json(row.get('extra_info') or {})
+                    )
+                    for row in reminders
+                ],
+                page_size=1000
+            )
+
+            # حذف یادآوری‌های تیم‌های مورد علاقه که دیگر بازی آینده‌ای ندارند
+            cursor.execute('''
+                DELETE FROM sports_match_reminders r
+                USING sports_favorite_teams f
+                WHERE f.user_id = r.user_id
+                  AND f.team_id = r.team_id
+                  AND NOT EXISTS (
+                      SELECT 1 FROM tmp_match_reminders t
+                      WHERE t.user_id = r.user_id AND t.fixture_id = r.fixture_id
+                  )
+            ''')
+            deleted = cursor.rowcount
+
+            cursor.execute('''
+                INSERT INTO sports_match_reminders
+                    (user_id, fixture_id, team_id, team_name, opponent_team_id,
+                     opponent_team_name, league_id, league_name, match_datetime,
+                     reminder_datetime, extra_info)
+                SELECT DISTINCT ON (user_id, fixture_id)
+                    user_id, fixture_id, team_id, team_name, opponent_team_id,
+                    opponent_team_name, league_id, league_name, match_datetime,
+                    reminder_datetime, extra_info
+                FROM tmp_match_reminders
+                ORDER BY user_id, fixture_id, team_id
+                ON CONFLICT (user_id, fixture_id) DO UPDATE
+                SET match_datetime = EXCLUDED.match_datetime,
+                    reminder_datetime = EXCLUDED.reminder_datetime,
+                    opponent_team_id = EXCLUDED.opponent_team_id,
+                    opponent_team_name = EXCLUDED.opponent_team_name
+                WHERE sports_match_reminders.status = 'pending'
+                  AND (sports_match_reminders.match_datetime IS DISTINCT FROM EXCLUDED.match_datetime
+                       OR sports_match_reminders.opponent_team_id IS DISTINCT FROM EXCLUDED.opponent_team_id)
+                RETURNING (xmax = 0)
+            ''')
+            results = cursor.fetchall()
+            inserted = sum(1 for (is_insert,) in results if is_insert)
+
+            conn.commit()
+            return {'inserted': inserted, 'updated': len(results) - inserted, 'deleted': deleted}
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در همگام‌سازی گروهی یادآوری‌های بازی: {e}")
+            return None
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
     def get_pending_match_reminders(self, before_datetime: datetime.datetime) -> List[Dict[str, Any]]:
         """دریافت یادآوری‌های در انتظار تا زمان مشخص"""
         conn = None
@@ -937,6 +1160,43 @@ class PostgreSQLManager:
                 cursor.close()
                 self.return_connection(conn)
 
+    def complete_match_reminders(self, reminder_ids: List[int]) -> List[int]:
+        """
+        برداشتن یک دسته یادآوری سررسیده با یک دستور (ارسال‌شده‌ها نگهداری نمی‌شوند)
+
+        Returns:
+            شناسه یادآوری‌هایی که هنوز در انتظار بودند و برداشته شدند
+        """
+        if not reminder_ids:
+            return []
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                '''
+                DELETE FROM sports_match_reminders
+                WHERE id = ANY(%s) AND status = 'pending'
+                RETURNING id
+                ''',
+                (list(reminder_ids),)
+            )
+            completed = [row[0] for row in cursor.fetchall()]
+
+            conn.commit()
+            return completed
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در برداشتن دسته یادآوری‌های سررسیده: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
     def cancel_match_reminder(self, reminder_id: int) -> bool:
         """لغو یادآوری"""
         conn = None
@@ -1740,6 +2000,570 @@ class PostgreSQLManager:
                 cursor.close()
                 self.return_connection(conn)
     
+    def get_news_topics(self, user_id: int) -> List[str]:
+        """دریافت موضوعات اخبار انتخاب‌شده کاربر"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                'SELECT news_topics FROM users WHERE user_id = %s',
+                (user_id,)
+            )
+            
+            result = cursor.fetchone()
+            topics = (result[0] if result else None) or 'general'
+            return [topic for topic in topics.split(',') if topic]
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت موضوعات اخبار: {e}")
+            return ['general']
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def set_news_topics(self, user_id: int, topics: List[str]) -> bool:
+        """ذخیره موضوعات اخبار کاربر (به صورت رشته مرتب‌شده)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                'UPDATE users SET news_topics = %s WHERE user_id = %s',
+                (','.join(topics), user_id)
+            )
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره موضوعات اخبار: {e}")
+            return False
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def get_news_subscribers_by_topics(self) -> Dict[str, List[int]]:
+        """دریافت مشترکان اخبار گروه‌بندی‌شده بر اساس مجموعه موضوعات (با index جزئی)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT COALESCE(NULLIF(news_topics, ''), 'general') AS topics, array_agg(user_id)
+                FROM users
+                WHERE news_subscription_enabled = TRUE AND is_blocked = FALSE
+                GROUP BY 1
+            ''')
+            
+            groups = {row[0]: list(row[1]) for row in cursor.fetchall()}
+            logger.info(f"👥 {sum(len(ids) for ids in groups.values())} مشترک اخبار در {len(groups)} گروه موضوعی")
+            return groups
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت گروه‌های مشترکان اخبار: {e}")
+            return {}
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def save_price_history(self, rows: List[tuple]) -> bool:
+        """ذخیره تاریخچه قیمت ارزها؛ rows: [(symbol, timestamps_bytes, prices_bytes), ...]"""
+        if not rows:
+            return True
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO price_history (symbol, timestamps, prices, updated_at)
+                VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    timestamps = EXCLUDED.timestamps,
+                    prices = EXCLUDED.prices,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', [(symbol, psycopg2.Binary(ts), psycopg2.Binary(pr)) for symbol, ts, pr in rows])
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره تاریخچه قیمت: {e}")
+            return False
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def load_price_history(self) -> List[Dict[str, Any]]:
+        """بارگذاری تاریخچه قیمت ذخیره‌شده همه ارزها"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT symbol, timestamps, prices FROM price_history')
+            return [
+                {'symbol': row[0], 'timestamps': bytes(row[1]), 'prices': bytes(row[2])}
+                for row in cursor.fetchall()
+            ]
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در بارگذاری تاریخچه قیمت: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def get_media_file_id(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """دریافت file_id ذخیره‌شده برای کلید رسانه"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                'SELECT file_id, file_size FROM media_file_cache WHERE cache_key = %s',
+                (cache_key,)
+            )
+            row = cursor.fetchone()
+            return {'file_id': row[0], 'file_size': row[1]} if row else None
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت file_id رسانه: {e}")
+            return None
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def save_media_file_id(self, cache_key: str, file_id: str, file_size: int = 0) -> bool:
+        """ذخیره file_id رسانه آپلودشده"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO media_file_cache (cache_key, file_id, file_size)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    file_id = EXCLUDED.file_id,
+                    file_size = EXCLUDED.file_size,
+                    created_at = CURRENT_TIMESTAMP
+            ''', (cache_key, file_id, file_size))
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره file_id رسانه: {e}")
+            return False
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def delete_media_file_id(self, cache_key: str) -> bool:
+        """حذف file_id نامعتبر"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM media_file_cache WHERE cache_key = %s', (cache_key,))
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در حذف file_id رسانه: {e}")
+            return False
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def add_price_alert(self, user_id: int, symbol: str, alert_type: str,
+                        threshold: float, base_price: float) -> Optional[int]:
+        """ثبت هشدار قیمت و بازگرداندن شناسه آن"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO price_alerts (user_id, symbol, alert_type, threshold, base_price)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING id
+            ''', (user_id, symbol, alert_type, threshold, base_price))
+            alert_id = cursor.fetchone()[0]
+            
+            conn.commit()
+            return alert_id
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ثبت هشدار قیمت: {e}")
+            return None
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def load_price_alerts(self) -> List[Dict[str, Any]]:
+        """دریافت همه هشدارهای قیمت فعال"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, user_id, symbol, alert_type, threshold, base_price
+                FROM price_alerts
+            ''')
+            columns = ('id', 'user_id', 'symbol', 'alert_type', 'threshold', 'base_price')
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت هشدارهای قیمت: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def delete_price_alerts(self, alert_ids: List[int]) -> int:
+        """حذف گروهی هشدارها با یک دستور"""
+        if not alert_ids:
+            return 0
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM price_alerts WHERE id = ANY(%s)', (list(alert_ids),))
+            deleted = cursor.rowcount
+            
+            conn.commit()
+            return deleted
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در حذف هشدارهای قیمت: {e}")
+            return 0
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def get_sports_api_cache(self, cache_type: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """دریافت یک ورودی کش API ورزشی (حتی منقضی‌شده)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            cursor.execute('''
+                SELECT payload, version, fetched_at, expires_at
+                FROM sports_api_cache
+                WHERE cache_type = %s AND cache_key = %s
+            ''', (cache_type, cache_key))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت کش API ورزشی: {e}")
+            return None
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def upsert_sports_api_cache(self, cache_type: str, cache_key: str, payload: Any,
+                                expires_at: datetime.datetime) -> Optional[int]:
+        """ذخیره ورودی کش API ورزشی؛ شماره نسخه جدید را برمی‌گرداند"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO sports_api_cache (cache_type, cache_key, payload, version, fetched_at, expires_at)
+                VALUES (%s, %s, %s, 1, %s, %s)
+                ON CONFLICT (cache_type, cache_key)
+                DO UPDATE SET payload = EXCLUDED.payload,
+                              version = sports_api_cache.version + 1,
+                              fetched_at = EXCLUDED.fetched_at,
+                              expires_at = EXCLUDED.expires_at
+                RETURNING version
+            ''', (cache_type, cache_key, Json(payload), datetime.datetime.now(), expires_at))
+            version = cursor.fetchone()[0]
+            
+            conn.commit()
+            return version
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره کش API ورزشی: {e}")
+            return None
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def get_api_quota_usage(self, provider: str, usage_day: datetime.date) -> List[Dict[str, Any]]:
+        """مصرف سهمیه کلیدهای یک سرویس در یک روز (UTC)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            cursor.execute('''
+                SELECT key_id, used, request_limit, remaining
+                FROM api_quota_usage
+                WHERE provider = %s AND usage_day = %s
+            ''', (provider, usage_day))
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت مصرف سهمیه API: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def save_api_quota_usage(self, provider: str, key_id: str, usage_day: datetime.date, used: int,
+                             request_limit: Optional[int], remaining: Optional[int]) -> bool:
+        """ذخیره مصرف سهمیه یک کلید برای روز جاری"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO api_quota_usage (provider, key_id, usage_day, used, request_limit, remaining, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (provider, key_id, usage_day)
+                DO UPDATE SET used = EXCLUDED.used,
+                              request_limit = EXCLUDED.request_limit,
+                              remaining = EXCLUDED.remaining,
+                              updated_at = NOW()
+            ''', (provider, key_id, usage_day, used, request_limit, remaining))
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره مصرف سهمیه API: {e}")
+            return False
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+    
+    def upsert_sports_fixtures(self, fixtures: List[Dict[str, Any]]) -> int:
+        """درج یا بروزرسانی گروهی بازی‌ها (کلید: fixture_id)"""
+        rows = [
+            (
+                fixture['fixture_id'], fixture['league_key'], fixture.get('league_id'),
+                fixture.get('league_name'), fixture.get('home_team_id'), fixture.get('home_team'),
+                fixture.get('away_team_id'), fixture.get('away_team'), fixture['kickoff'],
+                fixture.get('status'), fixture.get('venue'),
+                fixture.get('score_home'), fixture.get('score_away')
+            )
+            for fixture in fixtures
+            if fixture.get('fixture_id') and fixture.get('kickoff')
+        ]
+        if not rows:
+            return 0
+
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            execute_values(
+                cursor,
+                '''
+                INSERT INTO sports_fixtures
+                    (fixture_id, league_key, league_id, league_name, home_team_id, home_team,
+                     away_team_id, away_team, kickoff, status, venue, score_home, score_away)
+                VALUES %s
+                ON CONFLICT (fixture_id) DO UPDATE
+                SET league_key = EXCLUDED.league_key,
+                    league_name = EXCLUDED.league_name,
+                    home_team = EXCLUDED.home_team,
+                    away_team = EXCLUDED.away_team,
+                    kickoff = EXCLUDED.kickoff,
+                    status = EXCLUDED.status,
+                    venue = EXCLUDED.venue,
+                    score_home = EXCLUDED.score_home,
+                    score_away = EXCLUDED.score_away,
+                    updated_at = NOW()
+                ''',
+                rows,
+                page_size=500
+            )
+
+            conn.commit()
+            return len(rows)
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در ذخیره بازی‌ها: {e}")
+            return 0
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
+    def get_sports_fixtures(self, start: datetime.datetime, end: datetime.datetime,
+                            league_keys: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """بازی‌های بازه [start, end) به ترتیب زمان شروع (اسکن بازه‌ای ایندکس kickoff)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            if league_keys:
+                cursor.execute(
+                    '''
+                    SELECT * FROM sports_fixtures
+                    WHERE kickoff >= %s AND kickoff < %s AND league_key = ANY(%s)
+                    ORDER BY kickoff, fixture_id
+                    ''',
+                    (start, end, list(league_keys))
+                )
+            else:
+                cursor.execute(
+                    '''
+                    SELECT * FROM sports_fixtures
+                    WHERE kickoff >= %s AND kickoff < %s
+                    ORDER BY kickoff, fixture_id
+                    ''',
+                    (start, end)
+                )
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت بازی‌های بازه: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
+    def get_team_fixtures(self, team_id: int, start: datetime.datetime,
+                          limit: int = 5) -> List[Dict[str, Any]]:
+        """بازی‌های بعدی یک تیم از زمان start (دو اسکن بازه‌ای روی ایندکس‌های تیم میزبان و مهمان)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            cursor.execute(
+                '''
+                (SELECT * FROM sports_fixtures
+                 WHERE home_team_id = %s AND kickoff >= %s
+                 ORDER BY kickoff LIMIT %s)
+                UNION ALL
+                (SELECT * FROM sports_fixtures
+                 WHERE away_team_id = %s AND kickoff >= %s
+                 ORDER BY kickoff LIMIT %s)
+                ORDER BY kickoff
+                LIMIT %s
+                ''',
+                (team_id, start, limit, team_id, start, limit, limit)
+            )
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت بازی‌های تیم {team_id}: {e}")
+            return []
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
+    def delete_missing_sports_fixtures(self, start: datetime.datetime, end: datetime.datetime,
+                                       keep_ids: List[int]) -> int:
+        """حذف بازی‌های بازه [start, end) که در دریافت تازه آن بازه نبودند"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                '''
+                DELETE FROM sports_fixtures
+                WHERE kickoff >= %s AND kickoff < %s AND NOT (fixture_id = ANY(%s))
+                ''',
+                (start, end, list(keep_ids))
+            )
+            deleted = cursor.rowcount
+
+            conn.commit()
+            return deleted
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در حذف بازی‌های حذف‌شده از برنامه: {e}")
+            return 0
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
+    def purge_old_sports_fixtures(self, before: datetime.datetime) -> int:
+        """حذف بازی‌هایی که پیش از زمان مشخص شروع شده‌اند"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM sports_fixtures WHERE kickoff < %s', (before,))
+            deleted = cursor.rowcount
+
+            conn.commit()
+            return deleted
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ خطا در پاکسازی بازی‌های قدیمی: {e}")
+            return 0
+        finally:
+            if conn:
+                cursor.close()
+                self.return_connection(conn)
+
     def close(self):
         """بستن pool اتصالات"""
         if hasattr(self, 'connection_pool'):
@@ -10,7 +10,7 @@ from typing import Any, Dict, List
 import os
 
 
-EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info']
+EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info', 'http_session']
 
 class BaseAPI(ABC):
     """
@@ -47,6 +47,16 @@ class BaseAPI(ABC):
         """
         pass
 
+    def http_session(self):
+        """
+        获取共享的 aiohttp 会话（长连接复用，不会在 async with 结束时关闭）
+
+        Returns:
+            异步上下文管理器，产出共享的 aiohttp.ClientSession
+        """
+        from core.http_sessions import http_sessions
+        return http_sessions.session('external_api')
+
     def get_capabilities(self) -> List[Dict[str, Any]]:
         """
         获取数据源所有能力的描述
@@ -160,7 +160,7 @@ class BookingSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # Check response status
                         response.raise_for_status()
@@ -280,7 +280,7 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # 检查响应状态
                         response.raise_for_status()
@@ -449,7 +449,7 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # 检查响应状态
                         response.raise_for_status()
@@ -767,7 +767,7 @@ class BookingSource(BaseAPI):
             request_url = f"{self.proxy_url}/api/v1/hotels/getHotelDetails"
 
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # 检查响应状态
                         response.raise_for_status()
@@ -84,7 +84,7 @@ class CommoditiesSource(BaseAPI):
             request_url = f"{self.proxy_url}/v1/supported"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self._headers, timeout=self._timeout) as response:
                     response.raise_for_status()
 
@@ -171,7 +171,7 @@ class CommoditiesSource(BaseAPI):
             request_url = f"{self.proxy_url}/v1/market-data"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
 
@@ -96,7 +96,7 @@ class MetalSource(BaseAPI):
             request_url = f"{self.proxy_url}/web-crawling/api/gold-index"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.post(request_url, headers=self._headers, params=params, json=payload, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # Parse the response
@@ -7,8 +7,6 @@ import logging
 import math
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from .base import BaseAPI
 
 logger = logging.getLogger("patents_source")
@@ -80,7 +78,7 @@ class PatentSource(BaseAPI):
         request_url = f"{self.proxy_url}/patents"
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.post(request_url, headers=self.headers, json=payload, timeout=self.timeout) as response:
                     response.raise_for_status()
                     data = await response.json()
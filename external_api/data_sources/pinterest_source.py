@@ -118,7 +118,7 @@ class PinterestSource(BaseAPI):
             request_url = f"{self.proxy_url}/pinterest/pins/advance"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.post(request_url, headers=self._headers, json=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # Parse the response
@@ -195,7 +195,7 @@ class PinterestSource(BaseAPI):
             params = {"keyword": username}
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # Parse the response
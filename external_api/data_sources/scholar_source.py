@@ -79,7 +79,7 @@ class ScholarSource(BaseAPI):
         request_url = f"{self.proxy_url}/scholar"
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.post(request_url, headers=self.headers, json=payload, timeout=self.timeout) as response:
                     response.raise_for_status()
                     data = await response.json()
@@ -148,7 +148,7 @@ class TwitterSource(BaseAPI):
             request_url = f"{self.proxy_url}/search/search"
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # 解析响应
@@ -273,7 +273,7 @@ class TwitterSource(BaseAPI):
                 params["user_id"] = user_id
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # 解析响应
@@ -384,7 +384,7 @@ class TwitterSource(BaseAPI):
                 params["user_id"] = user_id
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # 解析响应
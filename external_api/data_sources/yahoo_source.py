@@ -125,7 +125,7 @@ class YahooFinanceSource(BaseAPI):
             request_url = f"{self.proxy_url}/stock/v3/get-chart"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                     response.raise_for_status()
                     # Parse the response
@@ -204,7 +204,7 @@ class YahooFinanceSource(BaseAPI):
 
             # 发送POST请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     # 使用POST请求，并设置空数据体
                     async with session.post(
                         request_url,
@@ -356,7 +356,7 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         response.raise_for_status()
                         data = await response.json()
@@ -568,7 +568,7 @@ class YahooFinanceSource(BaseAPI):
             params = {"symbol": symbol}
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 try:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # Check response status
@@ -709,7 +709,7 @@ class YahooFinanceSource(BaseAPI):
                 params["lang"] = lang
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self.http_session() as session:
                 try:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # Check response status
@@ -852,7 +852,7 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self.http_session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         response.raise_for_status()
                         data = await response.json()
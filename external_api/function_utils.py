@@ -63,10 +63,13 @@ class FunctionProxy:
         if tool_result is not None:
             return tool_result
 
+        from core.http_sessions import http_sessions
+
         timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        # 复用共享会话，避免每次调用都重新建立连接
+        async with http_sessions.session("function_proxy") as session:
             try:
-                async with session.post(f"{self.get_server_url()}/execute", json=request) as response:
+                async with session.post(f"{self.get_server_url()}/execute", json=request, timeout=timeout) as response:
                     if response.status != 200:
                         return ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
 
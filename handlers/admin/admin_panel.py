@@ -16,6 +16,9 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes, CallbackQueryHandler
 from database.database import DatabaseManager, DatabaseLogger
 from core.logger_system import bot_logger
+from core.http_sessions import http_sessions
+from services.market_snapshot_service import market_snapshot_service
+from services.media_cache_service import media_cache
 from handlers.ai.multi_provider_handler import MultiProviderHandler
 
 class AdminPanel:
@@ -31,6 +34,7 @@ class AdminPanel:
         self.logger = DatabaseLogger(db_manager)
         self.bot_start_time = datetime.datetime.now()
         self.refresh_weekly_cache = refresh_weekly_cache
+        self.tradingview_fetcher = None
 
     def set_weekly_cache_refresher(
         self,
@@ -39,6 +43,10 @@ class AdminPanel:
         """تنظیم تابع بروزرسانی کش برنامه بازی‌های هفتگی"""
         self.refresh_weekly_cache = callback
 
+    def set_tradingview_fetcher(self, fetcher) -> None:
+        """تنظیم fetcher تحلیل TradingView برای نمایش آمار کش جفت ارزها"""
+        self.tradingview_fetcher = fetcher
+
     def create_main_menu_keyboard(self) -> InlineKeyboardMarkup:
         """ساخت کیبورد منوی اصلی ادمین - بهینه شده"""
         keyboard = [
@@ -280,6 +288,20 @@ class AdminPanel:
 **💾 دیتابیس:**
 • وضعیت: ✅ متصل
 • آخرین بک‌آپ: نیاز به پیاده‌سازی
+
+**🌐 اتصالات HTTP:**
+{http_sessions.format_metrics()}
+
+**📈 منابع قیمت بازار:**
+{market_snapshot_service.format_source_stats()}
+
+**🖼 کش رسانه (file_id):**
+{media_cache.format_stats()}
+"""
+        if self.tradingview_fetcher:
+            message += f"""
+**📊 کش تحلیل TradingView:**
+{self.tradingview_fetcher.format_cache_stats()}
         """
         return message
     
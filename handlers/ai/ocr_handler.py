@@ -14,17 +14,20 @@
 - fallback به Tesseract محلی در صورت عدم دسترسی
 """
 
+import asyncio
 import logging
-import requests
 import base64
 import io
 import time
 import subprocess
-import tempfile
 from PIL import Image
 from typing import Optional, Dict, Any
 import os
 
+import aiohttp
+
+from core.http_sessions import http_sessions
+
 logger = logging.getLogger(__name__)
 
 class OCRHandler:
@@ -45,6 +48,7 @@ class OCRHandler:
         
         # تنظیمات fallback Tesseract
         self.tesseract_available = self._check_tesseract()
+        self._install_attempted = False
         
         logger.info("✅ OCRHandler مقداردهی شد")
         logger.info(f"🔑 Ocr.space API key: {'SET' if self.ocr_space_api_key != 'helloworld' else 'DEFAULT'}")
@@ -126,7 +130,7 @@ class OCRHandler:
                 'error': f'فایل تصویری معتبر نیست: {str(e)}'
             }
     
-    def extract_text_from_image(self, image_data: bytes, query: str = None) -> Dict[str, Any]:
+    async def extract_text_from_image(self, image_data: bytes, query: str = None) -> Dict[str, Any]:
         """استخراج متن از تصویر با Ocr.space API"""
         
         # مقدار پیش‌فرض کوئری
@@ -134,8 +138,8 @@ class OCRHandler:
             query = "استخراج متن از تصویر"
         
         try:
-            # اعتبارسنجی تصویر
-            validation = self.validate_image(image_data)
+            # اعتبارسنجی تصویر (decode با PIL در thread جداگانه)
+            validation = await asyncio.to_thread(self.validate_image, image_data)
             if not validation['valid']:
                 return {
                     'success': False,
@@ -145,13 +149,13 @@ class OCRHandler:
             logger.info(f"📸 شروع پردازش OCR با کوئری: {query}")
             
             # تلاش با Ocr.space API
-            ocr_result = self._extract_with_ocr_space(image_data)
+            ocr_result = await self._extract_with_ocr_space(image_data)
             if ocr_result:
                 return ocr_result
             
             # fallback به Tesseract محلی
-            if self.tesseract_available or self._install_tesseract_if_needed():
-                tesseract_result = self._extract_with_tesseract(image_data)
+            if self.tesseract_available or await self._ensure_tesseract():
+                tesseract_result = await self._extract_with_tesseract(image_data)
                 if tesseract_result:
                     return tesseract_result
             
@@ -168,37 +172,47 @@ class OCRHandler:
                 'error': f'خطا در پردازش تصویر: {str(e)}'
             }
     
-    def _extract_with_ocr_space(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+    async def _ensure_tesseract(self) -> bool:
+        """نصب Tesseract در thread جداگانه (فقط یک بار در طول اجرا)"""
+        if self._install_attempted:
+            return self.tesseract_available
+        self._install_attempted = True
+        self.tesseract_available = await asyncio.to_thread(self._install_tesseract_if_needed)
+        return self.tesseract_available
+    
+    async def _extract_with_ocr_space(self, image_data: bytes) -> Optional[Dict[str, Any]]:
         """استخراج متن با Ocr.space API"""
         try:
             logger.info("🌐 Using Ocr.space API...")
             
             # آماده‌سازی درخواست
-            files = {'file': ('image.png', image_data, 'image/png')}
-            data = {
+            form = aiohttp.FormData()
+            form.add_field('file', image_data, filename='image.png', content_type='image/png')
+            for key, value in {
                 'apikey': self.ocr_space_api_key,
                 'language': 'auto',  # تشخیص خودکار زبان
-                'isOverlayRequired': False,
-                'scale': True,
-                'detectOrientation': True,
-                'OCREngine': 2,  # موتور 2 برای زبان‌های بیشتر
-                'isTable': False,
-                'detectCheckbox': False
-            }
+                'isOverlayRequired': 'false',
+                'scale': 'true',
+                'detectOrientation': 'true',
+                'OCREngine': '2',  # موتور 2 برای زبان‌های بیشتر
+                'isTable': 'false',
+                'detectCheckbox': 'false'
+            }.items():
+                form.add_field(key, value)
             
             # ارسال درخواست
             start_time = time.time()
-            response = requests.post(
+            session = http_sessions.get('ocr')
+            async with session.post(
                 self.ocr_space_url,
-                files=files,
-                data=data,
-                timeout=self.timeout
-            )
+                data=form,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                status = response.status
+                result = await response.json(content_type=None) if status == 200 else None
             processing_time = time.time() - start_time
             
-            if response.status_code == 200:
-                result = response.json()
-                
+            if status == 200:
                 # بررسی نتیجه
                 if not result.get('IsErroredOnProcessing', True):
                     parsed_results = result.get('ParsedResults', [])
@@ -226,14 +240,14 @@ class OCRHandler:
                     'method': 'ocr_space'
                 }
             else:
-                logger.error(f"❌ Ocr.space HTTP error: {response.status_code}")
+                logger.error(f"❌ Ocr.space HTTP error: {status}")
                 return {
                     'success': False,
-                    'error': f'Ocr.space HTTP error: {response.status_code}',
+                    'error': f'Ocr.space HTTP error: {status}',
                     'method': 'ocr_space'
                 }
                 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             logger.error("⏱️ Ocr.space timeout")
             return {
                 'success': False,
@@ -244,56 +258,50 @@ class OCRHandler:
             logger.error(f"❌ Ocr.space exception: {e}")
             return None  # None یعنی try کردن method دیگر
     
-    def _extract_with_tesseract(self, image_data: bytes) -> Optional[Dict[str, Any]]:
-        """استخراج متن با Tesseract محلی"""
+    async def _extract_with_tesseract(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+        """استخراج متن با Tesseract محلی (تصویر از stdin، بدون فایل موقت)"""
         try:
             logger.info("🖥️ Using local Tesseract OCR...")
             
-            # ذخیره موقتی تصویر
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                temp_file.write(image_data)
-                temp_path = temp_file.name
-            
+            # اجرای tesseract فقط با انگلیسی
+            start_time = time.time()
+            process = await asyncio.create_subprocess_exec(
+                'tesseract', 'stdin', 'stdout', '-l', 'eng', '--psm', '6',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
             try:
-                # اجرای tesseract فقط با انگلیسی
-                start_time = time.time()
-                result = subprocess.run(
-                    ['tesseract', temp_path, 'stdout', '-l', 'eng', '--psm', '6'],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout
-                )
-                processing_time = time.time() - start_time
-                
-                if result.returncode == 0:
-                    extracted_text = result.stdout.strip()
-                    
-                    if extracted_text:
-                        logger.info(f"✅ Tesseract extracted: {len(extracted_text)} characters")
-                        return {
-                            'success': True,
-                            'extracted_text': extracted_text,
-                            'confidence': 0.75,  # Tesseract confidence تقریبی
-                            'processing_time': processing_time,
-                            'method': 'tesseract',
-                            'languages': 'en+fa'
-                        }
-                
-                logger.warning(f"⚠️ Tesseract error: {result.stderr}")
-                return {
-                    'success': False,
-                    'error': f'Tesseract خطا: {result.stderr}',
-                    'method': 'tesseract'
-                }
+                stdout, stderr = await asyncio.wait_for(process.communicate(image_data), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+            processing_time = time.time() - start_time
+            
+            if process.returncode == 0:
+                extracted_text = stdout.decode('utf-8', errors='replace').strip()
                 
-            finally:
-                # پاک کردن فایل موقت
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                if extracted_text:
+                    logger.info(f"✅ Tesseract extracted: {len(extracted_text)} characters")
+                    return {
+                        'success': True,
+                        'extracted_text': extracted_text,
+                        'confidence': 0.75,  # Tesseract confidence تقریبی
+                        'processing_time': processing_time,
+                        'method': 'tesseract',
+                        'languages': 'en+fa'
+                    }
+            
+            error_output = stderr.decode('utf-8', errors='replace')
+            logger.warning(f"⚠️ Tesseract error: {error_output}")
+            return {
+                'success': False,
+                'error': f'Tesseract خطا: {error_output}',
+                'method': 'tesseract'
+            }
                     
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error("⏱️ Tesseract timeout")
             return {
                 'success': False,
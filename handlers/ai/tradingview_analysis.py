@@ -8,11 +8,221 @@ TradingView Analysis Fetcher - بهبود یافته
 
 import aiohttp
 import asyncio
+import os
 import re
 import html
+import logging
+import time
 import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from core.http_sessions import http_sessions
+from services.symbol_index_service import symbol_index
+
+logger = logging.getLogger(__name__)
+
+# فقط لینک‌های ایده (کارت‌های تحلیل) انتخاب می‌شوند؛ بقیه صفحه پیمایش نمی‌شود
+IDEA_LINK_XPATH = "//a[contains(@href, '/chart/')]"
+IDEA_IMAGE_XPATH = "//img[contains(@src, 'tradingview.com') and contains(@src, '_mid.png')]/@src"
+RELATIVE_TIME_RE = re.compile(r'(\d+)\s*(hour|day|week|month)[s]?\s*ago', re.IGNORECASE)
+RELATIVE_TIME_UNITS = {'hour': 'hours', 'day': 'days', 'week': 'weeks', 'month': 'months'}
+DESCRIPTION_CLASS_KEYWORDS = ('content', 'description', 'text', 'body')
+AUTHOR_CLASS_KEYWORDS = ('user', 'author', 'name')
+
+
+def _element_text(element) -> str:
+    """معادل get_text(strip=True) در BeautifulSoup"""
+    return ''.join(part.strip() for part in element.itertext())
+
+
+def _is_idea_href(href: str) -> bool:
+    """لینک‌های تحلیل معمولاً شامل /chart/ و شناسه تحلیل هستند (بدون لینک‌های کامنت)"""
+    if '/chart/' not in href or '#chart-view-comment-form' in href:
+        return False
+    tail = href.split('/chart/')[-1]
+    return '/' in tail and len(tail) > 10 and '-' in tail
+
+
+def _parse_publish_time(element, text: str) -> Optional[datetime.datetime]:
+    """زمان انتشار از attribute datetime یا متن‌هایی مثل «3 hours ago»"""
+    value = element.get('datetime')
+    if value:
+        try:
+            published = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            # زمان‌ها به صورت naive محلی نگه داشته می‌شوند تا با زمان‌های نسبی قابل مقایسه باشند
+            return published.astimezone().replace(tzinfo=None) if published.tzinfo else published
+        except ValueError:
+            pass
+    match = RELATIVE_TIME_RE.search(text)
+    if match:
+        number, unit = int(match.group(1)), match.group(2).lower()
+        if unit == 'month':
+            return datetime.datetime.now() - datetime.timedelta(days=number * 30)
+        return datetime.datetime.now() - datetime.timedelta(**{RELATIVE_TIME_UNITS[unit]: number})
+    return None
+
+
+class _PageFallbacks:
+    """مقادیر جایگزین سطح صفحه که فقط یک بار (و فقط در صورت نیاز) محاسبه می‌شوند"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._image = self._descriptions = self._author = None
+
+    @property
+    def image(self) -> Optional[str]:
+        if self._image is None:
+            sources = self.tree.xpath(IDEA_IMAGE_XPATH)
+            self._image = sources[0].replace('_mid.png', '.png') if sources else ''
+        return self._image or None
+
+    @property
+    def descriptions(self) -> List[str]:
+        if self._descriptions is None:
+            self._descriptions = []
+            for div in self.tree.xpath('//div[@class]')[:20]:
+                if any(keyword in div.get('class', '').lower() for keyword in DESCRIPTION_CLASS_KEYWORDS):
+                    text = _element_text(div)
+                    if 50 < len(text) < 800:
+                        self._descriptions.append(text)
+        return self._descriptions
+
+    @property
+    def author(self) -> str:
+        if self._author is None:
+            self._author = 'TradingView Community'
+            for element in self.tree.xpath('//span[@class] | //div[@class] | //a[@class]')[:30]:
+                if any(keyword in element.get('class', '').lower() for keyword in ('user', 'author', 'username')):
+                    text = _element_text(element)
+                    if 2 < len(text) < 30:
+                        self._author = text
+                        break
+        return self._author
+
+
+def _parse_idea_card(link, parent, fallbacks: _PageFallbacks) -> Dict[str, Any]:
+    """استخراج همه فیلدهای یک کارت ایده در یک پیمایش از عنصر والد لینک"""
+    image_url = None
+    author = None
+    publish_time = None
+    description_candidates = []
+    description_count = author_count = 0
+
+    if parent is not None:
+        # عناصر مجاور بعدی
+        for sibling in list(parent.itersiblings())[:5]:
+            text = _element_text(sibling)
+            if 30 < len(text) < 500:
+                description_candidates.append(text)
+
+        for element in parent.iterdescendants():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == 'img':
+                src = element.get('src', '')
+                if image_url is None and 'tradingview.com' in src and '_mid.png' in src:
+                    # تبدیل به کیفیت اصلی (حذف _mid)
+                    image_url = src.replace('_mid.png', '.png')
+                continue
+            if tag not in ('p', 'div', 'span', 'a', 'time'):
+                continue
+
+            text = _element_text(element)
+            if tag in ('p', 'div', 'span') and description_count < 10:
+                description_count += 1
+                if 30 < len(text) < 500:
+                    description_candidates.append(text)
+            if tag in ('span', 'div', 'a') and author is None and author_count < 10:
+                author_count += 1
+                class_names = element.get('class', '').lower()
+                if (any(keyword in class_names for keyword in AUTHOR_CLASS_KEYWORDS) or
+                        (2 < len(text) < 30 and '@' not in text and
+                         not any(char.isdigit() for char in text) and text.count(' ') <= 2)):
+                    author = text
+            if tag in ('time', 'span') and publish_time is None:
+                publish_time = _parse_publish_time(element, text)
+
+    if image_url is None:
+        image_url = fallbacks.image
+
+    description_candidates.extend(fallbacks.descriptions)
+    if description_candidates:
+        # ترجیح متن با طول متوسط
+        best_desc = min(description_candidates, key=lambda text: abs(len(text) - 200))
+        description = best_desc[:400] + "..." if len(best_desc) > 400 else best_desc
+    else:
+        description = "📊 تحلیل جدید کامیونیتی TradingView - جزئیات بیشتر با کلیک روی لینک"
+
+    return {
+        'image_url': image_url,
+        'description': description,
+        'author': author or fallbacks.author,
+        'publish_time': publish_time,
+    }
+
+
+def parse_idea_cards(content: str, sort_type: str = "popular") -> List[Dict[str, Any]]:
+    """
+    پارس صفحه ایده‌های TradingView با lxml (بدون ساخت درخت BeautifulSoup)
+    فقط لینک‌های ایده با XPath انتخاب و هر کارت در یک پیمایش استخراج می‌شود.
+    این تابع CPU-bound است و در thread جداگانه اجرا می‌شود.
+
+    Returns:
+        لیست ایده‌ها، مرتب‌شده بر اساس زمان انتشار (جدیدترین اول)
+    """
+    tree = lxml_html.fromstring(content)
+    fallbacks = _PageFallbacks(tree)
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+
+    candidate_ideas = []
+    processed_urls = set()  # برای جلوگیری از تکرار در همین صفحه
+
+    for link in tree.xpath(IDEA_LINK_XPATH):
+        href = link.get('href', '')
+        if not _is_idea_href(href):
+            continue
+
+        # تشکیل URL کامل برای ایده (بدون fragment)
+        clean_href = href.split('#')[0]
+        analysis_url = clean_href if clean_href.startswith('http') else f"https://www.tradingview.com{clean_href}"
+        if analysis_url in processed_urls:
+            continue
+        processed_urls.add(analysis_url)
+
+        parent = link.getparent()
+        title = _element_text(link) or link.get('title', '')
+        # اگر title خیلی کوتاه بود، از عنصر والد بگیر
+        if len(title) < 5 and parent is not None:
+            title = _element_text(parent)[:100]
+
+        # حذف title های بی‌معنی
+        if len(title) <= 5 or title.lower() in ('comment', 'view', 'chart', 'ideas') or title.isdigit():
+            continue
+
+        idea_data = {
+            'title': title,
+            'analysis_url': analysis_url,
+            'timestamp': timestamp,
+            'sort_type': sort_type,
+        }
+        idea_data.update(_parse_idea_card(link, parent, fallbacks))
+        candidate_ideas.append(idea_data)
+
+    # ایده‌هایی که زمان انتشار دارند اولویت بالاتری دارند، سپس توضیحات بلندتر
+    candidate_ideas.sort(key=lambda x: (
+        x['publish_time'] is not None,
+        x['publish_time'] or datetime.datetime.min,
+        len(x['description'])
+    ), reverse=True)
+    return candidate_ideas
+
+
+WARM_PAIRS_DEFAULT = ('btcusdt', 'ethusdt', 'solusdt', 'bnbusdt', 'xrpusdt', 'dogeusdt', 'adausdt')
+WARM_CONCURRENCY = 2
+
 
 class TradingViewAnalysisFetcher:
     def __init__(self):
@@ -26,8 +236,22 @@ class TradingViewAnalysisFetcher:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
-        # سیستم de-duplication گلوبال برای جلوگیری از لینک‌های تکراری
-        self.global_used_urls = set()
+        # کش کوتاه‌مدت نتیجه هر جفت ارز و درخواست‌های در حال اجرا (ادغام درخواست‌های همزمان کاربران)
+        self.cache_ttl = int(os.getenv('TRADINGVIEW_CACHE_TTL', '300'))
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # جفت ارزهای پرتقاضا که به صورت دوره‌ای از قبل دریافت می‌شوند (warm cache)
+        self.warm_pairs = [
+            pair.strip().lower()
+            for pair in os.getenv('TRADINGVIEW_WARM_PAIRS', ','.join(WARM_PAIRS_DEFAULT)).split(',')
+            if pair.strip()
+        ]
+        self.warm_interval = int(os.getenv('TRADINGVIEW_WARM_INTERVAL', '10'))
+        # تصاویر تحلیل‌های جفت ارزهای گرم (URL -> بایت‌ها)
+        self._images: Dict[str, bytes] = {}
+        # آمار کش برای هر جفت ارز: درخواست، hit، miss و تعداد دفعات گرم‌سازی
+        self.pair_stats: Dict[str, Dict[str, int]] = {}
+        self.last_warm_at: Optional[float] = None
     
     def validate_crypto_pair_format(self, pair: str) -> bool:
         """اعتبارسنجی فرمت جفت ارز - فقط فرمت مانند btcusdt قابل قبول است"""
@@ -41,353 +265,57 @@ class TradingViewAnalysisFetcher:
             return pair[:-4]  # حذف 'usdt' از انتها
         return pair
     
-    async def scrape_community_analysis(self, symbol: str, sort_type: str = "popular") -> Optional[Dict[str, Any]]:
-        """دریافت تحلیل واقعی از کامیونیتی TradingView
+    async def scrape_community_candidates(self, symbol: str, sort_type: str = "popular") -> List[Dict[str, Any]]:
+        """دریافت همه ایده‌های صفحه کامیونیتی TradingView (مرتب‌شده، بهترین اول)
         
         sort_type: "popular" (محبوب‌ترین) یا "recent" (جدیدترین)
         """
         try:
-            timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout, headers=self.headers) as session:
+            async with http_sessions.session('tradingview') as session:
                 # ساخت URL بر اساس نوع مرتب‌سازی
                 if sort_type == "recent":
                     search_url = f"https://www.tradingview.com/symbols/{symbol}/ideas/?sort=recent"
                 else:  # popular (پیش‌فرض)
                     search_url = f"https://www.tradingview.com/symbols/{symbol}/ideas/"
                 
-                async with session.get(search_url) as response:
+                async with session.get(search_url, headers=self.headers) as response:
                     if response.status == 200:
                         content = await response.text()
-                        return self.parse_community_content(content, symbol, sort_type)
+                        # پارس CPU-bound در thread جداگانه تا event loop مسدود نشود
+                        return await asyncio.to_thread(self.parse_community_candidates, content, symbol, sort_type)
                     else:
-                        return None
+                        return []
                         
         except Exception as e:
             print(f"خطا در scraping: {e}")
-            return None
+            return []
     
-    def parse_community_content(self, content: str, symbol: str, sort_type: str = "popular") -> Optional[Dict[str, Any]]:
-        """پارس کردن محتوای کامیونیتی TradingView"""
-        try:
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # جمع‌آوری همه ایده‌های مرتبط
-            candidate_ideas = []
-            idea_links = soup.find_all('a', href=True)
-            processed_urls = set()  # برای جلوگیری از تکرار محلی
-            
-            for link in idea_links:
-                href = link.get('href', '')
-                # بررسی برای لینک‌های ایده اصلی TradingView
-                # لینک‌های تحلیل معمولاً شامل /chart/ و شناسه تحلیل هستند
-                if ('/chart/' in href and 
-                    '/' in href.split('/chart/')[-1] and 
-                    any(char.isalnum() for char in href) and 
-                    len(href.split('/chart/')[-1]) > 10 and
-                    '-' in href.split('/chart/')[-1] and
-                    '#chart-view-comment-form' not in href):  # حذف لینک‌های کامنت
-                    
-                    # تشکیل URL کامل برای ایده (بدون fragment)
-                    clean_href = href.split('#')[0]  # حذف قسمت # و بعدش
-                    analysis_url = clean_href if clean_href.startswith('http') else f"https://www.tradingview.com{clean_href}"
-                    
-                    # چک کردن اینکه این URL قبلاً پردازش شده یا نه (محلی و گلوبال)
-                    if analysis_url in processed_urls or analysis_url in self.global_used_urls:
-                        continue
-                    processed_urls.add(analysis_url)
-                    self.global_used_urls.add(analysis_url)  # اضافه کردن به لیست گلوبال
-                    
-                    # استخراج title از متن لینک یا از عنصر والد
-                    title = link.get_text(strip=True) or link.get('title', '')
-                    
-                    # اگر title خیلی کوتاه بود، از عنصر والد بگیر
-                    if not title or len(title) < 5:
-                        parent = link.parent
-                        if parent:
-                            title = parent.get_text(strip=True)[:100]
-                    
-                    # حذف title های بی‌معنی
-                    if (title and len(title) > 5 and 
-                        not title.lower() in ['comment', 'view', 'chart', 'ideas'] and
-                        not title.isdigit()):
-                        
-                        # جستجو برای عکس در نزدیکی لینک
-                        image_url = self.find_related_image(soup, link)
-                        
-                        # استخراج توضیحات بهبود یافته
-                        description = self.extract_description_from_soup(soup, link)
-                        
-                        # استخراج نام نویسنده
-                        author = self.extract_author_from_soup(soup, link)
-                        
-                        # استخراج زمان انتشار (اگر موجود باشد)
-                        publish_time = self.extract_publish_time(soup, link)
-                        
-                        idea_data = {
-                            'title': title,
-                            'description': description,
-                            'analysis_url': analysis_url,
-                            'image_url': image_url,
-                            'author': author,
-                            'publish_time': publish_time,
-                            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M'),
-                            'sort_type': sort_type
-                        }
-                        
-                        candidate_ideas.append(idea_data)
-            
-            # اگر هیچ ایده‌ای پیدا نشد
-            if not candidate_ideas:
-                return None
-            
-            # مرتب‌سازی بر اساس زمان انتشار (جدیدترین اول)
-            # ایده‌هایی که زمان انتشار دارند اولویت بالاتری دارند
-            candidate_ideas.sort(key=lambda x: (
-                x['publish_time'] is not None,  # ایده‌های با زمان اول
-                x['publish_time'] if x['publish_time'] else datetime.datetime.min,
-                len(x['description'])  # توضیحات بلندتر اولویت بیشتر
-            ), reverse=True)
-            
-            # برگرداندن جدیدترین و بهترین ایده
-            return candidate_ideas[0]
-            
-        except Exception as e:
-            print(f"خطا در parse_community_content: {e}")
-            return None
-    
-    def find_related_image(self, soup: BeautifulSoup, link_element) -> Optional[str]:
-        """پیدا کردن عکس مرتبط با لینک تحلیل با کیفیت بهبود یافته"""
-        try:
-            # جستجو در نزدیکی لینک
-            parent = link_element.parent
-            if parent:
-                imgs = parent.find_all('img', src=True)
-                for img in imgs:
-                    src = img['src']
-                    if 'tradingview.com' in src and '_mid.png' in src:
-                        # تبدیل به کیفیت اصلی (حذف _mid و استفاده از .png)
-                        high_quality_src = src.replace('_mid.png', '.png')
-                        return high_quality_src
-            
-            # جستجو کلی در صفحه
-            all_imgs = soup.find_all('img', src=True)
-            for img in all_imgs:
-                src = img['src']
-                if 'tradingview.com' in src and '_mid.png' in src:
-                    # تبدیل به کیفیت اصلی (حذف _mid و استفاده از .png)
-                    high_quality_src = src.replace('_mid.png', '.png')
-                    return high_quality_src
-            
-            return None
-        except:
-            return None
-    
-    def extract_description_from_soup(self, soup: BeautifulSoup, link_element) -> str:
-        """استخراج توضیحات بهبود یافته از soup"""
-        try:
-            # جستجو در عناصر مختلف برای پیدا کردن توضیحات
-            parent = link_element.parent
-            description_candidates = []
-            
-            if parent:
-                # جستجو در عناصر مجاور
-                for sibling in parent.find_next_siblings()[:5]:
-                    text = sibling.get_text(strip=True)
-                    if len(text) > 30 and len(text) < 500:
-                        description_candidates.append(text)
-                
-                # جستجو در عناصر فرزند
-                for child in parent.find_all(['p', 'div', 'span'])[:10]:
-                    text = child.get_text(strip=True)
-                    if len(text) > 30 and len(text) < 500:
-                        description_candidates.append(text)
-            
-            # جستجو کلی در صفحه برای div هایی که ممکن است شامل توضیحات باشند
-            for div in soup.find_all('div', class_=True)[:20]:
-                class_names = ' '.join(div.get('class', []))
-                if any(keyword in class_names.lower() for keyword in ['content', 'description', 'text', 'body']):
-                    text = div.get_text(strip=True)
-                    if len(text) > 50 and len(text) < 800:
-                        description_candidates.append(text)
-            
-            # انتخاب بهترین توضیحات
-            if description_candidates:
-                # مرتب‌سازی بر اساس طول (ترجیح متن با طول متوسط)
-                description_candidates.sort(key=lambda x: abs(len(x) - 200))
-                best_desc = description_candidates[0]
-                return best_desc[:400] + "..." if len(best_desc) > 400 else best_desc
-            
-            return "📊 تحلیل جدید کامیونیتی TradingView - جزئیات بیشتر با کلیک روی لینک"
-        except Exception as e:
-            print(f"خطا در extract_description: {e}")
-            return "📊 تحلیل جدید کامیونیتی TradingView"
+    async def scrape_community_analysis(self, symbol: str, sort_type: str = "popular",
+                                        exclude_urls: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+        """دریافت بهترین تحلیل کامیونیتی TradingView (به جز لینک‌های exclude_urls)"""
+        candidates = await self.scrape_community_candidates(symbol, sort_type)
+        return self.pick_candidate(candidates, exclude_urls)
     
-    def extract_author_from_soup(self, soup: BeautifulSoup, link_element) -> str:
-        """استخراج نام نویسنده تحلیل"""
-        try:
-            # جستجو در نزدیکی لینک برای نام کاربری
-            parent = link_element.parent
-            if parent:
-                # جستجو برای عناصری که ممکن است شامل نام کاربری باشند
-                for element in parent.find_all(['span', 'div', 'a'])[:10]:
-                    text = element.get_text(strip=True)
-                    class_names = ' '.join(element.get('class', []))
-                    
-                    # اگر شامل کلمات کلیدی مرتبط با کاربر باشد
-                    if (any(keyword in class_names.lower() for keyword in ['user', 'author', 'name']) or
-                        (len(text) > 2 and len(text) < 30 and '@' not in text and 
-                         not any(char.isdigit() for char in text) and text.count(' ') <= 2)):
-                        return text
-            
-            # جستجو کلی در صفحه
-            for element in soup.find_all(['span', 'div', 'a'], class_=True)[:30]:
-                class_names = ' '.join(element.get('class', []))
-                if any(keyword in class_names.lower() for keyword in ['user', 'author', 'username']):
-                    text = element.get_text(strip=True)
-                    if len(text) > 2 and len(text) < 30:
-                        return text
-            
-            return 'TradingView Community'
-        except:
-            return 'TradingView Community'
+    @staticmethod
+    def pick_candidate(candidates: List[Dict[str, Any]], exclude_urls: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+        """اولین ایده‌ای که لینک آن در exclude_urls نیست"""
+        for idea in candidates:
+            if not exclude_urls or idea['analysis_url'] not in exclude_urls:
+                return idea
+        return None
     
-    def extract_publish_time(self, soup: BeautifulSoup, link_element) -> Optional[datetime.datetime]:
-        """استخراج زمان انتشار تحلیل"""
-        try:
-            parent = link_element.parent
-            if parent:
-                # جستجو برای عناصری که ممکن است شامل زمان باشند
-                time_elements = parent.find_all(['time', 'span'])
-                for element in time_elements:
-                    # بررسی datetime attribute
-                    if element.get('datetime'):
-                        try:
-                            return datetime.datetime.fromisoformat(element['datetime'].replace('Z', '+00:00'))
-                        except:
-                            pass
-                    
-                    # بررسی متن برای الگوهای زمانی
-                    text = element.get_text(strip=True)
-                    time_patterns = [
-                        r'(\d+)\s*hour[s]?\s*ago',
-                        r'(\d+)\s*day[s]?\s*ago',
-                        r'(\d+)\s*week[s]?\s*ago',
-                        r'(\d+)\s*month[s]?\s*ago'
-                    ]
-                    
-                    for pattern in time_patterns:
-                        match = re.search(pattern, text, re.IGNORECASE)
-                        if match:
-                            number = int(match.group(1))
-                            if 'hour' in text.lower():
-                                return datetime.datetime.now() - datetime.timedelta(hours=number)
-                            elif 'day' in text.lower():
-                                return datetime.datetime.now() - datetime.timedelta(days=number)
-                            elif 'week' in text.lower():
-                                return datetime.datetime.now() - datetime.timedelta(weeks=number)
-                            elif 'month' in text.lower():
-                                return datetime.datetime.now() - datetime.timedelta(days=number*30)
-            
-            return None
-        except:
-            return None
+    def parse_community_content(self, content: str, symbol: str, sort_type: str = "popular",
+                                exclude_urls: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+        """پارس کردن محتوای کامیونیتی TradingView و انتخاب بهترین ایده"""
+        return self.pick_candidate(self.parse_community_candidates(content, symbol, sort_type), exclude_urls)
     
-    async def scrape_community_analysis_alternative(self, symbol: str, sort_type: str = "recent") -> Optional[Dict[str, Any]]:
-        """دریافت تحلیل جایگزین در صورت تکراری بودن لینک اول"""
+    def parse_community_candidates(self, content: str, symbol: str, sort_type: str = "popular") -> List[Dict[str, Any]]:
+        """پارس کردن محتوای کامیونیتی TradingView و بازگرداندن همه ایده‌ها (مرتب‌شده)"""
         try:
-            timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout, headers=self.headers) as session:
-                # ساخت URL بر اساس نوع مرتب‌سازی
-                if sort_type == "recent":
-                    search_url = f"https://www.tradingview.com/symbols/{symbol}/ideas/?sort=recent"
-                else:
-                    search_url = f"https://www.tradingview.com/symbols/{symbol}/ideas/"
-                
-                async with session.get(search_url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        return self.parse_community_content_alternative(content, symbol, sort_type)
-                    else:
-                        return None
-                        
+            return parse_idea_cards(content, sort_type)
         except Exception as e:
-            print(f"خطا در scraping جایگزین: {e}")
-            return None
-    
-    def parse_community_content_alternative(self, content: str, symbol: str, sort_type: str = "recent") -> Optional[Dict[str, Any]]:
-        """پارس کردن محتوای کامیونیتی TradingView برای یافتن تحلیل جایگزین (تحلیل دوم)"""
-        try:
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # جمع‌آوری همه ایده‌های مرتبط
-            candidate_ideas = []
-            idea_links = soup.find_all('a', href=True)
-            processed_urls = set()
-            
-            for link in idea_links:
-                href = link.get('href', '')
-                
-                if ('/chart/' in href and 
-                    '/' in href.split('/chart/')[-1] and 
-                    any(char.isalnum() for char in href) and 
-                    len(href.split('/chart/')[-1]) > 10 and
-                    '-' in href.split('/chart/')[-1] and
-                    '#chart-view-comment-form' not in href):
-                    
-                    clean_href = href.split('#')[0]
-                    analysis_url = clean_href if clean_href.startswith('http') else f"https://www.tradingview.com{clean_href}"
-                    
-                    if analysis_url in processed_urls:
-                        continue
-                    processed_urls.add(analysis_url)
-                    
-                    # استخراج اطلاعات
-                    title = link.get_text(strip=True) or link.get('title', '')
-                    
-                    if not title or len(title) < 5:
-                        parent = link.parent
-                        if parent:
-                            title = parent.get_text(strip=True)[:100]
-                    
-                    if (title and len(title) > 5 and 
-                        not title.lower() in ['comment', 'view', 'chart', 'ideas'] and
-                        not title.isdigit()):
-                        
-                        image_url = self.find_related_image(soup, link)
-                        description = self.extract_description_from_soup(soup, link)
-                        author = self.extract_author_from_soup(soup, link)
-                        publish_time = self.extract_publish_time(soup, link)
-                        
-                        idea_data = {
-                            'title': title,
-                            'description': description,
-                            'analysis_url': analysis_url,
-                            'image_url': image_url,
-                            'author': author,
-                            'publish_time': publish_time,
-                            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M'),
-                            'sort_type': sort_type
-                        }
-                        
-                        candidate_ideas.append(idea_data)
-            
-            # اگر هیچ ایده‌ای پیدا نشد
-            if len(candidate_ideas) < 2:
-                return None
-            
-            # مرتب‌سازی
-            candidate_ideas.sort(key=lambda x: (
-                x['publish_time'] is not None,
-                x['publish_time'] if x['publish_time'] else datetime.datetime.min,
-                len(x['description'])
-            ), reverse=True)
-            
-            # برگرداندن دومین ایده (نه اولین)
-            return candidate_ideas[1] if len(candidate_ideas) > 1 else candidate_ideas[0]
-            
-        except Exception as e:
-            print(f"خطا در parse_community_content_alternative: {e}")
-            return None
+            print(f"خطا در parse_community_content: {e}")
+            return []
     
     def normalize_to_usdt_pair_DEPRECATED(self, crypto_input: str) -> Optional[str]:
         """تبدیل ورودی کاربر به فرمت جفت ارز USDT"""
@@ -473,8 +401,8 @@ class TradingViewAnalysisFetcher:
             # URL برای ایده‌های TradingView
             url = f"{self.base_url}/symbols/{symbol}/ideas/"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, timeout=10) as response:
+            async with http_sessions.session('tradingview') as session:
+                async with session.get(url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
                     if response.status == 200:
                         content = await response.text()
                         
@@ -572,53 +500,164 @@ class TradingViewAnalysisFetcher:
         return None
     
     async def fetch_latest_analysis(self, crypto_pair: str) -> Dict[str, Any]:
-        """دریافت تحلیل‌های کامیونیتی برای جفت ارز مشخص شده (محبوب‌ترین + جدیدترین)"""
+        """دریافت تحلیل‌های کامیونیتی برای جفت ارز مشخص شده (محبوب‌ترین + جدیدترین)
+        
+        نتیجه هر جفت ارز برای مدت کوتاهی کش می‌شود و درخواست‌های همزمان کاربران
+        برای یک جفت ارز در یک scrape ادغام می‌شوند.
+        """
+        # اعتبارسنجی فرمت ورودی
+        if not self.validate_crypto_pair_format(crypto_pair):
+            return {
+                'success': False,
+                'error': f"❌ فرمت نادرست!\n\n✅ فرمت صحیح: مثل `btcusdt`\n\n📝 مثال‌های معتبر:\n• btcusdt\n• ethusdt\n• solusdt\n• adausdt\n• bnbusdt\n• xrpusdt\n• dogeusdt\n\n⚠️ فقط حروف کوچک، بدون فاصله یا نشانه"
+            }
+        
+        # رد جفت ارزهای ناموجود با پیشنهاد، پیش از هر درخواست شبکه
+        if not symbol_index.is_valid_pair(crypto_pair):
+            suggestions = symbol_index.suggest(crypto_pair)
+            hint = "\n\n💡 منظورتان این بود؟\n" + "\n".join(f"• {pair}" for pair in suggestions) if suggestions else ""
+            return {
+                'success': False,
+                'error': f"❌ جفت ارز {crypto_pair} یافت نشد.{hint}",
+                'suggestions': suggestions
+            }
+        
+        stats = self._pair_stats(crypto_pair)
+        stats['requests'] += 1
+        cached = self._cache.get(crypto_pair)
+        if cached and cached[0] > time.monotonic():
+            stats['hits'] += 1
+            return cached[1]
+        
+        stats['misses'] += 1
+        return await self._refresh_pair(crypto_pair, self.cache_ttl)
+    
+    async def _refresh_pair(self, crypto_pair: str, ttl: int) -> Dict[str, Any]:
+        """scrape (ادغام‌شده) یک جفت ارز و ذخیره نتیجه زنده در کش به مدت ttl ثانیه"""
+        future = self._inflight.get(crypto_pair)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_pair_analysis(crypto_pair))
+            self._inflight[crypto_pair] = future
+            future.add_done_callback(lambda _: self._inflight.pop(crypto_pair, None))
+        
+        result = await asyncio.shield(future)
+        # فقط نتایج زنده کش می‌شوند (نه داده‌های fallback)
+        if result and result.get('success') and 'Cached' not in result.get('source', ''):
+            now = time.monotonic()
+            if len(self._cache) > 256:
+                self._cache = {pair: entry for pair, entry in self._cache.items() if entry[0] > now}
+            expires = max(now + ttl, self._cache.get(crypto_pair, (0.0, None))[0])
+            self._cache[crypto_pair] = (expires, result)
+        return result
+    
+    def _pair_stats(self, crypto_pair: str) -> Dict[str, int]:
+        stats = self.pair_stats.get(crypto_pair)
+        if stats is None:
+            stats = self.pair_stats[crypto_pair] = {'requests': 0, 'hits': 0, 'misses': 0, 'warmed': 0}
+        return stats
+    
+    # -----------------------------
+    # 📌 Warm cache جفت ارزهای پرتقاضا
+    # -----------------------------
+    async def warm_cache(self, pairs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        دریافت و پارس از پیش تحلیل‌های محبوب و جدید جفت ارزهای پرتقاضا به همراه تصاویرشان
+        (فراخوانی توسط scheduler)؛ اعتبار نتایج تا اجرای بعدی job حفظ می‌شود.
+        """
+        pairs = [pair for pair in (pairs or self.warm_pairs) if self.validate_crypto_pair_format(pair)]
+        # کمی بیشتر از فاصله اجرای job تا بین دو اجرا کش خالی نماند
+        ttl = max(self.cache_ttl, self.warm_interval * 60 + 60)
+        semaphore = asyncio.Semaphore(WARM_CONCURRENCY)
+        
+        async def warm(pair: str) -> bool:
+            async with semaphore:
+                result = await self._refresh_pair(pair, ttl)
+                if not result.get('success') or 'Cached' in result.get('source', ''):
+                    return False
+                self._pair_stats(pair)['warmed'] += 1
+                await self._prefetch_images(result)
+                return True
+        
+        try:
+            results = await asyncio.gather(*(warm(pair) for pair in pairs), return_exceptions=True)
+            warmed = sum(1 for result in results if result is True)
+            self.last_warm_at = time.time()
+            # تصاویر تحلیل‌هایی که دیگر در کش نیستند حذف می‌شوند
+            live_urls = {url for _, result in self._cache.values() for url in self._image_urls(result)}
+            self._images = {url: data for url, data in self._images.items() if url in live_urls}
+            logger.info(f"🔥 warm cache تحلیل TradingView: {warmed}/{len(pairs)} جفت ارز آماده شد")
+            return {'success': True, 'warmed': warmed, 'total': len(pairs)}
+        except Exception as e:
+            logger.error(f"❌ خطا در warm cache تحلیل TradingView: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def _image_urls(result: Dict[str, Any]) -> List[str]:
+        analyses = [result.get('popular_analysis'), result.get('recent_analysis'), result]
+        return [analysis['image_url'] for analysis in analyses if analysis and analysis.get('image_url')]
+    
+    async def _prefetch_images(self, result: Dict[str, Any]) -> None:
+        """دانلود تصاویر تحلیل تا ارسال به کاربر بدون انتظار برای TradingView انجام شود"""
+        for url in self._image_urls(result):
+            if url in self._images:
+                continue
+            try:
+                async with http_sessions.get('tradingview').get(url) as response:
+                    if response.status == 200:
+                        self._images[url] = await response.read()
+            except Exception as e:
+                logger.warning(f"⚠️ خطا در دریافت تصویر تحلیل {url}: {e}")
+    
+    def get_image(self, image_url: str):
+        """بایت‌های تصویر آماده (در صورت وجود) وگرنه همان URL"""
+        return self._images.get(image_url, image_url)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """آمار کش هر جفت ارز به همراه نرخ hit"""
+        now = time.monotonic()
+        result = {}
+        for pair, stats in sorted(self.pair_stats.items(), key=lambda item: item[1]['requests'], reverse=True):
+            cached = self._cache.get(pair)
+            result[pair] = dict(
+                stats,
+                hit_ratio=round(stats['hits'] / stats['requests'], 3) if stats['requests'] else 0.0,
+                cached=bool(cached and cached[0] > now),
+                warm=pair in self.warm_pairs,
+            )
+        return result
+    
+    def format_cache_stats(self, limit: int = 10) -> str:
+        """متن خلاصه نرخ hit کش هر جفت ارز برای پنل ادمین"""
+        lines = []
+        if self.last_warm_at:
+            lines.append(f"• آخرین warm cache: {time.time() - self.last_warm_at:.0f} ثانیه پیش "
+                         f"({len(self.warm_pairs)} جفت ارز، {len(self._images)} تصویر)")
+        for pair, stats in list(self.get_cache_stats().items())[:limit]:
+            flame = '🔥' if stats['warm'] else '•'
+            lines.append(
+                f"{flame} {pair}: {stats['requests']} درخواست، hit {stats['hit_ratio'] * 100:.0f}٪"
+                f"{' (در کش)' if stats['cached'] else ''}"
+            )
+        return "\n".join(lines) or "• هنوز درخواستی ثبت نشده"
+    
+    async def _fetch_pair_analysis(self, crypto_pair: str) -> Dict[str, Any]:
+        """scrape همزمان محبوب‌ترین و جدیدترین تحلیل‌ها برای یک جفت ارز"""
         try:
-            # پاک کردن لیست URL های استفاده شده برای شروع جدید
-            self.global_used_urls.clear()
-            
-            # اعتبارسنجی فرمت ورودی
-            if not self.validate_crypto_pair_format(crypto_pair):
-                return {
-                    'success': False,
-                    'error': f"❌ فرمت نادرست!\n\n✅ فرمت صحیح: مثل `btcusdt`\n\n📝 مثال‌های معتبر:\n• btcusdt\n• ethusdt\n• solusdt\n• adausdt\n• bnbusdt\n• xrpusdt\n• dogeusdt\n\n⚠️ فقط حروف کوچک، بدون فاصله یا نشانه"
-                }
-            
             symbol = self.extract_symbol_from_pair(crypto_pair)
             
             # دریافت همزمان تحلیل محبوب‌ترین و جدیدترین
-            popular_data = await self.scrape_community_analysis(crypto_pair.upper(), "popular")
-            recent_data = await self.scrape_community_analysis(crypto_pair.upper(), "recent")
+            popular_candidates, recent_candidates = await asyncio.gather(
+                self.scrape_community_candidates(crypto_pair.upper(), "popular"),
+                self.scrape_community_candidates(crypto_pair.upper(), "recent"),
+            )
+            
+            # حذف تکرار در سطح همین درخواست: جدیدترین نباید همان محبوب‌ترین باشد
+            popular_data = self.pick_candidate(popular_candidates)
+            used_urls = {popular_data['analysis_url']} if popular_data else set()
+            recent_data = self.pick_candidate(recent_candidates, used_urls)
             
             # اگر هردو موفق باشند
             if popular_data and recent_data:
-                # بررسی تکراری نبودن لینک‌ها - امنیت اضافی
-                if popular_data['analysis_url'] == recent_data['analysis_url']:
-                    print(f"⚠️ هشدار: لینک تکراری شناسایی شد برای {crypto_pair}")
-                    print(f"   لینک تکراری: {popular_data['analysis_url']}")
-                    
-                    # تلاش برای دریافت تحلیل جایگزین از recent
-                    alternative_recent = await self.scrape_community_analysis_alternative(crypto_pair.upper(), "recent")
-                    if alternative_recent and alternative_recent['analysis_url'] != popular_data['analysis_url']:
-                        recent_data = alternative_recent
-                        print(f"✅ تحلیل جایگزین یافت شد: {alternative_recent['analysis_url']}")
-                    else:
-                        # اگر باز هم تکراری بود، حداقل یکی رو برگردون
-                        print("⚠️ تحلیل جایگزین یافت نشد - ارسال فقط محبوب‌ترین")
-                        return {
-                            'success': True,
-                            'crypto': symbol,
-                            'title': popular_data['title'],
-                            'description': popular_data['description'],
-                            'analysis_url': popular_data['analysis_url'],
-                            'image_url': popular_data['image_url'],
-                            'symbol': crypto_pair.upper(),
-                            'author': popular_data.get('author', 'TradingView User'),
-                            'timestamp': popular_data.get('timestamp', datetime.datetime.now().strftime('%Y-%m-%d %H:%M')),
-                            'source': 'TradingView Community (🔥 محبوب‌ترین)',
-                            'analysis_type': '🔥 محبوب‌ترین'
-                        }
-                
                 print(f"✅ لینک‌های متفاوت تأیید شد برای {crypto_pair}:")
                 print(f"   محبوب‌ترین: {popular_data['analysis_url']}")
                 print(f"   جدیدترین: {recent_data['analysis_url']}")
@@ -49,7 +49,7 @@ def get_crypto_menu_markup() -> ReplyKeyboardMarkup:
     """کیبورد منوی ارزهای دیجیتال"""
     keyboard = [
         [KeyboardButton("📊 قیمت‌های لحظه‌ای"), KeyboardButton("📰 اخبار کریپتو")],
-        [KeyboardButton("📈 تحلیل TradingView")],
+        [KeyboardButton("📈 تحلیل TradingView"), KeyboardButton("🔔 هشدار قیمت")],
         [KeyboardButton("😨 شاخص ترس و طمع"), KeyboardButton("🔙 بازگشت به منوی اصلی")]
     ]
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
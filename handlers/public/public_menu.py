@@ -6,7 +6,6 @@
 شامل بخش ارزهای دیجیتال و سایر خدمات عمومی
 """
 
-import aiohttp
 import asyncio
 import json
 import xml.etree.ElementTree as ET
@@ -14,7 +13,13 @@ from typing import Dict, Any, Optional, List
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 from core.logger_system import bot_logger
+from core.http_sessions import http_sessions
 from handlers.ai.ai_chat_handler import GeminiChatHandler
+from services.news_dedup_service import deduplicate_news
+from services.market_snapshot_service import market_snapshot_service
+from services.price_history_service import price_history_service
+from services.media_cache_service import media_cache
+from services.market_screener_service import market_screener, SCREENER_PRESETS
 import html
 import os
 from datetime import datetime, timezone
@@ -28,6 +33,8 @@ class PublicMenuManager:
         self.db = db_manager
         # ایجاد نمونه Gemini برای ترجمه اخبار
         self.gemini = GeminiChatHandler(db_manager=db_manager)
+        # تعداد اخبار تکراری حذف‌شده در آخرین دریافت هر دسته
+        self.news_dedup_dropped: Dict[str, int] = {}
     
     def create_main_menu_keyboard(self) -> InlineKeyboardMarkup:
         """کیبورد منوی اصلی عمومی"""
@@ -45,6 +52,9 @@ class PublicMenuManager:
             [
                 InlineKeyboardButton("📈 قیمت‌های لحظه‌ای", callback_data="crypto_prices"),
             ],
+            [
+                InlineKeyboardButton("🔎 اسکنر بازار", callback_data="crypto_screener"),
+            ],
             [
                 InlineKeyboardButton("🔙 بازگشت", callback_data="public_main")
             ]
@@ -64,109 +74,16 @@ class PublicMenuManager:
         return InlineKeyboardMarkup(keyboard)
     
     async def fetch_crypto_prices(self) -> Dict[str, Any]:
-        """دریافت قیمت‌های ارزهای دیجیتال از منابع مختلف"""
+        """دریافت قیمت‌های ارزهای دیجیتال از snapshot سرویس بازار (بدون درخواست مستقیم به منابع)"""
         try:
-            result = {
-                'bitcoin': {'price_usd': 0, 'change_24h': 0},
-                'ethereum': {'price_usd': 0, 'change_24h': 0},
-                'top_gainer': {'symbol': 'N/A', 'change_24h': 0, 'price_usd': 0},
-                'top_loser': {'symbol': 'N/A', 'change_24h': 0, 'price_usd': 0},
-                'tether_irr': 0,
-                'tether_change_24h': 0,
-                'usd_irr': 0,
-                'error': None
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                # دریافت قیمت‌های ارز از CoinGecko
-                try:
-                    crypto_url = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=100&page=1&sparkline=false&price_change_percentage=24h"
-                    async with session.get(crypto_url, timeout=10) as response:
-                        if response.status == 200:
-                            crypto_data = await response.json()
-                            
-                            # پیدا کردن بیت کوین و اتریوم
-                            for coin in crypto_data:
-                                if coin['id'] == 'bitcoin':
-                                    result['bitcoin'] = {
-                                        'price_usd': coin['current_price'],
-                                        'change_24h': coin['price_change_percentage_24h']
-                                    }
-                                elif coin['id'] == 'ethereum':
-                                    result['ethereum'] = {
-                                        'price_usd': coin['current_price'],
-                                        'change_24h': coin['price_change_percentage_24h']
-                                    }
-                            
-                            # پیدا کردن بیشترین صعود و نزول
-                            # فیلتر کردن ارزهای معتبر (top 50)
-                            valid_coins = crypto_data[:50]
-                            
-                            if valid_coins:
-                                # بیشترین صعود
-                                top_gainer = max(valid_coins, key=lambda x: x['price_change_percentage_24h'] or 0)
-                                result['top_gainer'] = {
-                                    'symbol': top_gainer['symbol'].upper(),
-                                    'name': top_gainer['name'],
-                                    'change_24h': top_gainer['price_change_percentage_24h'],
-                                    'price_usd': top_gainer['current_price']
-                                }
-                                
-                                # بیشترین نزول
-                                top_loser = min(valid_coins, key=lambda x: x['price_change_percentage_24h'] or 0)
-                                result['top_loser'] = {
-                                    'symbol': top_loser['symbol'].upper(),
-                                    'name': top_loser['name'],
-                                    'change_24h': top_loser['price_change_percentage_24h'],
-                                    'price_usd': top_loser['current_price']
-                                }
-                except Exception as e:
-                    result['error'] = f"خطا در دریافت قیمت ارزها: {str(e)}"
-                
-                # دریافت قیمت دلار از API رایگان ایرانی
-                try:
-                    usd_url = "https://api.codebazan.ir/arz/?type=arz"
-                    async with session.get(usd_url, timeout=10) as response:
-                        if response.status == 200:
-                            arz_data = await response.json()
-                            if arz_data.get('Ok') and arz_data.get('Result'):
-                                for item in arz_data['Result']:
-                                    if item.get('name') == 'دلار':
-                                        # حذف کاما و تبدیل به عدد
-                                        price_str = item.get('price', '0').replace(',', '')
-                                        usd_price_irr = float(price_str)
-                                        # تبدیل از ریال به تومان
-                                        result['usd_irr'] = int(usd_price_irr / 10)
-                                        break
-                except Exception as e:
-                    # fallback to approximate rate
-                    result['usd_irr'] = 113000  # نرخ تقریبی بازار آزاد
-                
-                # دریافت قیمت تتر از تترلند
-                try:
-                    usdt_url = "https://api.tetherland.com/currencies"
-                    async with session.get(usdt_url, timeout=10) as response:
-                        if response.status == 200:
-                            usdt_data = await response.json()
-                            if usdt_data.get('status') == 200 and usdt_data.get('data'):
-                                currencies = usdt_data['data'].get('currencies', {})
-                                usdt_info = currencies.get('USDT', {})
-                                if usdt_info:
-                                    result['tether_irr'] = int(usdt_info.get('price', 0))
-                                    result['tether_change_24h'] = float(usdt_info.get('diff24d', '0'))
-                except Exception as e:
-                    # fallback to approximate rate
-                    result['tether_irr'] = 113000  # نرخ تقریبی
-                    result['tether_change_24h'] = 0
-                
-                # اگر API ها کار نکردند، از نرخ‌های پیش‌فرض استفاده کن
-                if result['usd_irr'] == 0:
-                    result['usd_irr'] = 113000
-                if result['tether_irr'] == 0:
-                    result['tether_irr'] = 113000
-            
-            return result
-            
+            snapshot = await market_snapshot_service.get_snapshot()
+            # بیشترین صعود و نزول از نتایج memoize شده اسکنر برای همین نسخه snapshot
+            gainers = market_screener.preset(snapshot, 'gainers')
+            losers = market_screener.preset(snapshot, 'losers')
+            return snapshot.to_price_data(
+                top_gainer=gainers[0] if gainers else None,
+                top_loser=losers[0] if losers else None
+            )
         except Exception as e:
             return {'error': f"خطای کلی: {str(e)}"}
     
@@ -188,7 +105,7 @@ class PublicMenuManager:
             
             all_news = []
             
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session('news') as session:
                 for source in news_sources:
                     try:
                         async with session.get(
@@ -207,6 +124,11 @@ class PublicMenuManager:
             if not all_news:
                 return []
             
+            # حذف اخبار تکراری بین منابع قبل از ترجمه
+            source_rank = {source['name']: rank for rank, source in enumerate(news_sources)}
+            all_news, dropped = deduplicate_news(all_news, source_rank=source_rank)
+            self.news_dedup_dropped['crypto'] = dropped
+            
             # جمع‌آوری عنوان‌ها و توضیحات برای ترجمه گروهی
             titles = [news_item.get('title', '') for news_item in all_news]
             descriptions = [news_item.get('description', '') for news_item in all_news]
@@ -345,7 +267,7 @@ class PublicMenuManager:
             
             all_news = []
             
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session('news') as session:
                 for source in news_sources:
                     try:
                         async with session.get(source['url'], timeout=15) as response:
@@ -356,6 +278,11 @@ class PublicMenuManager:
                     except Exception as e:
                         continue
             
+            # حذف اخبار تکراری بین منابع قبل از ترجمه
+            source_rank = {source['name']: rank for rank, source in enumerate(news_sources)}
+            all_news, dropped = deduplicate_news(all_news, source_rank=source_rank)
+            self.news_dedup_dropped['ai'] = dropped
+            
             # مرتب‌سازی بر اساس زمان (جدیدترین اول)
             all_news.sort(key=lambda x: x.get('published', ''), reverse=True)
             
@@ -468,7 +395,7 @@ class PublicMenuManager:
             all_news = []
             foreign_news = []  # برای ذخیره اخبار خارجی که نیاز به ترجمه دارند
             
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session('news') as session:
                 for source in news_sources:
                     try:
                         urls_to_try = [source['url']] + source.get('fallback_urls', [])
@@ -498,9 +425,17 @@ class PublicMenuManager:
                         logger.warning(f"⚠️ خطا در خواندن RSS منبع {source['name']}: {e}")
                         continue
             
+            # حذف اخبار تکراری بین منابع (هر زبان جداگانه) قبل از ترجمه
+            source_rank = {source['name']: rank for rank, source in enumerate(news_sources)}
+            all_news, dropped_fa = deduplicate_news(all_news, source_rank=source_rank)
+            foreign_news, dropped_en = deduplicate_news(foreign_news, source_rank=source_rank)
+            self.news_dedup_dropped['general'] = dropped_fa + dropped_en
+            
             # دیباگ: چاپ تعداد خبرهای دریافتی از هر منبع
             logger.info(f"📰 مجموع {len(all_news)} خبر از تمام منابع دریافت شد")
             logger.info(f"📰 {len(foreign_news)} خبر خارجی برای ترجمه آماده")
+            if dropped_fa or dropped_en:
+                logger.info(f"🧹 اخبار تکراری حذف‌شده: {dropped_fa} داخلی، {dropped_en} خارجی")
             
             fallback_dt = datetime.min.replace(tzinfo=timezone.utc)
 
@@ -714,10 +649,8 @@ class PublicMenuManager:
         if data.get('error'):
             return f"❌ خطا در دریافت اطلاعات:\n{data['error']}"
         
-        # تبدیل دلار به تومان (اگر موجود باشد)
-        usd_to_irr = data.get('usd_irr', 70000)  # fallback rate
-        if usd_to_irr == 0:
-            usd_to_irr = 70000
+        # تبدیل دلار به تومان (در نبود نرخ دلار از قیمت تتر استفاده می‌شود)
+        usd_to_irr = data.get('usd_irr') or data.get('tether_irr') or 0
         
         message = "💰 *قیمت‌های لحظه‌ای ارز*\n\n"
         
@@ -729,7 +662,8 @@ class PublicMenuManager:
             change_icon = "🔺" if btc_change > 0 else "🔻" if btc_change < 0 else "➖"
             message += f"🟠 *بیت کوین (BTC):*\n"
             message += f"💵 ${btc['price_usd']:,.0f}\n"
-            message += f"💰 {btc_irr:,.0f} تومان\n"
+            if usd_to_irr:
+                message += f"💰 {btc_irr:,.0f} تومان\n"
             message += f"{change_icon} {btc_change:+.2f}% (24 ساعت)\n\n"
         
         # اتریوم
@@ -740,7 +674,8 @@ class PublicMenuManager:
             change_icon = "🔺" if eth_change > 0 else "🔻" if eth_change < 0 else "➖"
             message += f"🔵 *اتریوم (ETH):*\n"
             message += f"💵 ${eth['price_usd']:,.0f}\n"
-            message += f"💰 {eth_irr:,.0f} تومان\n"
+            if usd_to_irr:
+                message += f"💰 {eth_irr:,.0f} تومان\n"
             message += f"{change_icon} {eth_change:+.2f}% (24 ساعت)\n\n"
         
         # بیشترین صعود
@@ -752,7 +687,8 @@ class PublicMenuManager:
             message += f"🚀 *بیشترین صعود:*\n"
             message += f"🔥 {gainer['symbol']} ({gainer_name})\n"
             message += f"💵 ${gainer.get('price_usd', 0):,.4f}\n"
-            message += f"💰 {gainer_price_irr:,.0f} تومان\n"
+            if usd_to_irr:
+                message += f"💰 {gainer_price_irr:,.0f} تومان\n"
             message += f"🔺 {gainer.get('change_24h', 0):+.2f}%\n\n"
         
         # بیشترین نزول
@@ -764,7 +700,8 @@ class PublicMenuManager:
             message += f"📉 *بیشترین نزول:*\n"
             message += f"💥 {loser['symbol']} ({loser_name})\n"
             message += f"💵 ${loser.get('price_usd', 0):,.4f}\n"
-            message += f"💰 {loser_price_irr:,.0f} تومان\n"
+            if usd_to_irr:
+                message += f"💰 {loser_price_irr:,.0f} تومان\n"
             message += f"🔻 {loser.get('change_24h', 0):+.2f}%\n\n"
         
         # خط جداکننده
@@ -790,7 +727,14 @@ class PublicMenuManager:
         else:
             message += f"💵 *دلار آمریکا (USD):* ❌ ناموجود\n\n"
         
-        message += f"🕐 *آخرین بروزرسانی:* همین الان\n"
+        age_seconds = data.get('age_seconds')
+        if age_seconds is None or age_seconds < 60:
+            freshness = "همین الان"
+        elif age_seconds < 3600:
+            freshness = f"{int(age_seconds // 60)} دقیقه پیش"
+        else:
+            freshness = f"{int(age_seconds // 3600)} ساعت پیش"
+        message += f"🕐 *آخرین بروزرسانی:* {freshness}\n"
         message += f"📊 *منبع:* CoinGecko, تترلند, CodeBazan"
         
         return message
@@ -821,6 +765,7 @@ class PublicMenuManager:
 • 📊 بررسی تغییرات 24 ساعته
 • 💰 قیمت تتر و دلار به تومان
 • 🚀 بیشترین صعود و نزول بازار
+• 🔎 اسکنر بازار روی 250 ارز برتر
 • 📰 اخبار کریپتو از کیبورد اصلی (دکمه 📈 اخبار کریپتو)
 
 از دکمه‌های زیر برای دسترسی به خدمات استفاده کنید:
@@ -864,14 +809,9 @@ class PublicMenuManager:
             crypto_data = await self.fetch_crypto_prices()
             message = self.format_crypto_message(crypto_data)
             
-            keyboard = [
-                [InlineKeyboardButton("🔄 بروزرسانی", callback_data="crypto_prices")],
-                [InlineKeyboardButton("🔙 بازگشت", callback_data="public_crypto")]
-            ]
-            
             await query.edit_message_text(
                 message,
-                reply_markup=InlineKeyboardMarkup(keyboard),
+                reply_markup=self.create_crypto_prices_keyboard(),
                 parse_mode='Markdown'
             )
             
@@ -889,6 +829,105 @@ class PublicMenuManager:
     
 
     
+    def create_crypto_prices_keyboard(self) -> InlineKeyboardMarkup:
+        """کیبورد صفحه قیمت‌ها همراه دکمه‌های نمودار"""
+        keyboard = []
+        chart_buttons = [
+            InlineKeyboardButton(f"📉 {symbol} {window}", callback_data=f"crypto_chart_{symbol}_{window}")
+            for symbol in ('BTC', 'ETH')
+            for window in ('24h', '7d')
+            if price_history_service.has_symbol(symbol)
+        ]
+        if chart_buttons:
+            keyboard.append(chart_buttons[:2])
+            if len(chart_buttons) > 2:
+                keyboard.append(chart_buttons[2:])
+        keyboard.append([InlineKeyboardButton("🔄 بروزرسانی", callback_data="crypto_prices")])
+        keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="public_crypto")])
+        return InlineKeyboardMarkup(keyboard)
+    
+    async def show_price_chart(self, query, symbol: str, window: str):
+        """ارسال نمودار قیمت رسم‌شده در bucket جاری"""
+        chart = await price_history_service.get_chart(symbol, window)
+        if not chart:
+            await query.message.reply_text("⏳ هنوز داده کافی برای رسم این نمودار جمع نشده است.")
+            return
+        
+        # هر نمودار در bucket خودش فقط یک بار آپلود می‌شود
+        await media_cache.send_photo(
+            query.message.reply_photo,
+            chart['png'],
+            cache_key=f"price_chart:{symbol}:{window}:{chart['bucket']}",
+            persist=False,
+            caption=f"📉 نمودار {symbol} - بازه {window}"
+        )
+    
+    def create_screener_keyboard(self) -> InlineKeyboardMarkup:
+        """کیبورد پیش‌تنظیم‌های اسکنر بازار"""
+        keyboard = [
+            [InlineKeyboardButton(title, callback_data=f"crypto_screener_{name}")]
+            for name, (title, _, _, _) in SCREENER_PRESETS.items()
+        ]
+        keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="public_crypto")])
+        return InlineKeyboardMarkup(keyboard)
+    
+    async def show_screener_menu(self, query):
+        """نمایش منوی اسکنر بازار"""
+        message = """
+🔎 *اسکنر بازار*
+
+رتبه‌بندی 250 ارز برتر بازار بر اساس آخرین قیمت‌ها.
+یکی از فیلترهای زیر را انتخاب کنید:
+        """
+        
+        await query.edit_message_text(
+            message,
+            reply_markup=self.create_screener_keyboard(),
+            parse_mode='Markdown'
+        )
+    
+    def format_screener_message(self, preset: str, rows: List[Dict[str, Any]], age_seconds: float) -> str:
+        """فرمت کردن نتیجه اسکنر بازار"""
+        title = SCREENER_PRESETS[preset][0]
+        message = f"*{title}*\n\n"
+        
+        if not rows:
+            message += "❌ ارزی با این شرایط پیدا نشد.\n\n"
+        
+        for i, row in enumerate(rows, 1):
+            symbol = ''.join(ch for ch in row['symbol'] if ch not in '_*`[]')
+            change_icon = "🔺" if row['change_24h'] > 0 else "🔻" if row['change_24h'] < 0 else "➖"
+            price_format = f"{row['price_usd']:,.2f}" if row['price_usd'] >= 1 else f"{row['price_usd']:.6f}"
+            message += f"{i}. *{symbol}* (#{row['rank']}) ${price_format} {change_icon} {row['change_24h']:+.2f}%\n"
+            if preset in ('volume', 'active'):
+                message += f"    💹 حجم: ${row['volume'] / 1e6:,.1f}M | ارزش: ${row['market_cap'] / 1e6:,.0f}M\n"
+            elif preset == 'movers':
+                message += f"    🏦 تغییر ارزش بازار: ${row['market_cap_change'] / 1e6:+,.1f}M\n"
+        
+        freshness = "همین الان" if age_seconds < 60 else f"{int(age_seconds // 60)} دقیقه پیش"
+        message += f"\n🕐 *آخرین بروزرسانی:* {freshness}\n📊 *منبع:* CoinGecko"
+        return message
+    
+    async def show_screener_result(self, query, preset: str):
+        """نمایش نتیجه یک پیش‌تنظیم اسکنر (memoize شده برای هر نسخه snapshot)"""
+        if preset not in SCREENER_PRESETS:
+            await query.edit_message_text("❌ دستور نامعتبر")
+            return
+        
+        snapshot = await market_snapshot_service.get_snapshot()
+        rows = market_screener.preset(snapshot, preset)
+        
+        keyboard = [
+            [InlineKeyboardButton("🔄 بروزرسانی", callback_data=f"crypto_screener_{preset}")],
+            [InlineKeyboardButton("🔙 بازگشت", callback_data="crypto_screener")]
+        ]
+        
+        await query.edit_message_text(
+            self.format_screener_message(preset, rows, snapshot.age_seconds),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode='Markdown'
+        )
+    
     async def show_ai_news(self, query):
         """نمایش آخرین اخبار هوش مصنوعی"""
         # نمایش پیام در حال بارگذاری
@@ -946,6 +985,16 @@ class PublicMenuManager:
             elif data == "crypto_prices":
                 await self.show_crypto_prices(query)
             
+            elif data == "crypto_screener":
+                await self.show_screener_menu(query)
+            
+            elif data.startswith("crypto_screener_"):
+                await self.show_screener_result(query, data[len("crypto_screener_"):])
+            
+            elif data.startswith("crypto_chart_"):
+                symbol, _, window = data[len("crypto_chart_"):].partition('_')
+                await self.show_price_chart(query, symbol, window)
+            
 
             
             elif data == "public_ai":
@@ -5,6 +5,11 @@
 پکیج مدیریت بخش ورزش
 """
 
+from .football_api import FootballApiClient, parse_fixture
+from .live_poller import LiveMatchPoller
+from .reminder_dispatcher import ReminderDispatcher
 from .sports_handler import SportsHandler
+from .team_index import TeamIndex, normalize_team_name
 
-__all__ = ['SportsHandler']
+__all__ = ['FootballApiClient', 'LiveMatchPoller', 'parse_fixture', 'ReminderDispatcher', 'SportsHandler',
+           'TeamIndex', 'normalize_team_name']
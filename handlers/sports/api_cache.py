@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+کش ماندگار داده‌های کم‌تغییر API-Football (تیم‌ها، فصل‌ها و اطلاعات لیگ‌ها)
+- نگهداری در حافظه و جدول sports_api_cache با TTL و شماره نسخه برای هر ورودی
+- بارگذاری تنبل از دیتابیس در اولین درخواست هر کلید
+- بروزرسانی پس‌زمینه پیش از انقضا (ورودی فعلی تا پایان بروزرسانی سرو می‌شود)
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class PersistentTTLCache:
+    """کش کلید-مقدار با پشتوانه دیتابیس برای یک نوع داده (مثلاً 'teams')"""
+
+    def __init__(
+        self,
+        cache_type: str,
+        ttl: timedelta,
+        refresh_ahead: Optional[timedelta] = None,
+        db_manager=None
+    ):
+        self.cache_type = cache_type
+        self.ttl = ttl
+        # بازه پیش از انقضا که در آن بروزرسانی پس‌زمینه آغاز می‌شود
+        self.refresh_ahead = refresh_ahead or ttl / 6
+        self.db = db_manager
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        # کلیدهایی که دیتابیس برایشان بررسی شده (حتی اگر ورودی نداشتند)
+        self._db_checked = set()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'refreshes': 0}
+
+    def _db_available(self, method: str) -> bool:
+        return bool(self.db) and hasattr(self.db, method)
+
+    async def get_entry(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        ورودی کش (حتی منقضی‌شده) با کلیدهای value، fetched_at، expires_at و version
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.stats['memory_hits'] += 1
+            return entry
+
+        if key not in self._db_checked and self._db_available('get_sports_api_cache'):
+            self._db_checked.add(key)
+            row = await asyncio.to_thread(self.db.get_sports_api_cache, self.cache_type, str(key))
+            if row:
+                entry = {
+                    'value': row['payload'],
+                    'fetched_at': row['fetched_at'],
+                    'expires_at': row['expires_at'],
+                    'version': row.get('version') or 1,
+                }
+                self._entries[key] = entry
+                self.stats['db_hits'] += 1
+                return entry
+
+        self.stats['misses'] += 1
+        return None
+
+    @staticmethod
+    def is_fresh(entry: Optional[Dict[str, Any]]) -> bool:
+        return bool(entry) and entry['expires_at'] > datetime.now()
+
+    def needs_refresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return not entry or entry['expires_at'] - self.refresh_ahead <= datetime.now()
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[timedelta] = None) -> Dict[str, Any]:
+        """ذخیره مقدار در حافظه و دیتابیس با TTL مشخص (پیش‌فرض TTL کش)"""
+        now = datetime.now()
+        previous = self._entries.get(key)
+        entry = {
+            'value': value,
+            'fetched_at': now,
+            'expires_at': now + (ttl or self.ttl),
+            'version': (previous['version'] + 1) if previous else 1,
+        }
+        self._entries[key] = entry
+        self._db_checked.add(key)
+
+        if self._db_available('upsert_sports_api_cache'):
+            version = await asyncio.to_thread(
+                self.db.upsert_sports_api_cache, self.cache_type, str(key), value, entry['expires_at']
+            )
+            if version:
+                entry['version'] = version
+        return entry
+
+    async def get_or_refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        allow_stale: bool = False
+    ) -> Any:
+        """
+        مقدار تازه از کش؛ نزدیک انقضا loader در پس‌زمینه اجرا می‌شود
+
+        Args:
+            loader: تابع async دریافت مقدار جدید (None یعنی ناموفق؛ ذخیره نمی‌شود)
+            allow_stale: در صورت انقضا، مقدار قدیمی برگردانده شود و بروزرسانی در پس‌زمینه انجام شود
+
+        Returns:
+            مقدار یا None اگر ورودی معتبری وجود نداشت
+        """
+        entry = await self.get_entry(key)
+        if self.is_fresh(entry) or (entry and allow_stale):
+            if self.needs_refresh(entry):
+                self.refresh_in_background(key, loader)
+            return entry['value']
+        return None
+
+    def refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        """اجرای loader در پس‌زمینه (هر کلید حداکثر یک بروزرسانی همزمان)"""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                value = await loader()
+                if value is not None:
+                    await self.set(key, value)
+                    self.stats['refreshes'] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ خطا در بروزرسانی پس‌زمینه کش {self.cache_type}:{key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """حذف ورودی حافظه (ورودی دیتابیس با انقضای خودش کنار می‌رود)"""
+        if key is None:
+            self._entries.clear()
+            self._db_checked.clear()
+        else:
+            self._entries.pop(key, None)
+            self._db_checked.discard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, entries=len(self._entries))
@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+کلاینت async برای API-Football
+- session مشترک 'sports' از رجیستری http_sessions
+- محدودیت همزمانی درخواست‌ها با semaphore
+- جابجایی خودکار بین کلیدها در صورت 429 یا اتمام سهمیه (بدون مسدود کردن event loop)
+- یک مسیر واحد برای تبدیل fixtureهای API به ساختار داخلی
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.http_sessions import http_sessions
+
+logger = logging.getLogger(__name__)
+
+FOOTBALL_API_BASE = "https://v3.football.api-sports.io"
+FOOTBALL_API_HOST = "v3.football.api-sports.io"
+
+QUOTA_PROVIDER = 'api_football'
+# سهمیه روزانه پیش‌فرض هر کلید (پلن رایگان) تا وقتی هدر پاسخ مقدار واقعی را بدهد
+DAILY_LIMIT = 100
+# کلیدی که کمتر از این تعداد درخواست باقی‌مانده دارد تا فردا کنار گذاشته می‌شود
+REMAINING_RESERVE = 5
+# سهمیه رزرو هر کلید برای jobهای زمان‌بندی‌شده (بروزرسانی هفتگی، یادآوری‌ها)
+SCHEDULED_RESERVE = 25
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_SCHEDULED = 'scheduled'
+# مکث کلید پس از خطای 429 (محدودیت دقیقه‌ای)
+RATE_LIMIT_COOLDOWN = 60
+
+
+def parse_fixture(match: Dict[str, Any]) -> Dict[str, Any]:
+    """تبدیل یک آیتم پاسخ /fixtures به ساختار داخلی بازی"""
+    fixture = match.get('fixture') or {}
+    teams = match.get('teams') or {}
+    league = match.get('league') or {}
+    goals = match.get('goals') or {}
+    score_details = match.get('score') or {}
+    home = teams.get('home') or {}
+    away = teams.get('away') or {}
+    status = fixture.get('status')
+
+    # تبدیل به datetime برای روز هفته
+    fixture_date_raw = fixture.get('date')
+    match_date = None
+    if fixture_date_raw:
+        try:
+            match_date = datetime.fromisoformat(fixture_date_raw.replace('Z', '+00:00'))
+        except ValueError:
+            match_date = None
+
+    # محاسبه نتیجه نهایی بازی
+    score_home = goals.get('home')
+    score_away = goals.get('away')
+    if score_home is None or score_away is None:
+        for section in ('fulltime', 'extratime', 'penalty', 'halftime'):
+            section_data = score_details.get(section, {}) if isinstance(score_details, dict) else {}
+            section_data = section_data or {}
+            if score_home is None:
+                score_home = section_data.get('home', score_home)
+            if score_away is None:
+                score_away = section_data.get('away', score_away)
+            if score_home is not None and score_away is not None:
+                break
+
+    final_score = None
+    if score_home is not None and score_away is not None:
+        final_score = {'home': score_home, 'away': score_away}
+
+    venue = fixture.get('venue')
+    return {
+        'fixture_id': fixture.get('id'),
+        'league_id': league.get('id'),
+        'league_name': league.get('name'),
+        'league_country': league.get('country'),
+        'league_round': league.get('round'),
+        'home_team_id': home.get('id'),
+        'home_team': home.get('name'),
+        'away_team_id': away.get('id'),
+        'away_team': away.get('name'),
+        'date': fixture_date_raw or (match_date.isoformat() if match_date else None),
+        'datetime': match_date,
+        'status': status.get('short') if isinstance(status, dict) else status,
+        'minute': status.get('elapsed') if isinstance(status, dict) else None,
+        'venue': (venue.get('name') if isinstance(venue, dict) else venue) or 'نامشخص',
+        'score': final_score,
+        'score_details': score_details
+    }
+
+
+class FootballApiClient:
+    """کلاینت API-Football با چند کلید و جابجایی خودکار بین آن‌ها"""
+
+    def __init__(
+        self,
+        api_keys: Iterable[str],
+        base_url: str = FOOTBALL_API_BASE,
+        max_concurrency: Optional[int] = None,
+        db_manager=None
+    ):
+        self.api_keys = [key for key in api_keys if key]
+        self.base_url = base_url
+        self.db = db_manager
+        self.current_index = 0
+        # شناسه پایدار هر کلید برای ذخیره مصرف (خود کلید ذخیره نمی‌شود)
+        self.key_ids = [hashlib.sha256(key.encode()).hexdigest()[:16] for key in self.api_keys]
+        # وضعیت سهمیه هر کلید در روز جاری (UTC)
+        self.api_limits: Dict[int, Dict[str, Any]] = {
+            i: self._new_day_state(self._utc_day()) for i in range(len(self.api_keys))
+        }
+        # درخواست‌هایی از سهمیه هر کلید که برای jobهای زمان‌بندی‌شده رزرو می‌شود
+        self.scheduled_reserve = int(os.getenv('FOOTBALL_API_RESERVE', str(SCHEDULED_RESERVE)))
+        self._loaded_day: Optional[date] = None
+        concurrency = max_concurrency or int(os.getenv('FOOTBALL_API_CONCURRENCY', '3'))
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {'requests': 0, 'errors': 0, 'failovers': 0, 'deferred': 0}
+
+    def set_db_manager(self, db_manager) -> None:
+        """تنظیم دیتابیس برای ماندگاری مصرف سهمیه بین اجراها"""
+        self.db = db_manager
+        self._loaded_day = None
+
+    # -----------------------------
+    # 📌 بودجه سهمیه کلیدها
+    # -----------------------------
+    @staticmethod
+    def _utc_day() -> date:
+        return datetime.now(timezone.utc).date()
+
+    @staticmethod
+    def _new_day_state(day: date) -> Dict[str, Any]:
+        return {'day': day, 'used': 0, 'limit': DAILY_LIMIT, 'remaining': None,
+                'exhausted': False, 'cooldown_until': 0.0}
+
+    def _state(self, index: int) -> Dict[str, Any]:
+        state = self.api_limits[index]
+        # سهمیه روزانه در نیمه‌شب UTC ریست می‌شود
+        today = self._utc_day()
+        if state['day'] != today:
+            state.clear()
+            state.update(self._new_day_state(today))
+        return state
+
+    @staticmethod
+    def _remaining(state: Dict[str, Any]) -> int:
+        """باقی‌مانده سهمیه: از هدر آخرین پاسخ، وگرنه تخمین از مصرف ثبت‌شده"""
+        if state['remaining'] is not None:
+            return state['remaining']
+        return state['limit'] - state['used']
+
+    def _key_ready(self, index: int, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        state = self._state(index)
+        if state['exhausted'] or state['cooldown_until'] > time.monotonic():
+            return False
+        floor = REMAINING_RESERVE
+        if priority == PRIORITY_INTERACTIVE:
+            floor += self.scheduled_reserve
+        return self._remaining(state) > floor
+
+    def _mark_exhausted(self, index: int, reason: str) -> None:
+        state = self._state(index)
+        if not state['exhausted']:
+            logger.warning(f"API Key {index} به محدودیت خورد ({reason})")
+        state['exhausted'] = True
+        state['remaining'] = 0
+
+    def _ready_keys(self, priority: str) -> List[int]:
+        """کلیدهای دارای بودجه برای این نوع درخواست، از کلید فعلی به بعد"""
+        count = len(self.api_keys)
+        order = [(self.current_index + offset) % count for offset in range(count)]
+        return [index for index in order if self._key_ready(index, priority)]
+
+    def can_serve(self, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """آیا برای این نوع درخواست بودجه‌ای باقی مانده است"""
+        return any(self._key_ready(index, priority) for index in range(len(self.api_keys)))
+
+    def budget(self, priority: str = PRIORITY_INTERACTIVE) -> int:
+        """تعداد درخواست‌های باقی‌مانده امروز برای این نوع درخواست (مجموع همه کلیدها)"""
+        floor = REMAINING_RESERVE
+        if priority == PRIORITY_INTERACTIVE:
+            floor += self.scheduled_reserve
+        total = 0
+        for index in range(len(self.api_keys)):
+            state = self._state(index)
+            if not state['exhausted']:
+                total += max(0, self._remaining(state) - floor)
+        return total
+
+    @property
+    def available(self) -> bool:
+        """آیا کلیدی با سهمیه باقی‌مانده (حتی فقط برای jobهای زمان‌بندی‌شده) وجود دارد"""
+        return self.can_serve(PRIORITY_SCHEDULED)
+
+    @property
+    def has_keys(self) -> bool:
+        return bool(self.api_keys)
+
+    def _sync_headers(self, state: Dict[str, Any], headers) -> None:
+        """همگام‌سازی بودجه با هدرهای x-ratelimit-requests-* پاسخ"""
+        try:
+            limit = headers.get('x-ratelimit-requests-limit')
+            remaining = headers.get('x-ratelimit-requests-remaining')
+            if limit is not None:
+                state['limit'] = int(limit)
+            if remaining is not None:
+                state['remaining'] = int(remaining)
+                # مصرف واقعی امروز، شامل درخواست‌های اجراهای قبلی
+                state['used'] = max(state['used'], state['limit'] - state['remaining'])
+        except ValueError:
+            pass
+
+    async def _ensure_loaded(self) -> None:
+        """بارگذاری مصرف امروز کلیدها از دیتابیس (یک بار در هر روز UTC)"""
+        today = self._utc_day()
+        if self._loaded_day == today or not self.db or not hasattr(self.db, 'get_api_quota_usage'):
+            return
+        self._loaded_day = today
+        rows = await asyncio.to_thread(self.db.get_api_quota_usage, QUOTA_PROVIDER, today)
+        by_key = {row['key_id']: row for row in rows}
+        for index, key_id in enumerate(self.key_ids):
+            row = by_key.get(key_id)
+            if not row:
+                continue
+            state = self._state(index)
+            state['used'] = max(state['used'], row.get('used') or 0)
+            if row.get('request_limit'):
+                state['limit'] = row['request_limit']
+            if row.get('remaining') is not None:
+                state['remaining'] = row['remaining'] if state['remaining'] is None else min(state['remaining'], row['remaining'])
+        if rows:
+            logger.info(f"📊 مصرف امروز {len(rows)} کلید API-Football از دیتابیس بارگذاری شد")
+
+    async def _persist(self, index: int) -> None:
+        if not self.db or not hasattr(self.db, 'save_api_quota_usage'):
+            return
+        state = self._state(index)
+        await asyncio.to_thread(
+            self.db.save_api_quota_usage, QUOTA_PROVIDER, self.key_ids[index], state['day'],
+            state['used'], state['limit'], state['remaining']
+        )
+
+    @staticmethod
+    def _quota_error(data: Dict[str, Any]) -> Optional[str]:
+        """خطاهای سهمیه که API-Football با کد 200 در بدنه برمی‌گرداند"""
+        errors = data.get('errors')
+        if isinstance(errors, dict):
+            for key in ('requests', 'rateLimit', 'token'):
+                if errors.get(key):
+                    return f"{key}: {errors[key]}"
+        return None
+
+    # -----------------------------
+    # 📌 درخواست
+    # -----------------------------
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        درخواست GET به یک endpoint (مثل 'fixtures')
+
+        Args:
+            priority: PRIORITY_INTERACTIVE (درخواست کاربر، بدون دسترسی به سهمیه رزرو)
+                یا PRIORITY_SCHEDULED (jobهای زمان‌بندی‌شده)
+
+        Returns:
+            بدنه JSON پاسخ، یا None اگر درخواست با هیچ کلیدی موفق نشد یا بودجه‌ای نماند
+        """
+        await self._ensure_loaded()
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        session = http_sessions.get('sports')
+
+        ready_keys = self._ready_keys(priority)
+        if not ready_keys:
+            self.stats['deferred'] += 1
+            return None
+
+        for attempt, index in enumerate(ready_keys):
+            if attempt:
+                self.stats['failovers'] += 1
+            self.current_index = index
+            headers = {'x-rapidapi-key': self.api_keys[index], 'x-rapidapi-host': FOOTBALL_API_HOST}
+            state = self._state(index)
+
+            try:
+                async with self._semaphore:
+                    # ممکن است کلید در زمان انتظار توسط درخواست همزمان دیگری کنار گذاشته شده باشد
+                    if not self._key_ready(index, priority):
+                        continue
+                    self.stats['requests'] += 1
+                    state['used'] += 1
+                    if state['remaining'] is not None:
+                        state['remaining'] -= 1
+                    async with session.get(url, headers=headers, params=params) as response:
+                        self._sync_headers(state, response.headers)
+                        if response.status == 429:
+                            # محدودیت دقیقه‌ای: کلید بعدی بدون انتظار
+                            state['cooldown_until'] = time.monotonic() + RATE_LIMIT_COOLDOWN
+                            logger.warning(f"API Key {index} خطای 429 گرفت؛ استفاده از کلید بعدی")
+                            continue
+                        if response.status != 200:
+                            self.stats['errors'] += 1
+                            body = await response.text()
+                            logger.warning(f"❌ خطای API-Football برای {endpoint} {params}: {response.status} - {body[:200]}")
+                            return None
+
+                        data = await response.json(content_type=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"API Key {index} خطا داد ({endpoint} {params}): {e}")
+                continue
+            finally:
+                await self._persist(index)
+
+            quota_error = self._quota_error(data)
+            if quota_error:
+                if quota_error.startswith('rateLimit'):
+                    state['cooldown_until'] = time.monotonic() + RATE_LIMIT_COOLDOWN
+                else:
+                    self._mark_exhausted(index, quota_error)
+                    await self._persist(index)
+                continue
+
+            return data
+
+        return None
+
+    async def get_fixtures_for_dates(
+        self,
+        dates: Iterable[str],
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """دریافت همزمان بازی‌های چند روز (None برای روزهای ناموفق)"""
+        dates = list(dates)
+        payloads = await asyncio.gather(*(self.get('fixtures', {'date': date_str}, priority) for date_str in dates))
+        return {
+            date_str: (payload.get('response') or []) if payload is not None else None
+            for date_str, payload in zip(dates, payloads)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        states = [self._state(index) for index in range(len(self.api_keys))]
+        return dict(
+            self.stats,
+            keys=len(self.api_keys),
+            exhausted=sum(1 for state in states if state['exhausted']),
+            remaining=[self._remaining(state) for state in states],
+            reserve=self.scheduled_reserve,
+        )
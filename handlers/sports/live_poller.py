@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+poller مشترک بازی‌های زنده
+- فقط در بازه بازی‌های لیگ‌های تحت پوشش (از کش فیکسچرهای هفتگی) به API درخواست می‌دهد
+- آخرین snapshot در حافظه برای همه کاربران سرو می‌شود
+- مقایسه snapshotهای متوالی (گل، تغییر وضعیت، پایان بازی) و اعلان به دنبال‌کنندگان تیم‌ها
+- فاصله درخواست‌ها بر اساس سهمیه باقی‌مانده امروز تنظیم می‌شود
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from services.price_alert_service import RateLimitedSender
+
+from .football_api import PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+# بازه زنده هر بازی: کمی قبل از شروع تا پایان احتمالی (وقت اضافه و پنالتی)
+PRE_KICKOFF = timedelta(minutes=5)
+LIVE_WINDOW = timedelta(minutes=150)
+
+LIVE_MIN_INTERVAL = int(os.getenv('SPORTS_LIVE_MIN_INTERVAL', '60'))
+LIVE_MAX_INTERVAL = int(os.getenv('SPORTS_LIVE_MAX_INTERVAL', '600'))
+# بررسی بازه‌ها بدون درخواست API وقتی بازی زنده‌ای در برنامه نیست
+IDLE_CHECK_INTERVAL = 60
+SCHEDULE_REFRESH_INTERVAL = 1800
+# سهمی از بودجه درخواست‌های کاربر که poller مجاز به مصرف آن است
+LIVE_BUDGET_SHARE = 0.5
+
+FINISHED_STATUSES = frozenset({'FT', 'AET', 'PEN'})
+STATUS_EVENTS = {
+    '1H': '🟢 شروع بازی',
+    'HT': '⏸️ پایان نیمه اول',
+    '2H': '▶️ شروع نیمه دوم',
+    'ET': '⏱️ وقت اضافه',
+    'P': '🎯 ضربات پنالتی',
+    'FT': '🏁 پایان بازی',
+    'AET': '🏁 پایان بازی (وقت اضافه)',
+    'PEN': '🏁 پایان بازی (پنالتی)',
+}
+
+
+def _parse_kickoff(match: Dict[str, Any]) -> Optional[datetime]:
+    raw = match.get('datetime') or match.get('date')
+    if isinstance(raw, datetime):
+        kickoff = raw
+    elif isinstance(raw, str):
+        try:
+            kickoff = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=timezone.utc)
+    return kickoff.astimezone(timezone.utc)
+
+
+def diff_live_snapshots(
+    previous: Dict[int, Dict[str, Any]],
+    current: Dict[int, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """رویدادهای بین دو snapshot متوالی (کلید: fixture_id)"""
+    events = []
+    for fixture_id, match in current.items():
+        old = previous.get(fixture_id)
+        if old is None:
+            events.append({'type': 'status', 'match': match, 'status': match.get('status')})
+            continue
+
+        old_score, new_score = old['score'], match['score']
+        if old_score != new_score:
+            for side in ('home', 'away'):
+                if new_score[side] > old_score[side]:
+                    events.append({'type': 'goal', 'match': match, 'side': side})
+            if new_score['home'] < old_score['home'] or new_score['away'] < old_score['away']:
+                events.append({'type': 'score_corrected', 'match': match})
+
+        if match.get('status') != old.get('status'):
+            events.append({'type': 'status', 'match': match, 'status': match.get('status')})
+
+    # بازی‌هایی که از فهرست زنده خارج شده‌اند تمام شده‌اند
+    for fixture_id, old in previous.items():
+        if fixture_id not in current and old.get('status') not in FINISHED_STATUSES:
+            events.append({'type': 'status', 'match': old, 'status': 'FT'})
+
+    return [event for event in events if event['type'] != 'status' or event['status'] in STATUS_EVENTS]
+
+
+def format_live_event(event: Dict[str, Any]) -> str:
+    """متن اعلان یک رویداد بازی زنده"""
+    match = event['match']
+    score_line = (
+        f"{match['home_team']} {match['score']['home']} - "
+        f"{match['score']['away']} {match['away_team']}"
+    )
+    minute = f" (دقیقه {match['minute']})" if match.get('minute') else ""
+
+    if event['type'] == 'goal':
+        scorer = match['home_team'] if event['side'] == 'home' else match['away_team']
+        title = f"⚽ گل برای {scorer}!{minute}"
+    elif event['type'] == 'score_corrected':
+        title = f"🔄 اصلاح نتیجه{minute}"
+    else:
+        title = STATUS_EVENTS.get(event['status'], event['status'])
+
+    return f"{title}\n🏆 {match['competition']}\n🏟️ {score_line}"
+
+
+class LiveMatchPoller:
+    """دریافت دوره‌ای بازی‌های زنده برای همه کاربران و اعلان رویدادها"""
+
+    def __init__(
+        self,
+        sports_handler,
+        min_interval: int = LIVE_MIN_INTERVAL,
+        max_interval: int = LIVE_MAX_INTERVAL
+    ):
+        self.sports = sports_handler
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.sender = RateLimitedSender()
+        # تابع sync که payload کش فیکسچرهای هفتگی را برمی‌گرداند
+        self.schedule_loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+        self._kickoffs: Optional[List[datetime]] = None
+        self._schedule_loaded_at = 0.0
+        self._matches: Dict[int, Dict[str, Any]] = {}
+        self._has_baseline = False
+        self._result: Optional[Dict[str, Any]] = None
+        self._result_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'polls': 0, 'idle_checks': 0, 'budget_skips': 0, 'events': 0, 'notifications': 0}
+
+    # -----------------------------
+    # 📌 چرخه پس‌زمینه
+    # -----------------------------
+    def start(self, bot, schedule_loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = None) -> None:
+        self.schedule_loader = schedule_loader
+        self.sender.start(bot)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.sender.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        logger.info("🔴 poller بازی‌های زنده فعال شد")
+        while True:
+            try:
+                delay = await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ خطا در poller بازی‌های زنده: {e}")
+                delay = self.max_interval
+            await asyncio.sleep(delay)
+
+    # -----------------------------
+    # 📌 برنامه بازی‌ها و فاصله درخواست‌ها
+    # -----------------------------
+    async def _refresh_schedule(self) -> None:
+        # بدون برنامه بازی‌ها (مثلاً پیش از اولین اجرای job هفتگی) کش زودتر دوباره خوانده می‌شود
+        refresh_interval = SCHEDULE_REFRESH_INTERVAL if self._kickoffs is not None else IDLE_CHECK_INTERVAL
+        if not self.schedule_loader or time.monotonic() - self._schedule_loaded_at < refresh_interval:
+            return
+        self._schedule_loaded_at = time.monotonic()
+        try:
+            payload = await asyncio.to_thread(self.schedule_loader)
+        except Exception as e:
+            logger.warning(f"⚠️ خطا در خواندن برنامه بازی‌ها برای poller زنده: {e}")
+            return
+        if not payload:
+            self._kickoffs = None
+            return
+
+        kickoffs = []
+        for league_info in (payload.get('leagues') or {}).values():
+            for match in league_info.get('matches', []):
+                kickoff = _parse_kickoff(match)
+                if kickoff:
+                    kickoffs.append(kickoff)
+        self._kickoffs = sorted(kickoffs)
+
+    def _live_windows(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """بازه‌های زنده ادغام‌شده که با [start, end] هم‌پوشانی دارند"""
+        merged: List[Tuple[datetime, datetime]] = []
+        for kickoff in self._kickoffs or ():
+            window_start, window_end = kickoff - PRE_KICKOFF, kickoff + LIVE_WINDOW
+            if window_end < start or window_start > end:
+                continue
+            if merged and window_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], window_end))
+            else:
+                merged.append((window_start, window_end))
+        return merged
+
+    def in_live_window(self, now: datetime) -> bool:
+        # بدون برنامه بازی‌ها poll نمی‌کنیم؛ درخواست کاربران مستقیم (با کش کوتاه) پاسخ داده می‌شود
+        if self._kickoffs is None:
+            return False
+        return bool(self._live_windows(now, now))
+
+    def live_budget(self) -> int:
+        """سهم poller از بودجه باقی‌مانده درخواست‌های کاربر امروز"""
+        return int(self.sports.football_api.budget(PRIORITY_INTERACTIVE) * LIVE_BUDGET_SHARE)
+
+    def next_interval(self, now: datetime, budget: int) -> int:
+        """
+        فاصله poll بعدی: بودجه باقی‌مانده امروز بین زمان زنده باقی‌مانده امروز تقسیم می‌شود
+        """
+        day_end = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        live_seconds = sum(
+            (min(end, day_end) - max(start, now)).total_seconds()
+            for start, end in self._live_windows(now, day_end)
+        )
+        if live_seconds <= 0:
+            # بازی‌های پیگیری‌شده بیرون از بازه برنامه (تأخیر یا برنامه حذف‌شده)
+            live_seconds = LIVE_WINDOW.total_seconds()
+        return int(min(self.max_interval, max(self.min_interval, live_seconds / budget)))
+
+    # -----------------------------
+    # 📌 دریافت و مقایسه snapshot
+    # -----------------------------
+    def _publish(self, live_matches: List[Dict[str, Any]]) -> None:
+        self._result = self.sports.build_live_result(live_matches)
+        self._result_at = time.monotonic()
+
+    def get_result(self) -> Optional[Dict[str, Any]]:
+        """آخرین snapshot مشترک؛ None اگر poller فعال نیست یا snapshot قدیمی شده"""
+        if not self.running or self._result is None:
+            return None
+        if time.monotonic() - self._result_at > self.interval + IDLE_CHECK_INTERVAL:
+            return None
+        return self._result
+
+    async def poll_once(self) -> int:
+        """یک دور poll؛ ثانیه‌های انتظار تا دور بعد را برمی‌گرداند"""
+        now = datetime.now(timezone.utc)
+        await self._refresh_schedule()
+
+        # بیرون از بازه بازی‌ها و بدون بازی زنده قبلی: نتیجه خالی بدون درخواست API
+        if not self._matches and not self.in_live_window(now):
+            self.stats['idle_checks'] += 1
+            self.interval = IDLE_CHECK_INTERVAL
+            if self._kickoffs is None:
+                # بدون برنامه نمی‌دانیم بازی زنده‌ای نیست؛ snapshot خالی منتشر نمی‌شود
+                self._result = None
+            else:
+                self._has_baseline = True
+                self._publish([])
+            return IDLE_CHECK_INTERVAL
+
+        budget = self.live_budget()
+        if budget <= 0:
+            # سهم poller تمام شده؛ snapshot قبلی تا پایان اعتبارش سرو می‌شود
+            self.stats['budget_skips'] += 1
+            self.interval = self.max_interval
+            return self.max_interval
+
+        self.interval = self.next_interval(now, budget)
+        data = await self.sports.football_api.get('fixtures', {'live': 'all'}, PRIORITY_INTERACTIVE)
+        if data is None:
+            # snapshot قبلی تا پایان اعتبارش سرو می‌شود
+            return self.interval
+
+        self.stats['polls'] += 1
+        live_matches = self.sports.parse_live_matches(data)
+        current = {match['fixture_id']: match for match in live_matches if match.get('fixture_id')}
+        events = diff_live_snapshots(self._matches, current) if self._has_baseline else []
+        self._matches = current
+        self._has_baseline = True
+        self._publish(live_matches)
+
+        if events:
+            self.stats['events'] += len(events)
+            await self._notify(events)
+        return self.interval
+
+    async def _team_followers(self) -> Dict[int, Set[int]]:
+        db = self.sports.db
+        if not db or not hasattr(db, 'get_all_sports_favorites'):
+            return {}
+        favorites = await asyncio.to_thread(db.get_all_sports_favorites)
+        followers: Dict[int, Set[int]] = {}
+        for fav in favorites:
+            followers.setdefault(fav['team_id'], set()).add(fav['user_id'])
+        return followers
+
+    async def _notify(self, events: List[Dict[str, Any]]) -> None:
+        followers = await self._team_followers()
+        if not followers:
+            return
+
+        for event in events:
+            match = event['match']
+            users = followers.get(match.get('home_team_id'), set()) | followers.get(match.get('away_team_id'), set())
+            if not users:
+                continue
+            text = format_live_event(event)
+            for user_id in users:
+                if self.sender.enqueue(user_id, text):
+                    self.stats['notifications'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            running=self.running,
+            interval=self.interval,
+            live=len(self._matches),
+            queued=self.sender.queue.qsize(),
+        )
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+زمان‌بند ارسال یادآوری‌های بازی
+- یادآوری‌های چند ساعت آینده در یک heap نگهداری می‌شوند و تا زمان اولین یادآوری می‌خوابد
+- با تغییر یادآوری‌ها (همگام‌سازی روزانه یا حذف تیم) فقط بخش تغییرکرده دوباره خوانده می‌شود
+- هر دسته سررسیده با یک دستور DELETE ... RETURNING برداشته و از صف ارسال محدودشده فرستاده می‌شود
+"""
+
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.price_alert_service import RateLimitedSender
+
+logger = logging.getLogger(__name__)
+
+# بازه‌ای از آینده که در حافظه نگهداری می‌شود
+REMINDER_HORIZON = timedelta(hours=6)
+# یادآوری‌هایی که بیش از این مقدار عقب افتاده‌اند بدون ارسال حذف می‌شوند
+STALE_AFTER = timedelta(hours=3)
+BATCH_SIZE = 500
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class ReminderDispatcher:
+    """ارسال دقیق یادآوری‌ها در زمان سررسید بدون poll دوره‌ای دیتابیس"""
+
+    def __init__(self, db_manager=None, horizon: timedelta = REMINDER_HORIZON):
+        self.db = db_manager
+        self.horizon = horizon
+        self.sender = RateLimitedSender()
+        self.formatter: Optional[Callable[[Dict[str, Any]], str]] = None
+        # heap از (زمان سررسید، id)؛ ورودی‌های حذف‌شده یا تغییرکرده به‌صورت تنبل کنار می‌روند
+        self._heap: List[Tuple[float, int]] = []
+        self._reminders: Dict[int, Dict[str, Any]] = {}
+        self._loaded_until: Optional[datetime] = None
+        self._full_reload = True
+        self._dirty_users: set = set()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'sent': 0, 'expired': 0, 'batches': 0, 'reloads': 0}
+
+    # -----------------------------
+    # 📌 چرخه پس‌زمینه
+    # -----------------------------
+    def start(self, bot, formatter: Callable[[Dict[str, Any]], str]) -> None:
+        self.formatter = formatter
+        self.sender.start(bot)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.sender.stop()
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """اعلام تغییر یادآوری‌ها (کل جدول یا فقط یک کاربر)"""
+        if user_id is None:
+            self._full_reload = True
+        else:
+            self._dirty_users.add(user_id)
+        self._changed.set()
+
+    async def _run(self) -> None:
+        logger.info("⏰ زمان‌بند یادآوری‌های بازی فعال شد")
+        while True:
+            try:
+                await self._reload_if_needed()
+                await self._dispatch_due()
+                await self._sleep_until_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ خطا در زمان‌بند یادآوری‌های بازی: {e}")
+                await asyncio.sleep(60)
+
+    async def _sleep_until_next(self) -> None:
+        now = datetime.now(timezone.utc)
+        wake_at = self._loaded_until or now
+        if self._heap:
+            wake_at = min(wake_at, datetime.fromtimestamp(self._heap[0][0], timezone.utc))
+        timeout = max(0.0, (wake_at - now).total_seconds())
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    # -----------------------------
+    # 📌 بارگذاری
+    # -----------------------------
+    def _push(self, reminder: Dict[str, Any]) -> None:
+        due = _as_utc(reminder['reminder_datetime'])
+        reminder['reminder_datetime'] = due
+        self._reminders[reminder['id']] = reminder
+        heapq.heappush(self._heap, (due.timestamp(), reminder['id']))
+
+    async def _reload_if_needed(self) -> None:
+        now = datetime.now(timezone.utc)
+        self._changed.clear()
+
+        if self._full_reload or not self._loaded_until or now >= self._loaded_until:
+            self._full_reload = False
+            self._dirty_users.clear()
+            until = now + self.horizon
+            rows = await asyncio.to_thread(self.db.get_pending_match_reminders, until)
+            self._heap = []
+            self._reminders = {}
+            for row in rows:
+                self._push(row)
+            self._loaded_until = until
+            self.stats['reloads'] += 1
+            logger.info(f"⏰ {len(rows)} یادآوری تا {until.strftime('%H:%M')} UTC بارگذاری شد")
+            return
+
+        # بارگذاری مجدد فقط یادآوری‌های کاربرانی که تغییر کرده‌اند
+        while self._dirty_users:
+            user_id = self._dirty_users.pop()
+            rows = await asyncio.to_thread(self.db.get_user_match_reminders, user_id, False)
+            for reminder_id in [rid for rid, r in self._reminders.items() if r['user_id'] == user_id]:
+                self._reminders.pop(reminder_id)
+            for row in rows:
+                if row.get('reminder_datetime') and _as_utc(row['reminder_datetime']) <= self._loaded_until:
+                    self._push(row)
+
+    # -----------------------------
+    # 📌 ارسال
+    # -----------------------------
+    def _pop_due(self, now: datetime) -> List[Dict[str, Any]]:
+        due = []
+        cutoff = now.timestamp()
+        while self._heap and self._heap[0][0] <= cutoff and len(due) < BATCH_SIZE:
+            timestamp, reminder_id = heapq.heappop(self._heap)
+            reminder = self._reminders.get(reminder_id)
+            # ورودی کهنه heap (حذف یا زمان‌بندی مجدد شده)
+            if reminder is None or reminder['reminder_datetime'].timestamp() != timestamp:
+                continue
+            self._reminders.pop(reminder_id)
+            due.append(reminder)
+        return due
+
+    async def _dispatch_due(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            batch = self._pop_due(now)
+            if not batch:
+                return
+
+            # برداشتن دسته از جدول؛ فقط یادآوری‌هایی که هنوز در انتظار بودند ارسال می‌شوند
+            claimed = set(await asyncio.to_thread(
+                self.db.complete_match_reminders, [reminder['id'] for reminder in batch]
+            ))
+            self.stats['batches'] += 1
+
+            for reminder in batch:
+                if reminder['id'] not in claimed:
+                    continue
+                if now - reminder['reminder_datetime'] > STALE_AFTER:
+                    self.stats['expired'] += 1
+                    continue
+                if self.sender.enqueue(reminder['user_id'], self.formatter(reminder), parse_mode='Markdown'):
+                    self.stats['sent'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            scheduled=len(self._reminders),
+            running=self._task is not None and not self._task.done(),
+        )
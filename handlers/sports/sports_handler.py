@@ -9,18 +9,52 @@
 - نمایش نتایج زنده بازی‌های در جریان
 """
 
+import asyncio
 import logging
-import requests
 import feedparser
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import os
 from bs4 import BeautifulSoup
 import pytz
 from dateutil import parser
 
+from core.http_sessions import http_sessions
+
+from .api_cache import PersistentTTLCache
+from .football_api import FootballApiClient, PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, parse_fixture
+from .live_poller import LiveMatchPoller
+from .reminder_dispatcher import ReminderDispatcher
+from .team_index import TeamIndex
+
 logger = logging.getLogger(__name__)
 
+# TTL کش‌های ماندگار داده‌های کم‌تغییر API-Football
+TEAM_CACHE_TTL = timedelta(hours=24)
+LEAGUE_META_CACHE_TTL = timedelta(hours=24)
+SEASON_CACHE_TTL = timedelta(days=7)
+
+# وضعیت‌هایی که نتیجه بازی دیگر تغییر نمی‌کند
+FINAL_FIXTURE_STATUSES = frozenset({'FT', 'AET', 'PEN', 'CANC', 'ABD', 'AWD', 'WO'})
+# روزهای نزدیک (امروز و فردا به وقت UTC) در هر بروزرسانی دوباره دریافت می‌شوند
+NEAR_FIXTURE_DAYS = 2
+# روزهای دورتر آینده پس از این مدت دوباره دریافت می‌شوند (تغییر زمان بازی‌ها)
+FUTURE_DAY_MAX_AGE = timedelta(hours=72)
+# سقف طول هر صفحه پیام برنامه بازی‌ها (محدودیت تلگرام 4096 کاراکتر است)
+FIXTURES_PAGE_LIMIT = 3800
+# تعداد اخبار نگهداری‌شده در کش RSS
+NEWS_CACHE_SIZE = 30
+
+WEEKDAY_FA = {
+    0: 'دوشنبه',
+    1: 'سه‌شنبه',
+    2: 'چهارشنبه',
+    3: 'پنج‌شنبه',
+    4: 'جمعه',
+    5: 'شنبه',
+    6: 'یک‌شنبه'
+}
+
 class SportsHandler:
     """مدیریت اطلاعات ورزشی"""
     
@@ -35,18 +69,26 @@ class SportsHandler:
         # حذف کلیدهای خالی
         self.api_keys = [key for key in self.api_keys if key]
 
-        self.football_api_base = "https://v3.football.api-sports.io"
-        self.current_api_index = 0
-        self.football_api_key = self.api_keys[0] if self.api_keys else ''
-
+        # کلاینت async با session مشترک و جابجایی خودکار بین کلیدها
+        self.football_api = FootballApiClient(self.api_keys, db_manager=db_manager)
         # وضعیت محدودیت برای هر کلید
-        self.api_limits = {i: {'used': 0, 'limit': 100, 'exhausted': False} for i in range(len(self.api_keys))}
+        self.api_limits = self.football_api.api_limits
 
         if not self.api_keys:
             logger.warning("⚠️ هیچ کلید API برای SportsHandler تنظیم نشده است")
         
         # RSS Feeds برای اخبار فارسی
         self.varzesh3_rss = "https://www.varzesh3.com/rss/all"
+        # کش اخبار تجزیه‌شده به همراه اعتبارسنج‌های HTTP برای درخواست شرطی
+        self.news_cache: Dict[str, Any] = {
+            'entries': [],
+            'fetched_at': None,
+            'etag': None,
+            'last_modified': None,
+        }
+        self.news_ttl = timedelta(seconds=int(os.getenv('SPORTS_NEWS_TTL', '300')))
+        self._news_refresh: Optional[asyncio.Task] = None
+        self.news_stats = {'cache_hits': 0, 'downloads': 0, 'not_modified': 0}
         
         # League IDs (API-Football)
         self.league_ids = {
@@ -87,9 +129,21 @@ class SportsHandler:
         
         self.timeout = 15
         self.current_season = self._get_current_season()
-        self.team_cache: Dict[str, Dict[str, Any]] = {}
-        self.season_cache: Dict[int, Dict[str, Any]] = {}
-        self.league_meta_cache: Dict[int, Dict[str, Any]] = {}
+        # کش‌های ماندگار (حافظه + دیتابیس) برای داده‌های کم‌تغییر API
+        self.team_cache = PersistentTTLCache('teams', TEAM_CACHE_TTL, db_manager=db_manager)
+        self.season_cache = PersistentTTLCache('season', SEASON_CACHE_TTL, db_manager=db_manager)
+        self.league_meta_cache = PersistentTTLCache('league_meta', LEAGUE_META_CACHE_TTL, db_manager=db_manager)
+        # شاخص نام تیم‌های هر لیگ (با تغییر فهرست تیم‌های کش دوباره ساخته می‌شود)
+        self._team_indexes: Dict[str, TeamIndex] = {}
+        # آخرین نتیجه بازی‌های زنده (برای کاهش مصرف سهمیه و حالت کم‌سهمیه)
+        self.live_cache: Optional[Dict[str, Any]] = None
+        self.live_cache_ttl = int(os.getenv('SPORTS_LIVE_CACHE_TTL', '60'))
+        # poller مشترک بازی‌های زنده و اعلان تغییر نتیجه به دنبال‌کنندگان تیم‌ها
+        self.live_poller = LiveMatchPoller(self)
+        # ارسال یادآوری‌های بازی در زمان سررسید
+        self.reminder_dispatcher = ReminderDispatcher(db_manager)
+        # صفحه‌های از پیش ساخته‌شده پیام برنامه هفتگی (بروزرسانی با هر ذخیره بازی‌ها)
+        self._fixtures_pages: Optional[Dict[str, Any]] = None
 
     def _get_current_season(self) -> int:
         """محاسبه فصل جاری برای لیگ‌ها (لیگ‌های اروپایی از تابستان آغاز می‌شوند)"""
@@ -97,114 +151,56 @@ class SportsHandler:
         return now.year - 1 if now.month < 7 else now.year
 
     async def _get_league_season_metadata(self, league_id: int) -> List[Dict[str, Any]]:
-        """دریافت اطلاعات فصول یک لیگ همراه با پوشش"""
-        cached = self.league_meta_cache.get(league_id)
-        if cached:
-            fetched_at: datetime = cached['fetched_at']
-            if (datetime.now() - fetched_at).total_seconds() <= 12 * 3600:
-                return cached['seasons']
-
-        if not self.api_keys:
-            return []
+        """دریافت اطلاعات فصول یک لیگ همراه با پوشش (از کش ماندگار در صورت وجود)"""
+        loader = lambda: self._fetch_league_season_metadata(league_id)
+        # در حالت کم‌سهمیه داده قدیمی‌تر هم استفاده می‌شود
+        seasons = await self.league_meta_cache.get_or_refresh(
+            league_id, loader, allow_stale=not self.football_api.can_serve()
+        )
+        if seasons is not None:
+            return seasons
 
-        for api_index in range(len(self.api_keys)):
-            if self.api_limits[api_index]['exhausted']:
-                continue
+        seasons = await loader()
+        if seasons:
+            await self.league_meta_cache.set(league_id, seasons)
+        return seasons or []
 
-            current_key = self.api_keys[api_index]
-            self.current_api_index = api_index
+    async def _fetch_league_season_metadata(self, league_id: int) -> Optional[List[Dict[str, Any]]]:
+        """دریافت اطلاعات فصول یک لیگ از API"""
+        if not self.api_keys:
+            return None
 
-            headers = {
-                'x-rapidapi-key': current_key,
-                'x-rapidapi-host': 'v3.football.api-sports.io'
-            }
+        try:
+            data = await self.football_api.get('leagues', {'id': league_id})
+            if data is None:
+                logger.warning(f"❌ خطا در دریافت اطلاعات لیگ {league_id}")
+                return None
 
+            seasons = []
             try:
-                response = requests.get(
-                    f"{self.football_api_base}/leagues",
-                    headers=headers,
-                    params={'id': league_id},
-                    timeout=self.timeout
-                )
+                league_info = data.get('response', [])[0]
+                seasons = league_info.get('seasons', []) if league_info else []
+            except Exception:
+                seasons = []
 
-                if not self.handle_api_response(response):
-                    self.api_limits[self.current_api_index]['exhausted'] = True
-                    continue
-
-                if response.status_code == 200:
-                    data = response.json()
-                    seasons = []
-                    try:
-                        league_info = data.get('response', [])[0]
-                        seasons = league_info.get('seasons', []) if league_info else []
-                    except Exception:
-                        seasons = []
-
-                    if seasons:
-                        seasons_sorted = sorted(seasons, key=lambda s: s.get('year', 0), reverse=True)
-                        self.league_meta_cache[league_id] = {
-                            'seasons': seasons_sorted,
-                            'fetched_at': datetime.now()
-                        }
-                        return seasons_sorted
-                    else:
-                        logger.warning(f"⚠️ هیچ فصلی برای لیگ {league_id} یافت نشد")
-                else:
-                    logger.warning(f"❌ خطا در دریافت اطلاعات لیگ {league_id} (کد {response.status_code})")
+            if seasons:
+                return sorted(seasons, key=lambda s: s.get('year', 0), reverse=True)
+            logger.warning(f"⚠️ هیچ فصلی برای لیگ {league_id} یافت نشد")
 
-            except Exception as e:
-                logger.error(f"❌ استثنا در دریافت اطلاعات لیگ {league_id}: {e}")
-                continue
+        except Exception as e:
+            logger.error(f"❌ استثنا در دریافت اطلاعات لیگ {league_id}: {e}")
 
-        return []
+        return None
 
-    def get_current_api_key(self) -> str:
-        """دریافت کلید API فعلی با بررسی محدودیت"""
-        if not self.api_keys:
-            return ''
-        
-        # پیدا کردن اولین کلیدی که به محدودیت نخورده
-        for i in range(len(self.api_keys)):
-            if not self.api_limits[i]['exhausted']:
-                return self.api_keys[i]
-        
-        return ''  # همه کلیدها به محدودیت خوردن
-    
     def _invalidate_team_cache(self, league_key: Optional[str] = None) -> None:
-        if league_key:
-            self.team_cache.pop(league_key, None)
-        else:
-            self.team_cache.clear()
-
-    def handle_api_response(self, response):
-        """بررسی پاسخ API و مدیریت محدودیت"""
-        if response.status_code == 429:  # Too Many Requests
-            # علامت گذاری کلید فعلی به عنوان محدودیت خورده
-            self.api_limits[self.current_api_index]['exhausted'] = True
-            logger.warning(f"API Key {self.current_api_index} به محدودیت خورد")
-            return False  # خطای محدودیت
-        
-        elif response.status_code == 200:
-            # بررسی هدر مصرف
-            try:
-                remaining = response.headers.get('x-ratelimit-requests-remaining', '100')
-                remaining = int(remaining)
-                
-                if remaining <= 5:  # نزدیک به محدودیت
-                    self.api_limits[self.current_api_index]['exhausted'] = True
-                    logger.warning(f"API Key {self.current_api_index} نزدیک به محدودیت (موجود: {remaining})")
-                    return False
-                
-                return True  # موفقیت
-            except:
-                return True  # اگر هدر نبود، فرض موفقیت
-        
-        return True  # سایر خطاها محدودیت نیست
-    
+        self.team_cache.invalidate(league_key)
+
     def get_rate_limit_message(self) -> str:
         """پیام مناسب برای محدودیت مصرف"""
         exhausted_count = sum(1 for limit in self.api_limits.values() if limit['exhausted'])
         
+        if exhausted_count < len(self.api_keys) and not self.football_api.can_serve():
+            return "⏳ **سهمیه امروز API برای بروزرسانی‌های خودکار رزرو شده است.**\n\n📦 تا ریست سهمیه در نیمه‌شب UTC، داده‌های ذخیره‌شده نمایش داده می‌شوند."
         if exhausted_count == len(self.api_keys):
             return "❌ **محدودیت API مصرف شد!**\n\n📊 هر دو کلید API به محدودیت روزانه (100 درخواست) رسیدن.\n\n🔄 لطفاً فردا دوباره تلاش کنید.\n\n⏰ محدودیت‌ها در نیمه‌شب به وقت UTC ریست میشن."
         else:
@@ -219,16 +215,26 @@ class SportsHandler:
                 'error': f'لیگ {league_key} پشتیبانی نمی‌شود'
             }
 
-        # استفاده از کش 12 ساعته
-        cached = self.team_cache.get(league_key)
-        if cached:
-            fetched_at: datetime = cached['fetched_at']
-            if (datetime.now() - fetched_at).total_seconds() <= 12 * 3600:
-                return {
-                    'success': True,
-                    'teams': cached['teams'],
-                    'cached': True
-                }
+        loader = lambda: self._fetch_league_teams(league_key, league_id)
+        can_fetch = self.football_api.can_serve()
+
+        # کش ماندگار: بعد از ری‌استارت هم فقط یک خواندن از دیتابیس
+        entry = await self.team_cache.get_entry(league_key)
+        fresh = self.team_cache.is_fresh(entry)
+        # سهمیه درخواست‌های کاربر تمام شده: کش قدیمی بهتر از خطاست
+        if fresh or (entry and not can_fetch):
+            if can_fetch and self.team_cache.needs_refresh(entry):
+                self.team_cache.refresh_in_background(league_key, loader)
+            self.get_team_index(league_key, entry['value']['teams'])
+            result = {
+                'success': True,
+                'teams': entry['value']['teams'],
+                'season': entry['value'].get('season'),
+                'cached': True
+            }
+            if not fresh:
+                result['stale'] = True
+            return result
 
         if not self.api_keys:
             return {
@@ -236,6 +242,33 @@ class SportsHandler:
                 'error': 'هیچ کلید API برای دریافت تیم‌ها موجود نیست'
             }
 
+        team_data = await loader()
+        if team_data:
+            await self.team_cache.set(league_key, team_data)
+            self.get_team_index(league_key, team_data['teams'])
+            return {
+                'success': True,
+                'teams': team_data['teams'],
+                'season': team_data['season'],
+                'cached': False
+            }
+
+        return {
+            'success': False,
+            'error': 'امکان دریافت لیست تیم‌ها وجود ندارد. لطفاً بعداً امتحان کنید.'
+        }
+
+    def get_team_index(self, league_key: str, teams: List[Dict[str, Any]]) -> TeamIndex:
+        """شاخص جستجوی تیم‌های لیگ؛ فقط در صورت تغییر فهرست تیم‌ها دوباره ساخته می‌شود"""
+        index = self._team_indexes.get(league_key)
+        if index is None or index.signature != TeamIndex.signature_of(teams):
+            index = TeamIndex(teams)
+            self._team_indexes[league_key] = index
+            logger.info(f"🔎 شاخص نام {len(index)} تیم برای لیگ {league_key} ساخته شد")
+        return index
+
+    async def _fetch_league_teams(self, league_key: str, league_id: int) -> Optional[Dict[str, Any]]:
+        """دریافت تیم‌های یک لیگ از API با امتحان فصل‌های دارای پوشش"""
         seasons_meta = await self._get_league_season_metadata(league_id)
         seasons_to_try: List[int] = []
         for season in seasons_meta:
@@ -251,145 +284,173 @@ class SportsHandler:
             if previous_season >= 2015 and previous_season not in seasons_to_try:
                 seasons_to_try.append(previous_season)
 
-        # تلاش با کلیدهای مختلف و فصل‌های متفاوت
-        for api_index in range(len(self.api_keys)):
-            if self.api_limits[api_index]['exhausted']:
-                continue
+        # فصلی که دفعه قبل تیم داشت اول امتحان می‌شود
+        season_entry = await self.season_cache.get_entry(league_id)
+        known_season = season_entry['value'] if season_entry else None
+        if known_season in seasons_to_try:
+            seasons_to_try.remove(known_season)
+            seasons_to_try.insert(0, known_season)
+
+        # تلاش با فصل‌های متفاوت (جابجایی کلیدها در کلاینت انجام می‌شود)
+        for season in seasons_to_try:
+            params = {
+                'league': league_id,
+                'season': season
+            }
 
-            current_key = self.api_keys[api_index]
-            self.current_api_index = api_index
-            self.football_api_key = current_key
+            try:
+                data = await self.football_api.get('teams', params)
+                if data is None:
+                    if not self.football_api.available:
+                        break
+                    logger.warning(f"❌ خطا در دریافت تیم‌های لیگ {league_key} در فصل {season}")
+                    continue
 
-            headers = {
-                'x-rapidapi-key': current_key,
-                'x-rapidapi-host': 'v3.football.api-sports.io'
-            }
+                errors = data.get('errors') or {}
+                if isinstance(errors, dict) and errors.get('plan'):
+                    logger.warning(f"⚠️ محدودیت پلن برای لیگ {league_key} در فصل {season}: {errors.get('plan')}")
+                    continue
 
-            for season in seasons_to_try:
-                params = {
-                    'league': league_id,
-                    'season': season
-                }
+                teams_raw = data.get('response', [])
 
-                try:
-                    response = requests.get(
-                        f"{self.football_api_base}/teams",
-                        headers=headers,
-                        params=params,
-                        timeout=self.timeout
-                    )
+                teams = []
+                for entry in teams_raw:
+                    team_info = entry.get('team') or {}
+                    team_id = team_info.get('id')
+                    name = team_info.get('name')
+                    if not team_id or not name:
+                        continue
+                    teams.append({
+                        'team_id': team_id,
+                        'team_name': name
+                    })
 
-                    if not self.handle_api_response(response):
-                        self.api_limits[self.current_api_index]['exhausted'] = True
-                        break
+                if teams:
+                    teams.sort(key=lambda t: t['team_name'])
+                    if season != known_season:
+                        await self.season_cache.set(league_id, season)
 
-                    if response.status_code == 200:
-                        data = response.json()
-
-                        errors = data.get('errors') or {}
-                        if errors.get('plan'):
-                            logger.warning(f"⚠️ محدودیت پلن برای لیگ {league_key} در فصل {season}: {errors.get('plan')}")
-                            continue
-
-                        teams_raw = data.get('response', [])
-
-                        teams = []
-                        for entry in teams_raw:
-                            team_info = entry.get('team') or {}
-                            team_id = team_info.get('id')
-                            name = team_info.get('name')
-                            if not team_id or not name:
-                                continue
-                            teams.append({
-                                'team_id': team_id,
-                                'team_name': name
-                            })
-
-                        if teams:
-                            teams.sort(key=lambda t: t['team_name'])
-
-                            self.team_cache[league_key] = {
-                                'teams': teams,
-                                'fetched_at': datetime.now(),
-                                'season': season
-                            }
-
-                            logger.info(f"✅ {len(teams)} تیم برای لیگ {league_key} و فصل {season} دریافت شد")
-                            return {
-                                'success': True,
-                                'teams': teams,
-                                'season': season,
-                                'cached': False
-                            }
-                        else:
-                            logger.warning(f"⚠️ تیمی برای لیگ {league_key} در فصل {season} یافت نشد")
-                    else:
-                        logger.warning(f"❌ خطا در دریافت تیم‌های لیگ {league_key} (کد {response.status_code})")
+                    logger.info(f"✅ {len(teams)} تیم برای لیگ {league_key} و فصل {season} دریافت شد")
+                    return {
+                        'teams': teams,
+                        'season': season
+                    }
+                else:
+                    logger.warning(f"⚠️ تیمی برای لیگ {league_key} در فصل {season} یافت نشد")
 
-                except Exception as e:
-                    logger.error(f"❌ استثنا در دریافت تیم‌های لیگ {league_key}: {e}")
-                    continue
+            except Exception as e:
+                logger.error(f"❌ استثنا در دریافت تیم‌های لیگ {league_key}: {e}")
+                continue
 
-        return {
-            'success': False,
-            'error': 'امکان دریافت لیست تیم‌ها وجود ندارد. لطفاً بعداً امتحان کنید.'
-        }
+        return None
+
+    @staticmethod
+    def _parse_news_entries(body: bytes) -> List[Dict[str, Any]]:
+        """تبدیل بایت‌های دریافت‌شده RSS به فهرست اخبار (اجرا در thread جداگانه)"""
+        feed = feedparser.parse(body)
+        news_items = []
+        for entry in feed.entries[:NEWS_CACHE_SIZE]:
+            summary = entry.get('summary', '')
+            news_items.append({
+                'title': entry.get('title', 'بدون عنوان'),
+                'link': entry.get('link', ''),
+                'published': entry.get('published', ''),
+                'summary': summary[:200] + '...' if len(summary) > 200 else summary
+            })
+        return news_items
+
+    async def _fetch_news_feed(self) -> bool:
+        """
+        دریافت RSS ورزش سه با اعتبارسنجی شرطی (ETag / Last-Modified)
+
+        Returns:
+            True اگر کش اخبار معتبر باشد (پاسخ 304 یا خبرهای جدید)
+        """
+        cache = self.news_cache
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; BotNewsFetcher/1.0)'}
+        if cache['entries']:
+            if cache['etag']:
+                headers['If-None-Match'] = cache['etag']
+            if cache['last_modified']:
+                headers['If-Modified-Since'] = cache['last_modified']
+
+        session = http_sessions.get('news')
+        async with session.get(self.varzesh3_rss, headers=headers, timeout=self.timeout) as response:
+            if response.status == 304:
+                cache['fetched_at'] = datetime.now()
+                self.news_stats['not_modified'] += 1
+                return True
+            if response.status != 200:
+                logger.warning(f"⚠️ پاسخ نامعتبر RSS ورزش سه: {response.status}")
+                return False
+            body = await response.read()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        entries = await asyncio.to_thread(self._parse_news_entries, body)
+        if not entries:
+            logger.warning("⚠️ هیچ خبری در RSS Feed یافت نشد")
+            return False
+
+        cache.update({
+            'entries': entries,
+            'fetched_at': datetime.now(),
+            'etag': etag,
+            'last_modified': last_modified,
+        })
+        self.news_stats['downloads'] += 1
+        logger.info(f"✅ {len(entries)} خبر ورزشی دریافت شد")
+        return True
+
+    async def refresh_news(self) -> bool:
+        """بروزرسانی کش اخبار؛ درخواست‌های همزمان منتظر همان دریافت می‌مانند"""
+        task = self._news_refresh
+        if task is None or task.done():
+            task = self._news_refresh = asyncio.create_task(self._fetch_news_feed())
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ خطا در دریافت RSS ورزش سه: {e}")
+            return False
+
+    def _refresh_news_in_background(self) -> None:
+        if self._news_refresh is not None and not self._news_refresh.done():
+            return
+
+        async def refresh() -> None:
+            await self.refresh_news()
+
+        asyncio.create_task(refresh())
 
     async def get_persian_news(self, limit: int = 10) -> Dict[str, Any]:
-        """دریافت اخبار ورزشی از منابع فارسی"""
+        """
+        دریافت اخبار ورزشی از منابع فارسی
+
+        اخبار از کش حافظه سرو می‌شوند؛ کش منقضی‌شده تا پایان بروزرسانی پس‌زمینه سرو می‌شود
+        و فقط در نبود کش، درخواست منتظر دریافت RSS می‌ماند
+        """
         try:
-            logger.info("🔄 درخواست اخبار ورزشی فارسی...")
-            
-            # تلاش برای دریافت از RSS Feed
-            try:
-                feed = feedparser.parse(self.varzesh3_rss)
-                
-                if not feed.entries:
-                    raise Exception("هیچ خبری در RSS Feed یافت نشد")
-                
-                news_items = []
-                for entry in feed.entries[:limit]:
-                    news_item = {
-                        'title': entry.get('title', 'بدون عنوان'),
-                        'link': entry.get('link', ''),
-                        'published': entry.get('published', ''),
-                        'summary': entry.get('summary', '')[:200] + '...' if len(entry.get('summary', '')) > 200 else entry.get('summary', '')
-                    }
-                    news_items.append(news_item)
-                
-                logger.info(f"✅ {len(news_items)} خبر دریافت شد")
+            cache = self.news_cache
+            if cache['entries']:
+                age = datetime.now() - cache['fetched_at']
+                if age >= self.news_ttl:
+                    self._refresh_news_in_background()
+                self.news_stats['cache_hits'] += 1
+            else:
+                logger.info("🔄 درخواست اخبار ورزشی فارسی...")
+                await self.refresh_news()
+
+            if cache['entries']:
+                news_items = cache['entries'][:limit]
                 return {
                     'success': True,
                     'news': news_items,
                     'count': len(news_items),
                     'source': 'ورزش سه'
                 }
-            
-            except Exception as rss_error:
-                logger.error(f"❌ خطا در RSS: {rss_error}")
-                
-                # Fallback: web scraping ساده
-                try:
-                    response = requests.get(
-                        'https://www.varzesh3.com',
-                        timeout=self.timeout,
-                        headers={'User-Agent': 'Mozilla/5.0'}
-                    )
-                    
-                    if response.status_code == 200:
-                        return {
-                            'success': True,
-                            'news': [{
-                                'title': 'اخبار ورزشی',
-                                'summary': 'برای دریافت آخرین اخبار به سایت ورزش سه مراجعه کنید',
-                                'link': 'https://www.varzesh3.com'
-                            }],
-                            'count': 1,
-                            'source': 'ورزش سه'
-                        }
-                except Exception as web_error:
-                    logger.error(f"❌ خطا در web scraping: {web_error}")
-            
+
             return {
                 'success': False,
                 'error': 'خطا در دریافت اخبار',
@@ -423,43 +484,28 @@ class SportsHandler:
 
             if use_cache:
                 try:
-                    if self.db and hasattr(self.db, 'get_weekly_fixtures_cache'):
-                        cached = self.db.get_weekly_fixtures_cache(saturday.date(), friday.date())
-                        if cached and cached.get('payload'):
-                            payload = cached['payload']
-                            leagues = payload.get('leagues', {})
-                            total_matches = payload.get('total_matches', sum(d.get('count', 0) for d in leagues.values()))
-                            period = payload.get('period', f'{date_from} تا {date_to}')
-                            return {
-                                'success': True,
-                                'leagues': leagues,
-                                'total_matches': total_matches,
-                                'period': period,
-                                'source': 'db'
-                            }
+                    cached = await asyncio.to_thread(self.load_weekly_fixtures, saturday.date(), friday.date())
+                    if cached:
+                        return dict(
+                            cached,
+                            success=True,
+                            period=cached.get('period', f'{date_from} تا {date_to}'),
+                            source='db'
+                        )
                 except Exception as e:
                     logger.warning(f"⚠️ خطا در خواندن کش دیتابیس: {e}")
 
-            if not use_cache and self.db and hasattr(self.db, 'upsert_weekly_fixtures_cache'):
-                # اگر درخواست بدون کش باشد، داده تازه شده را پس از دریافت ذخیره می‌کنیم
-                result = await self._fetch_complete_weekly_fixtures(base_date)
-                if result.get('success'):
-                    try:
-                        week_start_dt = result['meta']['week_start']
-                        week_end_dt = result['meta']['week_end']
-                        cache_payload = result['payload']
-                        self.db.upsert_weekly_fixtures_cache(week_start_dt, week_end_dt, cache_payload)
-                    except Exception as ce:
-                        logger.warning(f"⚠️ خطا در ذخیره کش دیتابیس: {ce}")
-                return result['payload'] if result.get('success') else result
+            # درخواست بدون کش متعلق به jobهای زمان‌بندی‌شده است: فقط روزهای قابل تغییر دریافت می‌شوند
+            if not use_cache:
+                return await self.refresh_weekly_fixtures(base_date)
 
             result = await self._fetch_complete_weekly_fixtures(base_date)
-            if result.get('success') and self.db and hasattr(self.db, 'upsert_weekly_fixtures_cache'):
+            if result.get('success'):
                 try:
-                    week_start_dt = result['meta']['week_start']
-                    week_end_dt = result['meta']['week_end']
-                    cache_payload = result['payload']
-                    self.db.upsert_weekly_fixtures_cache(week_start_dt, week_end_dt, cache_payload)
+                    await asyncio.to_thread(
+                        self.save_weekly_fixtures,
+                        result['payload'], result['meta']['week_start'], result['meta']['week_end']
+                    )
                 except Exception as ce:
                     logger.warning(f"⚠️ خطا در ذخیره کش دیتابیس: {ce}")
 
@@ -473,15 +519,18 @@ class SportsHandler:
                 'leagues': {}
             }
     
-    async def _fetch_complete_weekly_fixtures(self, base_date: Optional[datetime] = None) -> Dict[str, Any]:
+    async def _fetch_complete_weekly_fixtures(
+        self,
+        base_date: Optional[datetime] = None,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
         """تابع مادر: دریافت برنامه بازی‌های هفتگی با خروجی کامل برای کش"""
         today = base_date or datetime.now()
         days_since_saturday = (today.weekday() + 2) % 7
         saturday = today - timedelta(days=days_since_saturday)
         friday = saturday + timedelta(days=6)
 
-        current_key = self.get_current_api_key()
-        if not current_key:
+        if not self.football_api.can_serve(priority):
             return {
                 'success': False,
                 'error': 'هیچ کلید API در دسترس نیست',
@@ -497,38 +546,19 @@ class SportsHandler:
                 'info': self.get_rate_limit_message()
             }
 
-        for api_index in range(len(self.api_keys)):
-            if self.api_limits[api_index]['exhausted']:
-                continue
-
-            current_key = self.api_keys[api_index]
-            self.current_api_index = api_index
-            self.football_api_key = current_key
-
-            headers = {
-                'x-rapidapi-key': current_key,
-                'x-rapidapi-host': 'v3.football.api-sports.io'
+        result = await self._fetch_all_fixtures_data(saturday, friday, priority)
+        if result:
+            payload = result
+            payload['source'] = 'api'
+            return {
+                'success': True,
+                'payload': payload,
+                'meta': {
+                    'week_start': saturday.date(),
+                    'week_end': friday.date()
+                }
             }
 
-            logger.info(f"🔄 استفاده از API Key {api_index} برای دریافت داده‌ها")
-
-            try:
-                result = await self._fetch_all_fixtures_data(saturday, friday, headers)
-                if result:
-                    payload = result
-                    payload['source'] = 'api'
-                    return {
-                        'success': True,
-                        'payload': payload,
-                        'meta': {
-                            'week_start': saturday.date(),
-                            'week_end': friday.date()
-                        }
-                    }
-            except Exception as e:
-                logger.warning(f"API Key {api_index} خطا داد: {e}")
-                continue
-
         return {
             'success': False,
             'error': 'تمام کلیدهای API در دسترس نیستند',
@@ -544,8 +574,35 @@ class SportsHandler:
             'info': self.get_rate_limit_message()
         }
 
-    async def _fetch_all_fixtures_data(self, saturday, friday, headers):
-        """دریافت داده‌های فیکسچر با هدر مشخص"""
+    async def _fetch_week_days(
+        self,
+        saturday,
+        friday,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        دریافت همزمان بازی‌های روزهای شنبه تا جمعه
+
+        Returns:
+            تاریخ -> آیتم‌های خام پاسخ API، یا None اگر سهمیه همه کلیدها تمام شد
+        """
+        dates = []
+        current_date = saturday
+        while current_date <= friday:
+            dates.append(current_date.strftime('%Y-%m-%d'))
+            current_date += timedelta(days=1)
+
+        day_matches = await self.football_api.get_fixtures_for_dates(dates, priority)
+        if any(matches is None for matches in day_matches.values()) and not self.football_api.can_serve(priority):
+            return None
+
+        for date_str, matches in day_matches.items():
+            if matches is None:
+                logger.warning(f"خطا در دریافت بازی‌های {date_str}")
+        return {date_str: matches or [] for date_str, matches in day_matches.items()}
+
+    async def _fetch_all_fixtures_data(self, saturday, friday, priority: str = PRIORITY_INTERACTIVE):
+        """دریافت داده‌های فیکسچر هفته برای لیگ‌های مهم"""
         try:
             # لیگ‌های مهم بر اساس ترتیب تعریف‌شده در کلاس
             important_leagues = [
@@ -559,103 +616,24 @@ class SportsHandler:
             ]
 
             # دریافت بازی‌ها برای هر روز
-            all_day_matches = {}
-            current_date = saturday
+            all_day_matches = await self._fetch_week_days(saturday, friday, priority)
+            if all_day_matches is None:
+                return None
+
+            # سازماندهی بازی‌ها به تفکیک لیگ در یک گذر
+            matches_by_league: Dict[int, List[Dict[str, Any]]] = {league_id: [] for _, league_id, _ in important_leagues}
+            for day_matches in all_day_matches.values():
+                for match in day_matches:
+                    league_matches = matches_by_league.get((match.get('league') or {}).get('id'))
+                    if league_matches is not None:
+                        league_matches.append(parse_fixture(match))
 
-            while current_date <= friday:
-                date_str = current_date.strftime('%Y-%m-%d')
-                
-                try:
-                    response = requests.get(
-                        f"{self.football_api_base}/fixtures",
-                        headers=headers,
-                        params={'date': date_str},
-                        timeout=self.timeout
-                    )
-                    
-                    # بررسی پاسخ و محدودیت
-                    if not self.handle_api_response(response):
-                        # اگر به محدودیت خورد، این کلید رو غیرفعال کن و None برگردون
-                        self.api_limits[self.current_api_index]['exhausted'] = True
-                        return None
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        all_day_matches[date_str] = data.get('response', [])
-                    else:
-                        logger.warning(f"خطای API برای {date_str}: {response.status_code}")
-                        all_day_matches[date_str] = []
-                        
-                except Exception as e:
-                    logger.warning(f"خطا در دریافت بازی‌های {date_str}: {e}")
-                    all_day_matches[date_str] = []
-                
-                current_date += timedelta(days=1)
-            
-            # سازماندهی بازی‌ها به تفکیک لیگ
             leagues_data = {}
-            
             for league_key, league_id, league_name in important_leagues:
-                league_matches = []
-                
-                for date_str, day_matches in all_day_matches.items():
-                    for match in day_matches:
-                        if match['league']['id'] == league_id:
-                            fixture = match['fixture']
-                            teams = match['teams']
-                            goals = match.get('goals', {})
-                            score_details = match.get('score', {})
-
-                            # تبدیل به datetime برای روز هفته
-                            fixture_date_raw = fixture.get('date')
-                            match_date = None
-                            if fixture_date_raw:
-                                try:
-                                    match_date = datetime.fromisoformat(fixture_date_raw.replace('Z', '+00:00'))
-                                except ValueError:
-                                    match_date = None
-
-                            # محاسبه نتیجه نهایی بازی
-                            score_home = goals.get('home') if goals else None
-                            score_away = goals.get('away') if goals else None
-
-                            if score_home is None or score_away is None:
-                                for section in ('fulltime', 'extratime', 'penalty', 'halftime'):
-                                    section_data = score_details.get(section, {}) if isinstance(score_details, dict) else {}
-                                    if score_home is None:
-                                        score_home = section_data.get('home', score_home)
-                                    if score_away is None:
-                                        score_away = section_data.get('away', score_away)
-                                    if score_home is not None and score_away is not None:
-                                        break
-
-                            final_score = None
-                            if score_home is not None and score_away is not None:
-                                final_score = {
-                                    'home': score_home,
-                                    'away': score_away
-                                }
-
-                            match_info = {
-                                'fixture_id': fixture.get('id'),
-                                'league_id': match['league'].get('id'),
-                                'league_name': match['league'].get('name'),
-                                'home_team_id': teams['home'].get('id'),
-                                'home_team': teams['home'].get('name'),
-                                'away_team_id': teams['away'].get('id'),
-                                'away_team': teams['away'].get('name'),
-                                'date': fixture_date_raw or (match_date.isoformat() if match_date else None),
-                                'datetime': match_date,
-                                'status': fixture.get('status', {}).get('short') if isinstance(fixture.get('status'), dict) else fixture.get('status'),
-                                'venue': fixture.get('venue', {}).get('name') if isinstance(fixture.get('venue'), dict) else fixture.get('venue', 'نامشخص'),
-                                'score': final_score,
-                                'score_details': score_details
-                            }
-                            league_matches.append(match_info)
-                
+                league_matches = matches_by_league[league_id]
                 if league_matches:
                     # مرتب کردن بر اساس تاریخ
-                    league_matches.sort(key=lambda x: x['datetime'])
+                    league_matches.sort(key=lambda x: x['date'] or '')
                     leagues_data[league_key] = {
                         'name': league_name,
                         'matches': league_matches,
@@ -692,7 +670,7 @@ class SportsHandler:
                     'matches': []
                 }
             
-            if not self.football_api_key:
+            if not self.api_keys:
                 return {
                     'success': False,
                     'error': 'نیاز به کلید API',
@@ -709,58 +687,14 @@ class SportsHandler:
             date_from = saturday.strftime('%Y-%m-%d')
             date_to = friday.strftime('%Y-%m-%d')
             
-            # API-Football فقط با date کار می‌کنه نه from/to
-            # باید هر روز رو جداگونه چک کنیم
-            headers = {
-                'x-rapidapi-key': self.football_api_key,
-                'x-rapidapi-host': 'v3.football.api-sports.io'
-            }
-            
-            all_matches = []
-            
-            # چک کردن هر روز از شنبه تا جمعه
-            current_date = saturday
-            while current_date <= friday:
-                date_str = current_date.strftime('%Y-%m-%d')
-                
-                url = f"{self.football_api_base}/fixtures"
-                params = {'date': date_str}
-                
-                try:
-                    response = requests.get(
-                        url,
-                        params=params,
-                        headers=headers,
-                        timeout=self.timeout
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        day_matches = data.get('response', [])
-                        
-                        # فیلتر برای این لیگ خاص
-                        for match in day_matches:
-                            if match['league']['id'] == league_id:
-                                fixture = match['fixture']
-                                teams = match['teams']
-                                goals = match['goals']
-                                
-                                match_info = {
-                                    'home_team': teams['home']['name'],
-                                    'away_team': teams['away']['name'],
-                                    'date': fixture['date'],
-                                    'status': fixture['status']['short'],
-                                    'venue': fixture['venue']['name'] if fixture.get('venue') else 'نامشخص',
-                                    'score': {
-                                        'home': goals['home'],
-                                        'away': goals['away']
-                                    } if goals['home'] is not None else None
-                                }
-                                all_matches.append(match_info)
-                except Exception as e:
-                    logger.warning(f"خطا در دریافت بازی‌های {date_str}: {e}")
-                
-                current_date += timedelta(days=1)
+            # API-Football فقط با date کار می‌کنه نه from/to؛ روزها همزمان دریافت می‌شوند
+            all_day_matches = await self._fetch_week_days(saturday, friday) or {}
+            all_matches = [
+                parse_fixture(match)
+                for day_matches in all_day_matches.values()
+                for match in day_matches
+                if (match.get('league') or {}).get('id') == league_id
+            ]
             
             matches = all_matches
             
@@ -781,14 +715,99 @@ class SportsHandler:
                 'matches': []
             }
     
+    def parse_live_matches(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """استخراج بازی‌های زنده لیگ‌های مهم از پاسخ /fixtures?live=all"""
+        # فیلتر برای لیگ‌های مهم بر اساس پیکربندی فعلی
+        important_leagues = {
+            self.league_ids.get(key)
+            for key in self.league_order
+            if key in self.league_ids
+        }
+        # حذف مقادیر None احتمالی
+        important_leagues = {lid for lid in important_leagues if lid}
+
+        league_name_fragments = {
+            'laliga', 'la liga', 'premier league', 'bundesliga',
+            'serie a', 'ligue 1', 'champions league',
+            'afc champions league', 'afc champions league 2',
+            'afc champions league elite', 'acl elite',
+            'afc champions league two', 'acl two',
+            'persian gulf', 'iran pro league', 'iran league',
+            'لیگ قهرمانان آسیا', 'لیگ قهرمانان آسیا 2',
+            'لیگ قهرمانان آسیا الیت', 'لیگ قهرمانان آسیا تو',
+            'لیگ برتر ایران', 'جام قهرمانان آسیا', 'جام باشگاه های آسیا'
+        }
+
+        live_matches = []
+        for match in data.get('response', []):
+            fixture = parse_fixture(match)
+            league_name = (fixture['league_name'] or '').lower()
+
+            # فقط لیگ‌های مهم
+            if fixture['league_id'] not in important_leagues and not any(
+                fragment in league_name for fragment in league_name_fragments
+            ):
+                continue
+
+            score = fixture['score'] or {}
+            live_matches.append({
+                'fixture_id': fixture['fixture_id'],
+                'home_team_id': fixture['home_team_id'],
+                'home_team': fixture['home_team'],
+                'away_team_id': fixture['away_team_id'],
+                'away_team': fixture['away_team'],
+                'competition': fixture['league_name'] or fixture['league_round'] or 'نامشخص',
+                'league': fixture['league_name'],
+                'country': fixture['league_country'],
+                'score': {
+                    'home': score.get('home') if score.get('home') is not None else 0,
+                    'away': score.get('away') if score.get('away') is not None else 0
+                },
+                'minute': fixture['minute'],
+                'status': fixture['status']
+            })
+        return live_matches
+
+    @staticmethod
+    def build_live_result(live_matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if live_matches:
+            return {
+                'success': True,
+                'live_matches': live_matches,
+                'count': len(live_matches)
+            }
+        return {
+            'success': True,
+            'live_matches': [],
+            'count': 0,
+            'message': 'در حال حاضر بازی زنده‌ای در جریان نیست'
+        }
+
     async def get_live_matches(self) -> Dict[str, Any]:
         """دریافت بازی‌های زنده (در حال انجام)"""
         try:
             logger.info("🔄 درخواست بازی‌های زنده...")
             
-            # بررسی آیا کلید API در دسترس هست
-            current_key = self.get_current_api_key()
-            if not current_key:
+            # snapshot مشترک poller پس‌زمینه: بدون درخواست API به ازای هر کاربر
+            shared = self.live_poller.get_result()
+            if shared is not None:
+                return shared
+            
+            # نتیجه تازه در کش: بدون مصرف سهمیه
+            cached = self.live_cache
+            if cached and (datetime.now() - cached['fetched_at']).total_seconds() <= self.live_cache_ttl:
+                return cached['result']
+            
+            # بررسی آیا بودجه‌ای برای درخواست کاربر باقی مانده
+            if not self.football_api.can_serve():
+                if cached:
+                    # حالت کم‌سهمیه: آخرین نتیجه ذخیره‌شده
+                    return dict(
+                        cached['result'],
+                        stale=True,
+                        fetched_at=cached['fetched_at'],
+                        info=self.get_rate_limit_message()
+                    )
                 return {
                     'success': False,
                     'error': 'هیچ کلید API در دسترس نیست',
@@ -796,125 +815,24 @@ class SportsHandler:
                     'info': self.get_rate_limit_message()
                 }
             
-            url = f"{self.football_api_base}/fixtures"
-            params = {'live': 'all'}  # همه بازی‌های زنده
-            
-            # تلاش با کلیدهای مختلف در صورت خطا
-            for api_index in range(len(self.api_keys)):
-                if self.api_limits[api_index]['exhausted']:
-                    continue
-                    
-                current_key = self.api_keys[api_index]
-                self.current_api_index = api_index
-                self.football_api_key = current_key
-
-                headers = {
-                    'x-rapidapi-key': current_key,
-                    'x-rapidapi-host': 'v3.football.api-sports.io'
+            # همه بازی‌های زنده (جابجایی کلیدها در کلاینت انجام می‌شود)
+            data = await self.football_api.get('fixtures', {'live': 'all'})
+            if data is None:
+                return {
+                    'success': False,
+                    'error': 'تمام کلیدهای API در دسترس نیستند',
+                    'live_matches': [],
+                    'info': self.get_rate_limit_message()
                 }
-                
-                logger.info(f"🔄 استفاده از API Key {api_index} برای بازی‌های زنده")
-                
-                try:
-                    response = requests.get(
-                        url,
-                        params=params,
-                        headers=headers,
-                        timeout=self.timeout
-                    )
-                    
-                    # بررسی پاسخ و محدودیت
-                    if not self.handle_api_response(response):
-                        # اگر به محدودیت خورد، کلید رو غیرفعال کن و کلید بعدی رو امتحان کن
-                        self.api_limits[api_index]['exhausted'] = True
-                        continue
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        live_matches = []
-                        
-                        # فیلتر برای لیگ‌های مهم بر اساس پیکربندی فعلی
-                        important_leagues = {
-                            self.league_ids.get(key)
-                            for key in self.league_order
-                            if key in self.league_ids
-                        }
-                        # حذف مقادیر None احتمالی
-                        important_leagues = {lid for lid in important_leagues if lid}
-
-                        league_name_fragments = {
-                            'laliga', 'la liga', 'premier league', 'bundesliga',
-                            'serie a', 'ligue 1', 'champions league',
-                            'afc champions league', 'afc champions league 2',
-                            'afc champions league elite', 'acl elite',
-                            'afc champions league two', 'acl two',
-                            'persian gulf', 'iran pro league', 'iran league',
-                            'لیگ قهرمانان آسیا', 'لیگ قهرمانان آسیا 2',
-                            'لیگ قهرمانان آسیا الیت', 'لیگ قهرمانان آسیا تو',
-                            'لیگ برتر ایران', 'جام قهرمانان آسیا', 'جام باشگاه های آسیا'
-                        }
-
-                        for match in data.get('response', []):
-                            league_id = match['league']['id']
-                            league_name = (match['league'].get('name') or '').lower()
-
-                            # فقط لیگ‌های مهم
-                            if league_id not in important_leagues and not any(
-                                fragment in league_name for fragment in league_name_fragments
-                            ):
-                                continue
-
-                            fixture = match['fixture']
-                            teams = match['teams']
-                            goals = match['goals']
-                            league = match['league']
-                            
-                            match_info = {
-                                'home_team': teams['home']['name'],
-                                'away_team': teams['away']['name'],
-                                'competition': league.get('name') or league.get('round') or 'نامشخص',
-                                'league': league['name'],
-                                'country': league['country'],
-                                'score': {
-                                    'home': goals['home'] if goals['home'] is not None else 0,
-                                    'away': goals['away'] if goals['away'] is not None else 0
-                                },
-                                'minute': fixture['status']['elapsed'],
-                                'status': fixture['status']['short']
-                            }
-                            live_matches.append(match_info)
-                        
-                        if live_matches:
-                            logger.info(f"✅ {len(live_matches)} بازی زنده یافت شد")
-                            return {
-                                'success': True,
-                                'live_matches': live_matches,
-                                'count': len(live_matches)
-                            }
-                        else:
-                            logger.info("ℹ️ بازی زنده‌ای یافت نشد")
-                            return {
-                                'success': True,
-                                'live_matches': [],
-                                'count': 0,
-                                'message': 'در حال حاضر بازی زنده‌ای در جریان نیست'
-                            }
-                    
-                    else:
-                        logger.error(f"❌ خطای API: {response.status_code} - {response.text[:200]}")
-                        continue  # امتحان کلید بعدی
-                    
-                except Exception as e:
-                    logger.warning(f"API Key {api_index} خطا داد: {e}")
-                    continue  # امتحان کلید بعدی
             
-            # اگر به اینجا رسیدیم، همه کلیدها خراب بودن
-            return {
-                'success': False,
-                'error': 'تمام کلیدهای API در دسترس نیستند',
-                'live_matches': [],
-                'info': self.get_rate_limit_message()
-            }
+            live_matches = self.parse_live_matches(data)
+            if live_matches:
+                logger.info(f"✅ {len(live_matches)} بازی زنده یافت شد")
+            else:
+                logger.info("ℹ️ بازی زنده‌ای یافت نشد")
+            result = self.build_live_result(live_matches)
+            self.live_cache = {'result': result, 'fetched_at': datetime.now()}
+            return result
         
         except Exception as e:
             logger.error(f"❌ خطا در get_live_matches: {e}")
@@ -1009,6 +927,8 @@ class SportsHandler:
 
         message = f"🔴 **بازی‌های زنده** ({len(live_matches)} بازی)\n"
         message += f"🔗 [پخش زنده فوتبال۳۶۰]({live_portal_link})\n\n"
+        if live_data.get('stale'):
+            message += f"⏳ آخرین داده ذخیره‌شده ({live_data['fetched_at'].strftime('%H:%M')})\n\n"
         
         for match in live_matches:
             message += f"🏆 **{match['competition']}**\n"
@@ -1017,48 +937,280 @@ class SportsHandler:
             message += "\n"
 
         return message
-    def _serialize_weekly_fixtures_for_cache(self, fixtures: Dict[str, Any]) -> Dict[str, Any]:
-        """سریال‌سازی داده‌های فیکسچر برای ذخیره در کش دیتابیس"""
-        leagues_serialized: Dict[str, Any] = {}
+    # -----------------------------
+    # 📌 ذخیره نرمال‌شده بازی‌های هفتگی
+    # -----------------------------
+    @staticmethod
+    def _week_bounds(week_start, week_end) -> Tuple[datetime, datetime]:
+        """بازه UTC روزهای هفته (API بازی‌ها را بر اساس تاریخ UTC برمی‌گرداند)"""
+        start = datetime.combine(week_start, datetime.min.time(), tzinfo=pytz.UTC)
+        end = datetime.combine(week_end + timedelta(days=1), datetime.min.time(), tzinfo=pytz.UTC)
+        return start, end
+
+    def _fixture_row(self, league_key: str, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        kickoff = self._hydrate_match_datetime(match)
+        if not kickoff or not match.get('fixture_id'):
+            return None
+        if kickoff.tzinfo is None:
+            kickoff = pytz.UTC.localize(kickoff)
+        score = match.get('score') or {}
+        return {
+            'fixture_id': match['fixture_id'],
+            'league_key': league_key,
+            'league_id': match.get('league_id'),
+            'league_name': match.get('league_name'),
+            'home_team_id': match.get('home_team_id'),
+            'home_team': match.get('home_team'),
+            'away_team_id': match.get('away_team_id'),
+            'away_team': match.get('away_team'),
+            'kickoff': kickoff,
+            'status': match.get('status'),
+            'venue': match.get('venue'),
+            'score_home': score.get('home'),
+            'score_away': score.get('away'),
+        }
 
-        for key, league in fixtures.get('leagues', {}).items():
-            matches_serialized: List[Dict[str, Any]] = []
+    @staticmethod
+    def _row_to_match(row: Dict[str, Any]) -> Dict[str, Any]:
+        kickoff = row['kickoff']
+        score = None
+        if row.get('score_home') is not None and row.get('score_away') is not None:
+            score = {'home': row['score_home'], 'away': row['score_away']}
+        return {
+            'fixture_id': row['fixture_id'],
+            'league_id': row.get('league_id'),
+            'league_name': row.get('league_name'),
+            'home_team_id': row.get('home_team_id'),
+            'home_team': row.get('home_team'),
+            'away_team_id': row.get('away_team_id'),
+            'away_team': row.get('away_team'),
+            'date': kickoff.isoformat(),
+            'datetime': kickoff,
+            'status': row.get('status'),
+            'venue': row.get('venue'),
+            'score': score
+        }
 
+    def save_weekly_fixtures(self, fixtures: Dict[str, Any], week_start, week_end) -> bool:
+        """
+        ذخیره بازی‌های هفته به صورت سطر به سطر در sports_fixtures
+
+        ردیف sports_weekly_fixtures_cache فقط نشان می‌دهد هفته دریافت شده (بازه و تعداد بازی‌ها)
+        """
+        if not self.db or not hasattr(self.db, 'upsert_sports_fixtures'):
+            return False
+
+        rows = []
+        for league_key, league in (fixtures.get('leagues') or {}).items():
             for match in league.get('matches', []):
-                match_dt = match.get('datetime')
-                if isinstance(match_dt, datetime):
-                    match_dt_iso = match_dt.isoformat()
-                else:
-                    match_dt_iso = match_dt
-
-                matches_serialized.append({
-                    'fixture_id': match.get('fixture_id'),
-                    'league_id': match.get('league_id'),
-                    'league_name': match.get('league_name'),
-                    'home_team_id': match.get('home_team_id'),
-                    'home_team': match.get('home_team'),
-                    'away_team_id': match.get('away_team_id'),
-                    'away_team': match.get('away_team'),
-                    'date': match.get('date'),
-                    'datetime': match_dt_iso,
-                    'status': match.get('status'),
-                    'venue': match.get('venue'),
-                    'score': match.get('score')
-                })
-
-            leagues_serialized[key] = {
-                'name': league.get('name'),
-                'count': league.get('count', len(matches_serialized)),
-                'matches': matches_serialized
+                row = self._fixture_row(league_key, match)
+                if row:
+                    rows.append(row)
+
+        saved = self.db.upsert_sports_fixtures(rows) if rows else 0
+        if rows and not saved:
+            return False
+
+        fetched_at = datetime.now(pytz.UTC).isoformat()
+        self._write_week_marker(week_start, week_end, {
+            'period': fixtures.get('period', ''),
+            'days': {day: fetched_at for day in self._week_days(week_start, week_end)},
+        })
+        logger.info(f"💾 {saved} بازی هفته {week_start} در جدول بازی‌ها ذخیره شد")
+        return True
+
+    @staticmethod
+    def _week_days(week_start, week_end) -> List[str]:
+        days = []
+        current = week_start
+        while current <= week_end:
+            days.append(current.isoformat())
+            current += timedelta(days=1)
+        return days
+
+    def _days_to_refresh(
+        self,
+        week_start,
+        week_end,
+        days_meta: Dict[str, str],
+        rows: List[Dict[str, Any]],
+        now: datetime
+    ) -> List[str]:
+        """
+        روزهایی از هفته که هنوز ممکن است تغییر کنند
+
+        - روزهایی که هنوز دریافت نشده‌اند
+        - امروز و فردا (UTC)
+        - روزهای گذشته که بازی تمام‌نشده (زنده، تعویق‌افتاده یا بدون نتیجه) دارند
+        - روزهای دورتر آینده که آخرین دریافتشان قدیمی شده
+        """
+        open_days = {
+            row['kickoff'].astimezone(pytz.UTC).date().isoformat()
+            for row in rows
+            if row['kickoff'] <= now and (row.get('status') or '') not in FINAL_FIXTURE_STATUSES
+        }
+        today = now.date()
+        near_days = {(today + timedelta(days=offset)).isoformat() for offset in range(NEAR_FIXTURE_DAYS)}
+
+        days = []
+        for day in self._week_days(week_start, week_end):
+            fetched_at = days_meta.get(day)
+            if not fetched_at or day in near_days or day in open_days:
+                days.append(day)
+            elif day > today.isoformat() and now - datetime.fromisoformat(fetched_at) > FUTURE_DAY_MAX_AGE:
+                days.append(day)
+        return days
+
+    @staticmethod
+    def _current_week(base_date: Optional[datetime] = None):
+        """تاریخ شنبه و جمعه هفته جاری"""
+        today = base_date or datetime.now()
+        days_since_saturday = (today.weekday() + 2) % 7
+        week_start = (today - timedelta(days=days_since_saturday)).date()
+        return week_start, week_start + timedelta(days=6)
+
+    async def refresh_weekly_fixtures(self, base_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        بروزرسانی افزایشی بازی‌های هفته: فقط روزهای قابل تغییر دوباره دریافت و در جدول ادغام می‌شوند
+        """
+        week_start, week_end = self._current_week(base_date)
+        period = f'{week_start} تا {week_end}'
+
+        if not self.db or not hasattr(self.db, 'get_sports_fixtures'):
+            result = await self._fetch_complete_weekly_fixtures(base_date, PRIORITY_SCHEDULED)
+            return result['payload'] if result.get('success') else result
+
+        marker = await asyncio.to_thread(self.db.get_weekly_fixtures_cache, week_start, week_end)
+        meta = (marker or {}).get('payload') or {}
+        days_meta: Dict[str, str] = dict(meta.get('days') or {})
+
+        week_range = self._week_bounds(week_start, week_end)
+        rows = await asyncio.to_thread(self.db.get_sports_fixtures, *week_range)
+        now = datetime.now(pytz.UTC)
+        days = self._days_to_refresh(week_start, week_end, days_meta, rows, now)
+
+        if days and not self.football_api.can_serve(PRIORITY_SCHEDULED):
+            return {
+                'success': False,
+                'error': 'هیچ کلید API در دسترس نیست',
+                'leagues': {},
+                'info': self.get_rate_limit_message()
             }
 
+        day_matches = await self.football_api.get_fixtures_for_dates(days, PRIORITY_SCHEDULED) if days else {}
+        if days and all(matches is None for matches in day_matches.values()):
+            return {
+                'success': False,
+                'error': 'تمام کلیدهای API در دسترس نیستند',
+                'leagues': {},
+                'info': self.get_rate_limit_message()
+            }
+
+        league_keys = {self.league_ids[key]: key for key in self.league_order if key in self.league_ids}
+        fetched_at = now.isoformat()
+        refreshed = 0
+        for day, matches in day_matches.items():
+            if matches is None:
+                logger.warning(f"خطا در دریافت بازی‌های {day}")
+                continue
+
+            day_rows = []
+            for match in matches:
+                league_key = league_keys.get((match.get('league') or {}).get('id'))
+                if league_key:
+                    row = self._fixture_row(league_key, parse_fixture(match))
+                    if row:
+                        day_rows.append(row)
+
+            day_start = datetime.combine(datetime.fromisoformat(day).date(), datetime.min.time(), tzinfo=pytz.UTC)
+            await asyncio.to_thread(self.db.upsert_sports_fixtures, day_rows)
+            await asyncio.to_thread(
+                self.db.delete_missing_sports_fixtures,
+                day_start, day_start + timedelta(days=1), [row['fixture_id'] for row in day_rows]
+            )
+            days_meta[day] = fetched_at
+            refreshed += 1
+
+        payload = await asyncio.to_thread(self._write_week_marker, week_start, week_end, {
+            'period': period,
+            'days': days_meta,
+        })
+        logger.info(f"🔁 بروزرسانی افزایشی بازی‌های هفته: {refreshed} روز از 7 روز دوباره دریافت شد")
+
+        return dict(payload, source='api', refreshed_days=refreshed)
+
+    def load_weekly_fixtures(self, week_start, week_end) -> Optional[Dict[str, Any]]:
+        """ساخت برنامه هفتگی از سطرهای sports_fixtures؛ None اگر هفته هنوز دریافت نشده"""
+        if not self.db or not hasattr(self.db, 'get_sports_fixtures'):
+            return None
+
+        marker = self.db.get_weekly_fixtures_cache(week_start, week_end)
+        if not marker or marker.get('payload') is None:
+            return None
+        meta = marker['payload']
+        # ردیف‌های قدیمی که کل هفته را به صورت JSON نگه می‌داشتند
+        if meta.get('leagues'):
+            return meta
+
+        return self._assemble_week(week_start, week_end, meta.get('period'))
+
+    def _assemble_week(self, week_start, week_end, period: Optional[str] = None) -> Dict[str, Any]:
+        """ساخت ساختار برنامه هفتگی از سطرهای sports_fixtures (مرتب به ترتیب لیگ‌ها و زمان)"""
+        start, end = self._week_bounds(week_start, week_end)
+        rows = self.db.get_sports_fixtures(start, end)
+
+        matches_by_league: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            matches_by_league.setdefault(row['league_key'], []).append(self._row_to_match(row))
+
+        ordered_keys = [key for key in self.league_order if key in matches_by_league]
+        ordered_keys += [key for key in matches_by_league if key not in ordered_keys]
+        leagues = {
+            key: {
+                'name': self.league_display_names.get(key, key),
+                'matches': matches_by_league[key],
+                'count': len(matches_by_league[key])
+            }
+            for key in ordered_keys
+        }
         return {
-            'success': fixtures.get('success', False),
-            'total_matches': fixtures.get('total_matches', 0),
-            'period': fixtures.get('period', ''),
-            'leagues': leagues_serialized
+            'success': True,
+            'leagues': leagues,
+            'total_matches': len(rows),
+            'period': period or f'{week_start} تا {week_end}',
         }
 
+    def _write_week_marker(self, week_start, week_end, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ثبت ردیف هفته به همراه پیام‌های از پیش ساخته‌شده برنامه بازی‌ها
+
+        Returns:
+            برنامه هفتگی ساخته‌شده از جدول بازی‌ها
+        """
+        payload = self._assemble_week(week_start, week_end, meta.get('period'))
+        version = int(datetime.now().timestamp())
+        views = self.render_fixtures_pages(payload)
+        meta = dict(meta, total_matches=payload['total_matches'], rendered={'version': version, 'views': views})
+        self.db.upsert_weekly_fixtures_cache(week_start, week_end, meta)
+        self._fixtures_pages = {'week_start': week_start.isoformat(), 'version': version, 'views': views}
+        return payload
+
+    def get_team_fixtures(self, team_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+        """بازی‌های پیش‌روی یک تیم از جدول بازی‌ها"""
+        if not self.db or not hasattr(self.db, 'get_team_fixtures'):
+            return []
+        rows = self.db.get_team_fixtures(team_id, datetime.now(pytz.UTC), limit)
+        return [dict(self._row_to_match(row), league_key=row.get('league_key')) for row in rows]
+
+    def purge_old_fixtures(self, current_week_start) -> None:
+        """حذف هفته‌ها و بازی‌های پیش از هفته جاری"""
+        if not self.db:
+            return
+        if hasattr(self.db, 'purge_old_weekly_fixtures_cache'):
+            self.db.purge_old_weekly_fixtures_cache(current_week_start)
+        if hasattr(self.db, 'purge_old_sports_fixtures'):
+            self.db.purge_old_sports_fixtures(self._week_bounds(current_week_start, current_week_start)[0])
+
     def _hydrate_match_datetime(self, fixture):
         """تبدیل تاریخ بازی به شیء datetime با پشتیبانی از کلیدهای مختلف"""
         raw_dt = (
@@ -1090,113 +1242,157 @@ class SportsHandler:
         logger.warning(f"⚠️ فرمت تاریخ پشتیبانی‌نشده برای فیکسچر: {type(raw_dt)}")
         return None
 
-    def format_all_fixtures_message(self, all_fixtures_data: Dict[str, Any]) -> str:
-        """فرمت کردن پیام برنامه بازی‌های همه لیگ‌ها"""
-        if not all_fixtures_data.get('success'):
-            error = all_fixtures_data.get('error', 'خطای ناشناخته')
-            message = f"❌ خطا در دریافت برنامه بازی‌ها:\n{error}"
-            if all_fixtures_data.get('info'):
-                message += f"\n\n💡 {all_fixtures_data['info']}"
-            return message
-        
+    def _format_fixture_entry(self, match: Dict[str, Any]) -> str:
+        """متن یک بازی در برنامه هفتگی"""
+        match_dt = self._hydrate_match_datetime(match)
+        if match_dt and match_dt.tzinfo is None:
+            match_dt = pytz.UTC.localize(match_dt)
+
+        if match_dt:
+            match_dt = match_dt.astimezone(pytz.timezone('Asia/Tehran'))
+            weekday = WEEKDAY_FA.get(match_dt.weekday(), 'نامشخص')
+            date_str = match_dt.strftime('%m/%d')
+            time_str = match_dt.strftime('%H:%M')
+        else:
+            weekday = 'نامشخص'
+            date_str = match.get('date', 'نامشخص')
+            time_str = match.get('time', 'نامشخص')
+
+        status_code = (match.get('status') or '').upper()
+        finished_statuses = {'FT', 'AET', 'PEN'}
+        live_statuses = {'1H', '2H', 'ET', 'BT', 'HT', 'LIVE'}
+        postponed_statuses = {'PST', 'CANC', 'ABD', 'SUSP', 'INT', 'AWD', 'WO'}
+
+        is_finished = status_code in finished_statuses
+        is_live = status_code in live_statuses
+        is_postponed = status_code in postponed_statuses
+
+        score = match.get('score')
+        has_score = score and all(v is not None for v in score.values())
+
+        if is_postponed:
+            prefix = '⚠️'
+        elif is_finished:
+            prefix = '🔴'
+        elif is_live:
+            prefix = '🟢'
+        else:
+            prefix = '⚪'
+
+        if has_score:
+            entry = f"{prefix} {match['home_team']} {score['home']}-{score['away']} {match['away_team']}\n"
+        else:
+            entry = f"{prefix} {match['home_team']} vs {match['away_team']}\n"
+
+        if is_finished:
+            status_info = '🔴 تمام شده'
+        elif is_live:
+            status_info = '🟢 در جریان'
+        elif is_postponed:
+            status_info = '⚠️ لغو/تعویق'
+        else:
+            status_info = f"⏰ {time_str}"
+
+        entry += f"   📅 {weekday} {date_str} - {status_info}\n\n"
+        return entry
+
+    @staticmethod
+    def _paginate(blocks: List[str], header: str, footer: str, limit: int = FIXTURES_PAGE_LIMIT) -> List[str]:
+        """تقسیم بلوک‌ها به صفحه‌هایی زیر سقف طول پیام تلگرام (هیچ بلوکی شکسته نمی‌شود)"""
+        pages: List[str] = []
+        current = header
+        for block in blocks:
+            if len(current) + len(block) > limit and current != header:
+                pages.append(current.rstrip())
+                current = header
+            current += block
+        if len(current) + len(footer) > limit and current != header:
+            pages.append(current.rstrip())
+            current = header
+        pages.append((current + footer).rstrip())
+        return pages
+
+    def render_fixtures_pages(self, all_fixtures_data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        ساخت صفحه‌های آماده ارسال برنامه هفتگی
+
+        Returns:
+            'all' برای نمای همه لیگ‌ها و کلید هر لیگ برای نمای همان لیگ -> فهرست صفحه‌ها
+        """
         leagues_data = all_fixtures_data.get('leagues', {})
         if not leagues_data:
-            return "❌ هیچ بازی‌ای در این هفته یافت نشد"
-        
-        # نقشه روزهای هفته به فارسی
-        weekday_fa = {
-            0: 'دوشنبه',
-            1: 'سه‌شنبه',
-            2: 'چهارشنبه',
-            3: 'پنج‌شنبه',
-            4: 'جمعه',
-            5: 'شنبه',
-            6: 'یک‌شنبه'
-        }
-        
-        message = f"⚽ **برنامه بازی‌های هفتگی**\n"
-        message += f"📅 {all_fixtures_data.get('period', '')}\n"
-        message += f"🎯 جمع: {all_fixtures_data.get('total_matches', 0)} بازی\n"
-        message += "\n" + "=" * 40 + "\n\n"
-        
-        # نمایش لیگ‌ها به ترتیب پیکربندی‌شده و سپس سایر لیگ‌های موجود
-        ordered_keys: List[str] = []
-        for key in self.league_order:
-            if key in leagues_data and key not in ordered_keys:
-                ordered_keys.append(key)
+            return {'all': ["❌ هیچ بازی‌ای در این هفته یافت نشد"]}
 
-        for key in leagues_data.keys():
-            if key not in ordered_keys:
-                ordered_keys.append(key)
+        period = all_fixtures_data.get('period', '')
+        total = all_fixtures_data.get('total_matches', 0)
+        separator = "=" * 40 + "\n\n"
+        updated_at = datetime.now(pytz.timezone('Asia/Tehran')).strftime('%H:%M %m/%d')
+        footer = f"📊 منبع: API-Football\n🕒 بروزرسانی: {updated_at}"
 
-        tehran_tz = pytz.timezone('Asia/Tehran')
+        # نمایش لیگ‌ها به ترتیب پیکربندی‌شده و سپس سایر لیگ‌های موجود
+        ordered_keys: List[str] = [key for key in self.league_order if key in leagues_data]
+        ordered_keys += [key for key in leagues_data if key not in ordered_keys]
 
+        views: Dict[str, List[str]] = {}
+        all_blocks: List[str] = []
         for league_key in ordered_keys:
-            league_info = leagues_data.get(league_key)
-            if not league_info:
-                continue
+            league_info = leagues_data[league_key]
+            entries = [self._format_fixture_entry(match) for match in league_info.get('matches', [])]
+            league_title = f"{league_info['name']}\n🎯 {league_info['count']} بازی\n\n"
+
+            all_blocks.append(league_title)
+            all_blocks.extend(entries)
+            all_blocks.append(separator)
+
+            league_header = f"⚽ **برنامه بازی‌های هفتگی**\n📅 {period}\n\n{league_title}"
+            views[league_key] = self._paginate(entries, league_header, separator + footer)
+
+        header = (
+            f"⚽ **برنامه بازی‌های هفتگی**\n"
+            f"📅 {period}\n"
+            f"🎯 جمع: {total} بازی\n"
+            "\n" + separator
+        )
+        views['all'] = self._paginate(all_blocks, header, footer)
+        return views
 
-            message += f"{league_info['name']}\n"
-            message += f"🎯 {league_info['count']} بازی\n\n"
+    def format_all_fixtures_message(self, all_fixtures_data: Dict[str, Any]) -> str:
+        """فرمت کردن پیام برنامه بازی‌های همه لیگ‌ها (صفحه اول، یا پیام خطا)"""
+        if not all_fixtures_data.get('success'):
+            error = all_fixtures_data.get('error', 'خطای ناشناخته')
+            message = f"❌ خطا در دریافت برنامه بازی‌ها:\n{error}"
+            if all_fixtures_data.get('info'):
+                message += f"\n\n💡 {all_fixtures_data['info']}"
+            return message
 
-            for match in league_info.get('matches', []):
-                match_dt = self._hydrate_match_datetime(match)
-                if match_dt and match_dt.tzinfo is None:
-                    match_dt = pytz.UTC.localize(match_dt)
+        return self.render_fixtures_pages(all_fixtures_data)['all'][0]
 
-                if match_dt:
-                    match_dt = match_dt.astimezone(tehran_tz)
-                    weekday = weekday_fa.get(match_dt.weekday(), 'نامشخص')
-                    date_str = match_dt.strftime('%m/%d')
-                    time_str = match_dt.strftime('%H:%M')
-                else:
-                    weekday = 'نامشخص'
-                    date_str = match.get('date', 'نامشخص')
-                    time_str = match.get('time', 'نامشخص')
-
-                status_code = (match.get('status') or '').upper()
-                finished_statuses = {'FT', 'AET', 'PEN'}
-                live_statuses = {'1H', '2H', 'ET', 'BT', 'HT', 'LIVE'}
-                postponed_statuses = {'PST', 'CANC', 'ABD', 'SUSP', 'INT', 'AWD', 'WO'}
-
-                is_finished = status_code in finished_statuses
-                is_live = status_code in live_statuses
-                is_postponed = status_code in postponed_statuses
-
-                score = match.get('score')
-                has_score = score and all(v is not None for v in score.values())
-
-                if is_postponed:
-                    prefix = '⚠️'
-                elif is_finished:
-                    prefix = '🔴'
-                elif is_live:
-                    prefix = '🟢'
-                else:
-                    prefix = '⚪'
+    async def get_fixtures_pages(self) -> Optional[Dict[str, Any]]:
+        """
+        صفحه‌های از پیش ساخته‌شده برنامه هفته جاری (حافظه، سپس دیتابیس)
 
-                if has_score:
-                    message += f"{prefix} {match['home_team']} {score['home']}-{score['away']} {match['away_team']}\n"
-                else:
-                    message += f"{prefix} {match['home_team']} vs {match['away_team']}\n"
-
-                if is_finished:
-                    status_info = '🔴 تمام شده'
-                elif is_live:
-                    status_info = '🟢 در جریان'
-                elif is_postponed:
-                    status_info = '⚠️ لغو/تعویق'
-                else:
-                    status_info = f"⏰ {time_str}"
+        Returns:
+            {'version', 'views'} یا None اگر برنامه این هفته هنوز دریافت نشده
+        """
+        week_start, week_end = self._current_week()
+        cached = self._fixtures_pages
+        if cached and cached['week_start'] == week_start.isoformat():
+            return cached
 
-                message += f"   📅 {weekday} {date_str} - {status_info}\n"
+        if not self.db or not hasattr(self.db, 'get_weekly_fixtures_cache'):
+            return None
+        marker = await asyncio.to_thread(self.db.get_weekly_fixtures_cache, week_start, week_end)
+        meta = (marker or {}).get('payload')
+        if not meta:
+            return None
 
-                message += "\n"
+        rendered = meta.get('rendered')
+        if not rendered:
+            # ردیف‌های قدیمی بدون صفحه‌های آماده: یک بار ساخته و در حافظه نگه داشته می‌شود
+            payload = await asyncio.to_thread(self.load_weekly_fixtures, week_start, week_end)
+            if not payload:
+                return None
+            rendered = {'version': 0, 'views': self.render_fixtures_pages(payload)}
 
-            message += "=" * 40 + "\n\n"
-        
-        source = all_fixtures_data.get('source', 'api')
-        source_text = "از دیتابیس" if source == 'db' else "از API"
-        message += "📊 منبع: API-Football\n"
-        message += f"🗂️ داده: {source_text}"
-        return message
+        self._fixtures_pages = {'week_start': week_start.isoformat(), **rendered}
+        return self._fixtures_pages
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+فهرست نام تیم‌های هر لیگ برای انتخاب تیم محبوب با پیام متنی
+- نام‌ها یک بار نرمال‌سازی می‌شوند (ی/ک عربی، نیم‌فاصله، اعراب و حروف لاتین تکیه‌دار)
+- نام اصلی، نام‌های مستعار فارسی/انگلیسی و نام بدون پسوندهایی مثل FC به یک دیکشنری نگاشت می‌شوند
+- پیشنهادها از شاخص n-gram از پیش ساخته‌شده به دست می‌آیند، نه مقایسه با کل فهرست
+"""
+
+import logging
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+# حداقل امتیاز Dice برای پیشنهاد یک تیم
+SUGGESTION_CUTOFF = 0.35
+
+_CHAR_MAP = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ئ': 'ی',
+    'ك': 'ک',
+    'ة': 'ه', 'ۀ': 'ه',
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و',
+    '\u200c': ' ', '\u200d': '', '\u200f': '', '\u200e': '', '\u0640': '',
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+})
+
+# پیشوندها و پسوندهای رایج نام باشگاه‌ها که کاربر معمولاً تایپ نمی‌کند
+_CLUB_AFFIXES = frozenset({'fc', 'cf', 'ac', 'sc', 'afc', 'ssc', 'club', 'fk', 'sk', 'as', 'calcio', 'باشگاه'})
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+# نام‌های مستعار رایج (کلید: نام API که بدون فاصله مقایسه می‌شود)
+TEAM_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'persepolis': ('پرسپولیس', 'پرسپولیس تهران', 'perspolis'),
+    'esteghlal': ('استقلال', 'استقلال تهران'),
+    'sepahan': ('سپاهان', 'سپاهان اصفهان'),
+    'tractor': ('تراکتور', 'تراکتور سازی', 'تراکتورسازی', 'tractor sazi'),
+    'foolad': ('فولاد', 'فولاد خوزستان'),
+    'golgohar': ('گل گهر', 'گل‌گهر سیرجان'),
+    'zobahan': ('ذوب آهن', 'ذوب‌آهن'),
+    'malavan': ('ملوان',),
+    'aluminium arak': ('آلومینیوم', 'آلومینیوم اراک'),
+    'chadormalou': ('چادرملو',),
+    'esteghlal khuzestan': ('استقلال خوزستان',),
+    'mes rafsanjan': ('مس رفسنجان',),
+    'havadar': ('هوادار',),
+    'shams azar': ('شمس آذر',),
+    'kheybar': ('خیبر', 'خیبر خرم آباد'),
+    'nassaji': ('نساجی', 'نساجی مازندران'),
+    'real madrid': ('رئال', 'رئال مادرید', 'ریال مادرید', 'real'),
+    'barcelona': ('بارسلونا', 'بارسا', 'barca'),
+    'atletico madrid': ('اتلتیکو', 'اتلتیکو مادرید', 'atletico'),
+    'sevilla': ('سویا',),
+    'valencia': ('والنسیا',),
+    'villarreal': ('ویارئال',),
+    'real sociedad': ('رئال سوسیداد',),
+    'athletic club': ('اتلتیک بیلبائو', 'athletic bilbao', 'bilbao'),
+    'real betis': ('بتیس', 'رئال بتیس'),
+    'manchester united': ('منچستر یونایتد', 'یونایتد', 'man united', 'man utd'),
+    'manchester city': ('منچستر سیتی', 'سیتی', 'man city'),
+    'liverpool': ('لیورپول',),
+    'arsenal': ('آرسنال',),
+    'chelsea': ('چلسی',),
+    'tottenham': ('تاتنهام', 'spurs'),
+    'newcastle': ('نیوکاسل',),
+    'aston villa': ('استون ویلا',),
+    'everton': ('اورتون',),
+    'west ham': ('وستهام',),
+    'bayern munchen': ('بایرن', 'بایرن مونیخ', 'bayern', 'bayern munich'),
+    'borussia dortmund': ('دورتموند', 'بوروسیا دورتموند', 'dortmund', 'bvb'),
+    'bayer leverkusen': ('لورکوزن', 'بایر لورکوزن', 'leverkusen'),
+    'rb leipzig': ('لایپزیگ', 'leipzig'),
+    'juventus': ('یوونتوس', 'یووه', 'juve'),
+    'inter': ('اینتر', 'اینتر میلان', 'inter milan'),
+    'milan': ('میلان', 'آث میلان', 'ac milan'),
+    'napoli': ('ناپولی',),
+    'as roma': ('رم', 'آ اس رم', 'roma'),
+    'lazio': ('لاتزیو',),
+    'atalanta': ('آتالانتا',),
+    'paris saint germain': ('پاری سن ژرمن', 'پی اس جی', 'psg', 'paris'),
+    'marseille': ('مارسی',),
+    'lyon': ('لیون',),
+    'monaco': ('موناکو',),
+    'al hilal saudi fc': ('الهلال', 'al hilal'),
+    'al nassr': ('النصر',),
+    'al ittihad': ('الاتحاد',),
+    'al ahli jeddah': ('الاهلی', 'al ahli'),
+}
+
+
+def normalize_team_name(text: str) -> str:
+    """
+    نرمال‌سازی نام تیم برای مقایسه
+
+    یکسان‌سازی حروف عربی/فارسی و ارقام، حذف اعراب و تکیه حروف لاتین،
+    تبدیل نیم‌فاصله و علائم به فاصله و حروف کوچک
+    """
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text.translate(_CHAR_MAP))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = _NON_WORD.sub(' ', text.replace('_', ' ').lower())
+    return ' '.join(text.split())
+
+
+def _compact(normalized: str) -> str:
+    return normalized.replace(' ', '')
+
+
+_ALIAS_INDEX: Dict[str, Tuple[str, ...]] = {}
+
+
+def _alias_index() -> Dict[str, Tuple[str, ...]]:
+    if not _ALIAS_INDEX:
+        for name, aliases in TEAM_ALIASES.items():
+            _ALIAS_INDEX[_compact(normalize_team_name(name))] = aliases
+    return _ALIAS_INDEX
+
+
+def _strip_affixes(normalized: str) -> str:
+    words = [word for word in normalized.split() if word not in _CLUB_AFFIXES]
+    return ' '.join(words)
+
+
+def _ngrams(compact: str, size: int = NGRAM_SIZE) -> Set[str]:
+    padded = f" {compact} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+class TeamIndex:
+    """شاخص جستجوی تیم‌های یک لیگ"""
+
+    def __init__(self, teams: Iterable[Dict[str, Any]]):
+        self.teams: List[Dict[str, Any]] = list(teams)
+        self.signature: Tuple[Any, ...] = self.signature_of(self.teams)
+        # کلید فشرده (بدون فاصله) → اندیس تیم
+        self._exact: Dict[str, int] = {}
+        # n-gram → اندیس کلیدهای دارای آن
+        self._grams: Dict[str, List[int]] = {}
+        # برای هر کلید: (اندیس تیم، تعداد n-gram)
+        self._keys: List[Tuple[int, int]] = []
+
+        for position, team in enumerate(self.teams):
+            for key in self._team_keys(team.get('team_name') or ''):
+                self._add_key(key, position)
+
+    @staticmethod
+    def signature_of(teams: Iterable[Dict[str, Any]]) -> Tuple[Any, ...]:
+        return tuple(team.get('team_id') for team in teams)
+
+    @staticmethod
+    def _team_keys(name: str) -> Set[str]:
+        normalized = normalize_team_name(name)
+        stripped = _strip_affixes(normalized)
+        keys = {_compact(normalized), _compact(stripped)}
+        aliases = _alias_index()
+        for source in set(keys):
+            for alias in aliases.get(source, ()):
+                keys.add(_compact(normalize_team_name(alias)))
+        keys.discard('')
+        return keys
+
+    def _add_key(self, key: str, position: int) -> None:
+        # در تداخل نام مستعار، اولین تیم نگه داشته می‌شود
+        self._exact.setdefault(key, position)
+        key_id = len(self._keys)
+        grams = _ngrams(key)
+        self._keys.append((position, len(grams)))
+        for gram in grams:
+            self._grams.setdefault(gram, []).append(key_id)
+
+    def find(self, text: str) -> Optional[Dict[str, Any]]:
+        """تیم متناظر با ورودی کاربر (نام کامل، بدون پسوند یا نام مستعار)"""
+        normalized = normalize_team_name(text)
+        for key in (_compact(normalized), _compact(_strip_affixes(normalized))):
+            position = self._exact.get(key)
+            if position is not None:
+                return self.teams[position]
+        return None
+
+    def suggest(self, text: str, limit: int = 3, cutoff: float = SUGGESTION_CUTOFF) -> List[str]:
+        """نزدیک‌ترین نام تیم‌ها بر اساس ضریب Dice مجموعه n-gram ها"""
+        query = _compact(normalize_team_name(text))
+        if not query:
+            return []
+
+        query_grams = _ngrams(query)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(self._grams.get(gram, ()))
+
+        best: Dict[int, float] = {}
+        for key_id, count in shared.items():
+            position, total = self._keys[key_id]
+            score = 2 * count / (len(query_grams) + total)
+            if score >= cutoff and score > best.get(position, 0):
+                best[position] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [self.teams[position]['team_name'] for position, _ in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return len(self.teams)
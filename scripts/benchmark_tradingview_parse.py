@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+مقایسه زمان پارس صفحه ایده‌های TradingView: پارسر قبلی BeautifulSoup در برابر parse_idea_cards (lxml)
+
+استفاده (از ریشه پروژه):
+    python scripts/benchmark_tradingview_parse.py [page.html ...]
+
+بدون آرگومان، fixture مصنوعی scripts/fixtures/tradingview_ideas_synthetic.html سنجیده می‌شود.
+این fixture صفحه ذخیره‌شده واقعی TradingView نیست: HTML قالبی تولیدشده است که نام کلاس‌هایش
+با آنچه پارسرها جستجو می‌کنند منطبق است. فقط برای مقایسه زمان پارس روی صفحه‌ای با اندازه واقعی
+مناسب است و یکسان بودن خروجی دو پارسر روی آن، هم‌ارزی آن‌ها روی صفحات واقعی را نشان نمی‌دهد؛
+برای آن، صفحه‌های ذخیره‌شده واقعی را به‌عنوان آرگومان بدهید.
+
+LegacyIdeaParser کپی بدون تغییر مسیر قبلی parse_community_candidates و توابع کمکی آن است
+تا مقایسه زمان روی همان کدی انجام شود که جایگزین شده است.
+"""
+
+import datetime
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from handlers.ai.tradingview_analysis import parse_idea_cards  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(ROOT, 'scripts', 'fixtures', 'tradingview_ideas_synthetic.html')
+COMPARED_FIELDS = ('title', 'analysis_url', 'image_url', 'author', 'description')
+
+
+class LegacyIdeaParser:
+    """پارسر قبلی (درخت کامل html.parser و جستجوی جداگانه برای هر لینک)"""
+
+    def parse_community_candidates(self, content: str, symbol: str, sort_type: str = "popular") -> List[Dict[str, Any]]:
+        """پارس کردن محتوای کامیونیتی TradingView و بازگرداندن همه ایده‌ها (مرتب‌شده)"""
+        try:
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            # جمع‌آوری همه ایده‌های مرتبط
+            candidate_ideas = []
+            idea_links = soup.find_all('a', href=True)
+            processed_urls = set()  # برای جلوگیری از تکرار در همین صفحه
+            
+            for link in idea_links:
+                href = link.get('href', '')
+                # بررسی برای لینک‌های ایده اصلی TradingView
+                # لینک‌های تحلیل معمولاً شامل /chart/ و شناسه تحلیل هستند
+                if ('/chart/' in href and 
+                    '/' in href.split('/chart/')[-1] and 
+                    any(char.isalnum() for char in href) and 
+                    len(href.split('/chart/')[-1]) > 10 and
+                    '-' in href.split('/chart/')[-1] and
+                    '#chart-view-comment-form' not in href):  # حذف لینک‌های کامنت
+                    
+                    # تشکیل URL کامل برای ایده (بدون fragment)
+                    clean_href = href.split('#')[0]  # حذف قسمت # و بعدش
+                    analysis_url = clean_href if clean_href.startswith('http') else f"https://www.tradingview.com{clean_href}"
+                    
+                    # چک کردن اینکه این URL قبلاً در همین صفحه پردازش شده یا نه
+                    if analysis_url in processed_urls:
+                        continue
+                    processed_urls.add(analysis_url)
+                    
+                    # استخراج title از متن لینک یا از عنصر والد
+                    title = link.get_text(strip=True) or link.get('title', '')
+                    
+                    # اگر title خیلی کوتاه بود، از عنصر والد بگیر
+                    if not title or len(title) < 5:
+                        parent = link.parent
+                        if parent:
+                            title = parent.get_text(strip=True)[:100]
+                    
+                    # حذف title های بی‌معنی
+                    if (title and len(title) > 5 and 
+                        not title.lower() in ['comment', 'view', 'chart', 'ideas'] and
+                        not title.isdigit()):
+                        
+                        # جستجو برای عکس در نزدیکی لینک
+                        image_url = self.find_related_image(soup, link)
+                        
+                        # استخراج توضیحات بهبود یافته
+                        description = self.extract_description_from_soup(soup, link)
+                        
+                        # استخراج نام نویسنده
+                        author = self.extract_author_from_soup(soup, link)
+                        
+                        # استخراج زمان انتشار (اگر موجود باشد)
+                        publish_time = self.extract_publish_time(soup, link)
+                        
+                        idea_data = {
+                            'title': title,
+                            'description': description,
+                            'analysis_url': analysis_url,
+                            'image_url': image_url,
+                            'author': author,
+                            'publish_time': publish_time,
+                            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M'),
+                            'sort_type': sort_type
+                        }
+                        
+                        candidate_ideas.append(idea_data)
+            
+            # مرتب‌سازی بر اساس زمان انتشار (جدیدترین اول)
+            # ایده‌هایی که زمان انتشار دارند اولویت بالاتری دارند
+            candidate_ideas.sort(key=lambda x: (
+                x['publish_time'] is not None,  # ایده‌های با زمان اول
+                x['publish_time'] if x['publish_time'] else datetime.datetime.min,
+                len(x['description'])  # توضیحات بلندتر اولویت بیشتر
+            ), reverse=True)
+            
+            return candidate_ideas
+            
+        except Exception as e:
+            print(f"خطا در parse_community_content: {e}")
+            return []
+    
+    def find_related_image(self, soup: BeautifulSoup, link_element) -> Optional[str]:
+        """پیدا کردن عکس مرتبط با لینک تحلیل با کیفیت بهبود یافته"""
+        try:
+            # جستجو در نزدیکی لینک
+            parent = link_element.parent
+            if parent:
+                imgs = parent.find_all('img', src=True)
+                for img in imgs:
+                    src = img['src']
+                    if 'tradingview.com' in src and '_mid.png' in src:
+                        # تبدیل به کیفیت اصلی (حذف _mid و استفاده از .png)
+                        high_quality_src = src.replace('_mid.png', '.png')
+                        return high_quality_src
+            
+            # جستجو کلی در صفحه
+            all_imgs = soup.find_all('img', src=True)
+            for img in all_imgs:
+                src = img['src']
+                if 'tradingview.com' in src and '_mid.png' in src:
+                    # تبدیل به کیفیت اصلی (حذف _mid و استفاده از .png)
+                    high_quality_src = src.replace('_mid.png', '.png')
+                    return high_quality_src
+            
+            return None
+        except:
+            return None
+    
+    def extract_description_from_soup(self, soup: BeautifulSoup, link_element) -> str:
+        """استخراج توضیحات بهبود یافته از soup"""
+        try:
+            # جستجو در عناصر مختلف برای پیدا کردن توضیحات
+            parent = link_element.parent
+            description_candidates = []
+            
+            if parent:
+                # جستجو در عناصر مجاور
+                for sibling in parent.find_next_siblings()[:5]:
+                    text = sibling.get_text(strip=True)
+                    if len(text) > 30 and len(text) < 500:
+                        description_candidates.append(text)
+                
+                # جستجو در عناصر فرزند
+                for child in parent.find_all(['p', 'div', 'span'])[:10]:
+                    text = child.get_text(strip=True)
+                    if len(text) > 30 and len(text) < 500:
+                        description_candidates.append(text)
+            
+            # جستجو کلی در صفحه برای div هایی که ممکن است شامل توضیحات باشند
+            for div in soup.find_all('div', class_=True)[:20]:
+                class_names = ' '.join(div.get('class', []))
+                if any(keyword in class_names.lower() for keyword in ['content', 'description', 'text', 'body']):
+                    text = div.get_text(strip=True)
+                    if len(text) > 50 and len(text) < 800:
+                        description_candidates.append(text)
+            
+            # انتخاب بهترین توضیحات
+            if description_candidates:
+                # مرتب‌سازی بر اساس طول (ترجیح متن با طول متوسط)
+                description_candidates.sort(key=lambda x: abs(len(x) - 200))
+                best_desc = description_candidates[0]
+                return best_desc[:400] + "..." if len(best_desc) > 400 else best_desc
+            
+            return "📊 تحلیل جدید کامیونیتی TradingView - جزئیات بیشتر با کلیک روی لینک"
+        except Exception as e:
+            print(f"خطا در extract_description: {e}")
+            return "📊 تحلیل جدید کامیونیتی TradingView"
+    
+    def extract_author_from_soup(self, soup: BeautifulSoup, link_element) -> str:
+        """استخراج نام نویسنده تحلیل"""
+        try:
+            # جستجو در نزدیکی لینک برای نام کاربری
+            parent = link_element.parent
+            if parent:
+                # جستجو برای عناصری که ممکن است شامل نام کاربری باشند
+                for element in parent.find_all(['span', 'div', 'a'])[:10]:
+                    text = element.get_text(strip=True)
+                    class_names = ' '.join(element.get('class', []))
+                    
+                    # اگر شامل کلمات کلیدی مرتبط با کاربر باشد
+                    if (any(keyword in class_names.lower() for keyword in ['user', 'author', 'name']) or
+                        (len(text) > 2 and len(text) < 30 and '@' not in text and 
+                         not any(char.isdigit() for char in text) and text.count(' ') <= 2)):
+                        return text
+            
+            # جستجو کلی در صفحه
+            for element in soup.find_all(['span', 'div', 'a'], class_=True)[:30]:
+                class_names = ' '.join(element.get('class', []))
+                if any(keyword in class_names.lower() for keyword in ['user', 'author', 'username']):
+                    text = element.get_text(strip=True)
+                    if len(text) > 2 and len(text) < 30:
+                        return text
+            
+            return 'TradingView Community'
+        except:
+            return 'TradingView Community'
+    
+    def extract_publish_time(self, soup: BeautifulSoup, link_element) -> Optional[datetime.datetime]:
+        """استخراج زمان انتشار تحلیل"""
+        try:
+            parent = link_element.parent
+            if parent:
+                # جستجو برای عناصری که ممکن است شامل زمان باشند
+                time_elements = parent.find_all(['time', 'span'])
+                for element in time_elements:
+                    # بررسی datetime attribute
+                    if element.get('datetime'):
+                        try:
+                            return datetime.datetime.fromisoformat(element['datetime'].replace('Z', '+00:00'))
+                        except:
+                            pass
+                    
+                    # بررسی متن برای الگوهای زمانی
+                    text = element.get_text(strip=True)
+                    time_patterns = [
+                        r'(\d+)\s*hour[s]?\s*ago',
+                        r'(\d+)\s*day[s]?\s*ago',
+                        r'(\d+)\s*week[s]?\s*ago',
+                        r'(\d+)\s*month[s]?\s*ago'
+                    ]
+                    
+                    for pattern in time_patterns:
+                        match = re.search(pattern, text, re.IGNORECASE)
+                        if match:
+                            number = int(match.group(1))
+                            if 'hour' in text.lower():
+                                return datetime.datetime.now() - datetime.timedelta(hours=number)
+                            elif 'day' in text.lower():
+                                return datetime.datetime.now() - datetime.timedelta(days=number)
+                            elif 'week' in text.lower():
+                                return datetime.datetime.now() - datetime.timedelta(weeks=number)
+                            elif 'month' in text.lower():
+                                return datetime.datetime.now() - datetime.timedelta(days=number*30)
+            
+            return None
+        except:
+            return None
+
+
+def benchmark_parse(paths: List[str], rounds: int = 5) -> List[Dict[str, Any]]:
+    """میانگین زمان هر پارسر روی هر صفحه و مقایسه ایده‌های استخراج‌شده در همان صفحه"""
+    legacy = LegacyIdeaParser()
+    results = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            before = legacy.parse_community_candidates(content, 'BTCUSDT')
+        before_ms = (time.perf_counter() - started) * 1000 / rounds
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            after = parse_idea_cards(content)
+        after_ms = (time.perf_counter() - started) * 1000 / rounds
+
+        def key(ideas: List[Dict[str, Any]]) -> List[tuple]:
+            return sorted(tuple(idea.get(field) for field in COMPARED_FIELDS) for idea in ideas)
+
+        results.append({
+            'path': path,
+            'bytes': len(content),
+            'ideas_before': len(before),
+            'ideas_after': len(after),
+            'same_output': key(before) == key(after),
+            'legacy_ms': round(before_ms, 1),
+            'lxml_ms': round(after_ms, 1),
+        })
+    return results
+
+
+def main() -> None:
+    paths = sys.argv[1:] or [DEFAULT_FIXTURE]
+    for row in benchmark_parse(paths):
+        print(
+            f"{os.path.basename(row['path'])}: {row['bytes']} bytes | "
+            f"ideas {row['ideas_before']} -> {row['ideas_after']} (same output: {row['same_output']}) | "
+            f"BeautifulSoup {row['legacy_ms']}ms -> lxml {row['lxml_ms']}ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,8 @@ Services Module
 """
 
 from .crypto_service import (
+    FearGreedService,
+    fear_greed_service,
     fetch_fear_greed_index,
     download_fear_greed_chart,
     create_simple_fear_greed_image,
@@ -19,12 +21,82 @@ from .spam_service import (
     send_admin_spam_notification
 )
 
+from .market_snapshot_service import (
+    MarketSnapshot,
+    MarketSnapshotService,
+    market_snapshot_service
+)
+
+from .news_dedup_service import (
+    NewsDeduplicator,
+    news_deduplicator,
+    deduplicate_news
+)
+
+from .price_history_service import (
+    PriceRingBuffer,
+    PriceHistoryService,
+    price_history_service
+)
+
+from .media_cache_service import (
+    MediaCache,
+    media_cache
+)
+
+from .market_screener_service import (
+    ScreenerTable,
+    MarketScreener,
+    market_screener
+)
+
+from .price_alert_service import (
+    PriceAlertIndex,
+    PriceAlertService,
+    price_alert_service
+)
+
+from .symbol_index_service import (
+    SymbolTrie,
+    SymbolIndex,
+    symbol_index
+)
+
+from .ocr_service import (
+    OCRJobService,
+    ocr_service
+)
+
 __all__ = [
+    'FearGreedService',
+    'fear_greed_service',
     'fetch_fear_greed_index',
     'download_fear_greed_chart',
     'create_simple_fear_greed_image',
     'format_fear_greed_message',
     'check_spam_and_handle',
     'send_spam_block_notification',
-    'send_admin_spam_notification'
+    'send_admin_spam_notification',
+    'MarketSnapshot',
+    'MarketSnapshotService',
+    'market_snapshot_service',
+    'NewsDeduplicator',
+    'news_deduplicator',
+    'deduplicate_news',
+    'PriceRingBuffer',
+    'PriceHistoryService',
+    'price_history_service',
+    'MediaCache',
+    'media_cache',
+    'ScreenerTable',
+    'MarketScreener',
+    'market_screener',
+    'PriceAlertIndex',
+    'PriceAlertService',
+    'price_alert_service',
+    'SymbolTrie',
+    'SymbolIndex',
+    'symbol_index',
+    'OCRJobService',
+    'ocr_service'
 ]
@@ -6,251 +6,299 @@ Crypto Service
 سرویس مربوط به ارزهای دیجیتال و شاخص ترس و طمع
 """
 
+import asyncio
+import io
 import logging
+import math
+import time
 from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.http_sessions import http_sessions
 
 logger = logging.getLogger(__name__)
 
+FEAR_GREED_API_URL = "https://api.alternative.me/fng/"
 
-async def fetch_fear_greed_index():
-    """دریافت شاخص ترس و طمع بازار کریپتو از alternative.me"""
-    import aiohttp
-    import json
-    
+# لیست منابع مختلف برای تصویر
+FEAR_GREED_IMAGE_SOURCES = [
+    "https://alternative.me/crypto/fear-and-greed-index.png",
+    "https://alternative.me/images/fng/crypto-fear-and-greed-index.png",
+    "https://api.alternative.me/fng/png"
+]
+
+# Headers برای شبیه‌سازی درخواست مرورگر
+FEAR_GREED_IMAGE_HEADERS = {
+    'Accept': 'image/png,image/webp,image/jpeg,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Sec-Fetch-Dest': 'image',
+    'Sec-Fetch-Mode': 'no-cors',
+    'Sec-Fetch-Site': 'cross-site',
+}
+
+# شاخص روزی یک بار بروز می‌شود؛ اگر API زمان بروزرسانی بعدی را نداد
+FEAR_GREED_DEFAULT_TTL = 3600
+FEAR_GREED_MIN_TTL = 60
+# اگر هیچ منبع چارت در دسترس نبود، تصویر ساده فقط برای این مدت نگه داشته می‌شود
+FEAR_GREED_CHART_RETRY_TTL = 300
+
+
+def _fear_greed_mood(value: int):
+    """تعیین حالت فارسی، ایموجی و رنگ بر اساس مقدار شاخص"""
+    if value <= 20:
+        return 'ترس شدید', '😱', '🔴'
+    elif value <= 40:
+        return 'ترس', '😰', '🟠'
+    elif value <= 60:
+        return 'خنثی', '😐', '🟡'
+    elif value <= 80:
+        return 'طمع', '😊', '🟢'
+    return 'طمع شدید', '🤑', '💚'
+
+
+def render_simple_fear_greed_image(value: int) -> bytes:
+    """رسم تصویر ساده شاخص ترس و طمع با Pillow (خروجی PNG در حافظه)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    # ایجاد canvas
+    width, height = 400, 300
+    img = Image.new('RGB', (width, height), color='white')
+    draw = ImageDraw.Draw(img)
+
+    # رسم دایره اصلی
+    center_x, center_y = width // 2, height // 2 + 20
+    radius = 100
+
+    # رسم قوس نیم دایره
+    for angle in range(180):
+        end_x = center_x + radius * math.cos(math.radians(180 - angle))
+        end_y = center_y - radius * math.sin(math.radians(180 - angle))
+
+        # رنگ گرادیانت
+        progress = angle / 180
+        if progress < 0.25:
+            arc_color = '#FF0000'
+        elif progress < 0.45:
+            arc_color = '#FF8000'
+        elif progress < 0.55:
+            arc_color = '#FFFF00'
+        elif progress < 0.75:
+            arc_color = '#80FF00'
+        else:
+            arc_color = '#00FF00'
+
+        draw.line([(center_x, center_y), (end_x, end_y)], fill=arc_color, width=3)
+
+    # رسم عقربه
+    needle_angle = 180 - (value * 180 / 100)
+    needle_x = center_x + (radius - 10) * math.cos(math.radians(needle_angle))
+    needle_y = center_y - (radius - 10) * math.sin(math.radians(needle_angle))
+    draw.line([(center_x, center_y), (needle_x, needle_y)], fill='black', width=5)
+
+    # نوشتن متن
     try:
-        url = "https://api.alternative.me/fng/"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if data and 'data' in data and len(data['data']) > 0:
-                        fng_data = data['data'][0]
-                        value = int(fng_data.get('value', 50))
-                        classification = fng_data.get('value_classification', 'Unknown')
-                        
-                        # تعیین حالت فارسی و ایموجی
-                        if value <= 25:
-                            mood_fa = 'ترس شدید'
-                            emoji = '😱'
-                            color = '🔴'
-                        elif value <= 45:
-                            mood_fa = 'ترس'
-                            emoji = '😰'
-                            color = '🟠'
-                        elif value <= 55:
-                            mood_fa = 'خنثی'
-                            emoji = '😐'
-                            color = '🟡'
-                        elif value <= 75:
-                            mood_fa = 'طمع'
-                            emoji = '😃'
-                            color = '🟢'
-                        else:
-                            mood_fa = 'طمع شدید'
-                            emoji = '🤑'
-                            color = '🟢'
-                        
-                        # زمان آپدیت
-                        timestamp = int(fng_data.get('timestamp', 0))
-                        if timestamp:
-                            update_time = datetime.fromtimestamp(timestamp)
-                        else:
-                            update_time = datetime.now()
-                        
-                        return {
-                            'value': value,
-                            'classification': classification,
-                            'mood_fa': mood_fa,
-                            'emoji': emoji,
-                            'color': color,
-                            'update_time': update_time,
-                            'success': True
-                        }
-                    else:
-                        raise Exception("Invalid API response format")
-                else:
+        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
+    except Exception:
+        font = ImageFont.load_default()
+
+    # نوشتن مقدار
+    text = f"{value}"
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    draw.text((center_x - text_width // 2, center_y + 30), text, fill='black', font=font)
+
+    # نوشتن برچسب‌ها
+    try:
+        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
+    except Exception:
+        small_font = ImageFont.load_default()
+
+    draw.text((30, center_y + 10), "Fear", fill='red', font=small_font)
+    draw.text((width - 70, center_y + 10), "Greed", fill='green', font=small_font)
+
+    output = io.BytesIO()
+    img.save(output, 'PNG')
+    return output.getvalue()
+
+
+class FearGreedService:
+    """
+    سرویس یکپارچه شاخص ترس و طمع:
+    - شاخص تا زمان بروزرسانی بعدی alternative.me کش می‌شود
+    - تصویر چارت فقط در حافظه نگه داشته می‌شود (بدون فایل موقت)
+    - ارسال از طریق media_cache تا file_id تلگرام دوباره استفاده شود
+    - درخواست‌های همزمان در یک دریافت از منبع ادغام می‌شوند
+    """
+
+    def __init__(self):
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_expires_at = 0.0
+        self._index_future: Optional[asyncio.Future] = None
+        # چارت: {'key': زمان انتشار شاخص، 'bytes': PNG}
+        self._chart: Optional[Dict[str, Any]] = None
+        self._chart_future: Optional[asyncio.Future] = None
+        self.stats = {'index_fetches': 0, 'index_cache_hits': 0, 'chart_downloads': 0}
+
+    # -----------------------------
+    # 📌 شاخص
+    # -----------------------------
+    async def _fetch_index(self) -> Dict[str, Any]:
+        self.stats['index_fetches'] += 1
+        async with http_sessions.session('market') as session:
+            async with session.get(FEAR_GREED_API_URL) as response:
+                if response.status != 200:
                     raise Exception(f"API request failed with status {response.status}")
-                    
-    except Exception as e:
-        logger.error(f"خطا در دریافت شاخص ترس و طمع: {e}")
+                data = await response.json()
+
+        if not data or not data.get('data'):
+            raise Exception("Invalid API response format")
+
+        fng_data = data['data'][0]
+        value = int(fng_data.get('value', 50))
+        mood_fa, emoji, color = _fear_greed_mood(value)
+
+        # زمان آپدیت
+        timestamp = int(fng_data.get('timestamp', 0))
+        update_time = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+
+        # کش تا زمان بروزرسانی بعدی شاخص
+        try:
+            ttl = int(fng_data.get('time_until_update') or FEAR_GREED_DEFAULT_TTL)
+        except (TypeError, ValueError):
+            ttl = FEAR_GREED_DEFAULT_TTL
+        self._index_expires_at = time.time() + max(FEAR_GREED_MIN_TTL, ttl)
+
         return {
-            'value': 50,
-            'classification': 'Neutral',
-            'mood_fa': 'خنثی',
-            'emoji': '😐',
-            'color': '🟡',
-            'update_time': datetime.now(),
-            'success': False,
-            'error': str(e)
+            'value': value,
+            'classification': fng_data.get('value_classification', 'Unknown'),
+            'mood_fa': mood_fa,
+            'emoji': emoji,
+            'color': color,
+            'update_time': update_time,
+            'timestamp': timestamp,
+            'success': True
         }
 
+    async def get_index(self) -> Dict[str, Any]:
+        """شاخص فعلی (از کش تا زمان بروزرسانی بعدی)"""
+        if self._index and time.time() < self._index_expires_at:
+            self.stats['index_cache_hits'] += 1
+            return self._index
+
+        if self._index_future is None or self._index_future.done():
+            self._index_future = asyncio.ensure_future(self._fetch_index())
+        future = self._index_future
 
-async def download_fear_greed_chart():
-    """دانلود تصویر چارت شاخص ترس و طمع از منابع مختلف"""
-    import aiohttp
-    import os
-    import tempfile
-    
-    # لیست منابع مختلف برای تصویر
-    image_sources = [
-        "https://alternative.me/crypto/fear-and-greed-index.png",
-        "https://alternative.me/images/fng/crypto-fear-and-greed-index.png", 
-        "https://api.alternative.me/fng/png"
-    ]
-    
-    # استفاده از پوشه موقت سیستم برای جلوگیری از مشکلات مجوز
-    temp_dir = tempfile.gettempdir()
-    chart_path = os.path.join(temp_dir, "fear_greed_chart.png")
-    
-    # Headers برای شبیه‌سازی درخواست مرورگر
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
-        'Accept': 'image/png,image/webp,image/jpeg,image/*,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Sec-Fetch-Dest': 'image',
-        'Sec-Fetch-Mode': 'no-cors',
-        'Sec-Fetch-Site': 'cross-site',
-    }
-    
-    for i, chart_url in enumerate(image_sources, 1):
         try:
-            logger.info(f"تلاش {i}: دانلود از {chart_url}")
-            
-            async with aiohttp.ClientSession(
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
-                connector=aiohttp.TCPConnector(ssl=False)
-            ) as session:
-                async with session.get(chart_url) as response:
-                    logger.info(f"وضعیت پاسخ: {response.status}")
-                    
-                    if response.status == 200:
-                        content = await response.read()
-                        logger.info(f"حجم محتوا: {len(content)} بایت")
-                        
-                        # بررسی اینکه محتوا یک تصویر واقعی است
-                        if len(content) > 1000:  # حداقل 1KB برای تصویر
-                            # بررسی magic bytes برای PNG
-                            if content.startswith(b'\x89PNG') or content.startswith(b'\xff\xd8\xff'):
-                                with open(chart_path, 'wb') as f:
-                                    f.write(content)
-                                
-                                if os.path.exists(chart_path) and os.path.getsize(chart_path) > 1000:
-                                    logger.info(f"✅ تصویر با موفقیت دانلود شد: {chart_path}")
-                                    return chart_path
-                                else:
-                                    logger.warning("❌ مشکل در ذخیره فایل")
-                            else:
-                                logger.warning("❌ محتوا تصویر معتبری نیست")
-                        else:
-                            logger.warning(f"❌ حجم محتوا خیلی کم است: {len(content)} بایت")
-                    else:
-                        logger.warning(f"❌ کد خطای HTTP: {response.status}")
-                        
+            self._index = await asyncio.shield(future)
+            return self._index
         except Exception as e:
-            logger.error(f"❌ خطا در منبع {i}: {e}")
-            continue
-    
-    logger.warning("❌ هیچ منبعی کار نکرد - ایجاد تصویر ساده...")
-    return await create_simple_fear_greed_image()
+            logger.error(f"خطا در دریافت شاخص ترس و طمع: {e}")
+            # در صورت خطا، آخرین مقدار معتبر (حتی کهنه) برگردانده می‌شود
+            if self._index:
+                return self._index
+            return {
+                'value': 50,
+                'classification': 'Neutral',
+                'mood_fa': 'خنثی',
+                'emoji': '😐',
+                'color': '🟡',
+                'update_time': datetime.now(),
+                'timestamp': 0,
+                'success': False,
+                'error': str(e)
+            }
 
+    # -----------------------------
+    # 📌 چارت
+    # -----------------------------
+    async def _download_chart(self) -> Optional[bytes]:
+        """دانلود تصویر چارت از منابع مختلف (فقط در حافظه؛ None اگر هیچ منبعی کار نکرد)"""
+        for i, chart_url in enumerate(FEAR_GREED_IMAGE_SOURCES, 1):
+            try:
+                logger.info(f"تلاش {i}: دانلود از {chart_url}")
 
-async def create_simple_fear_greed_image():
-    """ایجاد تصویر ساده شاخص ترس و طمع"""
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-        import math
-        import os
-        
-        # دریافت مقدار فعلی شاخص
-        index_data = await fetch_fear_greed_index()
-        value = index_data.get('value', 50)
-        
-        # ایجاد canvas
-        width, height = 400, 300
-        img = Image.new('RGB', (width, height), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        # رنگ براساس مقدار
-        if value <= 25:
-            color = '#FF0000'  # قرمز - ترس شدید
-        elif value <= 45:
-            color = '#FF8000'  # نارنجی - ترس
-        elif value <= 55:
-            color = '#FFFF00'  # زرد - خنثی
-        elif value <= 75:
-            color = '#80FF00'  # سبز روشن - طمع
-        else:
-            color = '#00FF00'  # سبز - طمع شدید
-        
-        # رسم دایره اصلی
-        center_x, center_y = width // 2, height // 2 + 20
-        radius = 100
-        
-        # رسم قوس نیم دایره
-        for angle in range(180):
-            end_x = center_x + radius * math.cos(math.radians(180 - angle))
-            end_y = center_y - radius * math.sin(math.radians(180 - angle))
-            
-            # رنگ گرادیانت
-            progress = angle / 180
-            if progress < 0.25:
-                arc_color = '#FF0000'
-            elif progress < 0.45:
-                arc_color = '#FF8000'
-            elif progress < 0.55:
-                arc_color = '#FFFF00'
-            elif progress < 0.75:
-                arc_color = '#80FF00'
-            else:
-                arc_color = '#00FF00'
-            
-            draw.line([(center_x, center_y), (end_x, end_y)], fill=arc_color, width=3)
-        
-        # رسم عقربه
-        needle_angle = 180 - (value * 180 / 100)
-        needle_x = center_x + (radius - 10) * math.cos(math.radians(needle_angle))
-        needle_y = center_y - (radius - 10) * math.sin(math.radians(needle_angle))
-        draw.line([(center_x, center_y), (needle_x, needle_y)], fill='black', width=5)
-        
-        # نوشتن متن
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-        except:
-            font = ImageFont.load_default()
-        
-        # نوشتن مقدار
-        text = f"{value}"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        draw.text((center_x - text_width//2, center_y + 30), text, fill='black', font=font)
-        
-        # نوشتن برچسب‌ها
-        try:
-            small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-        except:
-            small_font = ImageFont.load_default()
-        
-        draw.text((30, center_y + 10), "Fear", fill='red', font=small_font)
-        draw.text((width - 70, center_y + 10), "Greed", fill='green', font=small_font)
-        
-        # ذخیره فایل در پوشه موقت سیستم
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        chart_path = os.path.join(temp_dir, "fear_greed_chart.png")
-        img.save(chart_path, 'PNG')
-        
-        if os.path.exists(chart_path):
-            logger.info(f"✅ تصویر ساده ایجاد شد: {chart_path}")
-            return chart_path
-        else:
-            logger.error("❌ مشکل در ایجاد تصویر ساده")
+                async with http_sessions.session('media') as session:
+                    async with session.get(chart_url, headers=FEAR_GREED_IMAGE_HEADERS) as response:
+                        if response.status != 200:
+                            logger.warning(f"❌ کد خطای HTTP: {response.status}")
+                            continue
+                        content = await response.read()
+
+                # بررسی اینکه محتوا یک تصویر واقعی است (حداقل 1KB و magic bytes)
+                if len(content) <= 1000:
+                    logger.warning(f"❌ حجم محتوا خیلی کم است: {len(content)} بایت")
+                elif content.startswith(b'\x89PNG') or content.startswith(b'\xff\xd8\xff'):
+                    logger.info(f"✅ تصویر با موفقیت دانلود شد ({len(content)} بایت)")
+                    return content
+                else:
+                    logger.warning("❌ محتوا تصویر معتبری نیست")
+
+            except Exception as e:
+                logger.error(f"❌ خطا در منبع {i}: {e}")
+
+        return None
+
+    async def _load_chart(self, key: int) -> Dict[str, Any]:
+        self.stats['chart_downloads'] += 1
+        content = await self._download_chart()
+        if content:
+            return {'key': key, 'bytes': content, 'fallback': False}
+
+        logger.warning("❌ هیچ منبعی کار نکرد - ایجاد تصویر ساده...")
+        return {
+            'key': key,
+            'bytes': await create_simple_fear_greed_image(),
+            'fallback': True,
+            'retry_at': time.time() + FEAR_GREED_CHART_RETRY_TTL,
+        }
+
+    async def get_chart(self) -> Optional[Dict[str, Any]]:
+        """
+        چارت مربوط به شاخص فعلی
+
+        Returns:
+            {'key', 'bytes', 'fallback'} یا None اگر تصویری در دسترس نباشد؛
+            تصویر ساده (fallback) فقط تا retry_at استفاده می‌شود و بعد از آن منابع دوباره امتحان می‌شوند
+        """
+        index_data = await self.get_index()
+        key = index_data.get('timestamp') or int(self._index_expires_at)
+
+        chart = self._chart
+        if chart and chart['key'] == key and (not chart['fallback'] or time.time() < chart['retry_at']):
+            return chart
+
+        if self._chart_future is None or self._chart_future.done():
+            self._chart_future = asyncio.ensure_future(self._load_chart(key))
+        chart = await asyncio.shield(self._chart_future)
+
+        if not chart['bytes']:
             return None
-            
+        self._chart = chart
+        return chart
+
+
+fear_greed_service = FearGreedService()
+
+
+async def fetch_fear_greed_index():
+    """دریافت شاخص ترس و طمع بازار کریپتو از alternative.me (کش‌شده)"""
+    return await fear_greed_service.get_index()
+
+
+async def download_fear_greed_chart() -> Optional[bytes]:
+    """دریافت بایت‌های تصویر چارت شاخص ترس و طمع"""
+    chart = await fear_greed_service.get_chart()
+    return chart['bytes'] if chart else None
+
+
+async def create_simple_fear_greed_image() -> Optional[bytes]:
+    """ایجاد تصویر ساده شاخص ترس و طمع (PNG در حافظه)"""
+    try:
+        index_data = await fear_greed_service.get_index()
+        content = await asyncio.to_thread(render_simple_fear_greed_image, index_data.get('value', 50))
+        logger.info(f"✅ تصویر ساده ایجاد شد ({len(content)} بایت)")
+        return content
     except Exception as e:
         logger.error(f"❌ خطا در ایجاد تصویر ساده: {e}")
         return None
@@ -266,38 +314,50 @@ def format_fear_greed_message(index_data):
 
 🔄 لطفاً چند دقیقه بعد دوباره تلاش کنید.
 
-📊 منبع: Alternative.me Fear & Greed Index"""
+📊 منبع: Alternative.me"""
 
-    value = index_data['value']
-    classification = index_data['classification']
-    mood_fa = index_data['mood_fa']
-    emoji = index_data['emoji']
-    color = index_data['color']
-    update_time = index_data['update_time']
-    
-    # توضیحات
-    if value <= 25:
-        description = "بازار در حالت ترس شدید است. سرمایه‌گذاران نگران هستند و احتمال فروش بالاست."
-    elif value <= 45:
-        description = "بازار در حالت ترس است. احتیاط در تصمیم‌گیری توصیه می‌شود."
-    elif value <= 55:
-        description = "بازار در حالت خنثی است. هیچ احساس خاصی در بازار حاکم نیست."
-    elif value <= 75:
-        description = "بازار در حالت طمع است. سرمایه‌گذاران خوش‌بین هستند."
+    # توضیحات براساس مقدار شاخص
+    if index_data['value'] <= 20:
+        description = """🔍 وضعیت بازار:
+• سطح ترس بسیار بالا در بازار
+• احتمال فرصت خرید مناسب
+• سرمایه‌گذاران بسیار محتاط هستند
+• قیمت‌ها ممکن است به کف رسیده باشند"""
+    elif index_data['value'] <= 40:
+        description = """🔍 وضعیت بازار:
+• سطح ترس نسبتاً بالا
+• بازار در حالت فروش
+• سرمایه‌گذاران نگران هستند  
+• ممکن است فرصت خرید باشد"""
+    elif index_data['value'] <= 60:
+        description = """🔍 وضعیت بازار:
+• بازار در حالت خنثی و متعادل
+• عدم وجود احساسات شدید
+• تصمیم‌گیری براساس تحلیل تکنیکال
+• وضعیت نرمال بازار"""
+    elif index_data['value'] <= 80:
+        description = """🔍 وضعیت بازار:
+• سطح طمع نسبتاً بالا
+• بازار در حالت خرید
+• سرمایه‌گذاران خوش‌بین هستند
+• احتمال اصلاح قیمت وجود دارد"""
     else:
-        description = "بازار در حالت طمع شدید است. احتمال اصلاح قیمت وجود دارد."
+        description = """🔍 وضعیت بازار:
+• سطح طمع بسیار بالا
+• احتمال حباب قیمتی
+• سرمایه‌گذاران بسیار خوش‌بین
+• زمان مناسب برای فروش ممکن است"""
 
+    # فرمت پیام نهایی
     message = f"""😨 شاخص ترس و طمع بازار کریپتو
 
-{color} **مقدار فعلی:** {value}/100
-{emoji} **وضعیت:** {mood_fa} ({classification})
+{index_data['color']} <b>مقدار فعلی: {index_data['value']}/100</b>
 
-📝 **توضیحات:**
-{description}
+{index_data['emoji']} <b>وضعیت: {index_data['mood_fa']}</b>
 
-🕐 **زمان آپدیت:** {update_time.strftime('%Y/%m/%d - %H:%M')}
+{description}
 
-💡 **نکته:** این شاخص بر اساس تحلیل احساسات بازار، حجم معاملات، نوسانات و ... محاسبه می‌شود.
+📅 آخرین به‌روزرسانی: {index_data['update_time'].strftime('%Y/%m/%d - %H:%M')}
 
 📊 منبع: Alternative.me Fear & Greed Index
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Market Screener Service
+اسکنر بازار روی کل جدول ارزهای snapshot (۲۵۰ ارز برتر CoinGecko)
+جدول به صورت ستون‌های NumPy نگه داشته می‌شود و نتایج هر نسخه snapshot memoize می‌شوند
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.market_snapshot_service import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+# پیش‌تنظیم‌های اسکنر: (عنوان، ستون مرتب‌سازی، نزولی، فیلترها)
+SCREENER_PRESETS: Dict[str, Tuple[str, str, bool, Dict[str, float]]] = {
+    'gainers': ('🚀 بیشترین صعود 24 ساعته', 'change_24h', True, {}),
+    'losers': ('📉 بیشترین نزول 24 ساعته', 'change_24h', False, {}),
+    'volume': ('💹 بیشترین حجم معاملات', 'volume', True, {}),
+    'movers': ('🏦 بیشترین تغییر ارزش بازار', 'market_cap_change_abs', True, {}),
+    'largecap': ('🐋 صعود ارزهای بزرگ (بالای 10 میلیارد دلار)', 'change_24h', True, {'min_market_cap': 10e9}),
+    'active': ('⚡ ارزهای کوچک پرمعامله (حجم/ارزش بالای 20٪)', 'turnover', True,
+               {'max_market_cap': 1e9, 'min_turnover': 0.2}),
+}
+
+
+@dataclass(frozen=True)
+class ScreenerTable:
+    """جدول ستونی ارزها برای یک نسخه snapshot"""
+    version: int
+    symbols: np.ndarray
+    names: np.ndarray
+    rank: np.ndarray
+    price: np.ndarray
+    change_24h: np.ndarray
+    volume: np.ndarray
+    market_cap: np.ndarray
+    market_cap_change: np.ndarray
+
+    @classmethod
+    def from_snapshot(cls, snapshot: MarketSnapshot) -> 'ScreenerTable':
+        coins = snapshot.coins
+
+        def column(key: str) -> np.ndarray:
+            return np.array([coin.get(key) or 0.0 for coin in coins], dtype=np.float64)
+
+        return cls(
+            version=snapshot.version,
+            symbols=np.array([(coin.get('symbol') or '').upper() for coin in coins], dtype=object),
+            names=np.array([coin.get('name') or '' for coin in coins], dtype=object),
+            rank=column('market_cap_rank'),
+            price=column('current_price'),
+            change_24h=column('price_change_percentage_24h'),
+            volume=column('total_volume'),
+            market_cap=column('market_cap'),
+            market_cap_change=column('market_cap_change_24h'),
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def metric(self, name: str) -> np.ndarray:
+        """ستون‌های محاسبه‌شده علاوه بر ستون‌های خام"""
+        if name == 'market_cap_change_abs':
+            return np.abs(self.market_cap_change)
+        if name == 'turnover':
+            return np.divide(self.volume, self.market_cap, out=np.zeros_like(self.volume), where=self.market_cap > 0)
+        return getattr(self, name)
+
+    def mask(self, filters: Dict[str, float]) -> np.ndarray:
+        """ماسک بولی فیلترها در یک گذر برداری"""
+        mask = self.price > 0
+        if 'min_market_cap' in filters:
+            mask &= self.market_cap >= filters['min_market_cap']
+        if 'max_market_cap' in filters:
+            mask &= self.market_cap <= filters['max_market_cap']
+        if 'min_volume' in filters:
+            mask &= self.volume >= filters['min_volume']
+        if 'min_change' in filters:
+            mask &= self.change_24h >= filters['min_change']
+        if 'max_change' in filters:
+            mask &= self.change_24h <= filters['max_change']
+        if 'min_turnover' in filters:
+            mask &= self.metric('turnover') >= filters['min_turnover']
+        return mask
+
+    def rows(self, indexes: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                'symbol': self.symbols[i],
+                'name': self.names[i],
+                'rank': int(self.rank[i]),
+                'price_usd': float(self.price[i]),
+                'change_24h': float(self.change_24h[i]),
+                'volume': float(self.volume[i]),
+                'market_cap': float(self.market_cap[i]),
+                'market_cap_change': float(self.market_cap_change[i]),
+            }
+            for i in indexes
+        ]
+
+
+class MarketScreener:
+    """محاسبه رتبه‌بندی‌ها با NumPy و memoize نتایج برای هر نسخه snapshot"""
+
+    def __init__(self):
+        self._table: Optional[ScreenerTable] = None
+        self._results: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self.stats = {'queries': 0, 'memo_hits': 0, 'tables_built': 0}
+
+    def _table_for(self, snapshot: MarketSnapshot) -> ScreenerTable:
+        if self._table is None or self._table.version != snapshot.version:
+            self._table = ScreenerTable.from_snapshot(snapshot)
+            # نتایج نسخه قبلی دیگر معتبر نیستند
+            self._results = {}
+            self.stats['tables_built'] += 1
+        return self._table
+
+    def screen(
+        self,
+        snapshot: MarketSnapshot,
+        sort_by: str = 'change_24h',
+        descending: bool = True,
+        limit: int = 10,
+        filters: Optional[Dict[str, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        top-N ارزها بر اساس یک ستون با فیلترهای دلخواه
+
+        Args:
+            sort_by: change_24h، volume، market_cap، market_cap_change_abs، turnover
+            filters: min_market_cap، max_market_cap، min_volume، min_change، max_change، min_turnover
+        """
+        filters = filters or {}
+        table = self._table_for(snapshot)
+        key = (table.version, sort_by, descending, limit, tuple(sorted(filters.items())))
+        self.stats['queries'] += 1
+
+        cached = self._results.get(key)
+        if cached is not None:
+            self.stats['memo_hits'] += 1
+            return cached
+
+        if not len(table):
+            return []
+
+        candidates = np.flatnonzero(table.mask(filters))
+        values = table.metric(sort_by)[candidates]
+        if descending:
+            values = -values
+
+        # argpartition برای top-N و سپس مرتب‌سازی همان N مورد
+        if len(candidates) > limit:
+            top = np.argpartition(values, limit)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(values[top], kind='stable')]
+
+        result = table.rows(candidates[top])
+        self._results[key] = result
+        return result
+
+    def preset(self, snapshot: MarketSnapshot, name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """اجرای یکی از پیش‌تنظیم‌های SCREENER_PRESETS"""
+        _, sort_by, descending, filters = SCREENER_PRESETS[name]
+        return self.screen(snapshot, sort_by=sort_by, descending=descending, limit=limit, filters=filters)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, universe=len(self._table) if self._table else 0)
+
+
+market_screener = MarketScreener()
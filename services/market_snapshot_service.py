@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Market Snapshot Service
+سرویس پس‌زمینه برای دریافت همزمان قیمت‌ها از CoinGecko، CodeBazan و تترلند
+کاربران از آخرین snapshot تغییرناپذیر در حافظه سرویس می‌گیرند (stale-while-revalidate)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from core.http_sessions import http_sessions
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_MARKETS_URL = (
+    "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc"
+    "&per_page=250&page=1&sparkline=false&price_change_percentage=24h"
+)
+CODEBAZAN_URL = "https://api.codebazan.ir/arz/?type=arz"
+TETHERLAND_URL = "https://api.tetherland.com/currencies"
+
+SNAPSHOT_INTERVAL = int(os.getenv('MARKET_SNAPSHOT_INTERVAL', '60'))
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """snapshot تغییرناپذیر بازار در یک لحظه"""
+    version: int
+    fetched_at: float
+    coins: Tuple[Mapping[str, Any], ...] = ()
+    usd_irr: int = 0
+    tether_irr: int = 0
+    tether_change_24h: float = 0.0
+    # زمان آخرین دریافت موفق هر منبع (epoch)
+    source_times: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def find_coin(self, coin_id: str) -> Optional[Mapping[str, Any]]:
+        for coin in self.coins:
+            if coin.get('id') == coin_id:
+                return coin
+        return None
+
+    def to_price_data(
+        self,
+        top_gainer: Optional[Mapping[str, Any]] = None,
+        top_loser: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        تبدیل به ساختار قدیمی fetch_crypto_prices برای format_crypto_message
+
+        Args:
+            top_gainer / top_loser: ردیف‌های اسکنر بازار (market_screener) برای همین نسخه snapshot
+        """
+        result: Dict[str, Any] = {
+            'bitcoin': {'price_usd': 0, 'change_24h': 0},
+            'ethereum': {'price_usd': 0, 'change_24h': 0},
+            'top_gainer': {'symbol': 'N/A', 'change_24h': 0, 'price_usd': 0},
+            'top_loser': {'symbol': 'N/A', 'change_24h': 0, 'price_usd': 0},
+            'tether_irr': self.tether_irr,
+            'tether_change_24h': self.tether_change_24h,
+            'usd_irr': self.usd_irr,
+            'fetched_at': self.fetched_at,
+            'age_seconds': self.age_seconds,
+            'error': None,
+        }
+
+        for coin_id in ('bitcoin', 'ethereum'):
+            coin = self.find_coin(coin_id)
+            if coin:
+                result[coin_id] = {
+                    'price_usd': coin.get('current_price') or 0,
+                    'change_24h': coin.get('price_change_percentage_24h') or 0,
+                }
+
+        for key, row in (('top_gainer', top_gainer), ('top_loser', top_loser)):
+            if row:
+                result[key] = {
+                    'symbol': row['symbol'],
+                    'name': row['name'],
+                    'change_24h': row['change_24h'],
+                    'price_usd': row['price_usd'],
+                }
+
+        if not self.coins and not self.usd_irr and not self.tether_irr:
+            result['error'] = "داده‌ای از منابع قیمت دریافت نشد. لطفاً کمی بعد دوباره تلاش کنید."
+
+        return result
+
+
+class MarketSnapshotService:
+    """دریافت دوره‌ای قیمت‌ها و نگهداری آخرین snapshot معتبر"""
+
+    SOURCES = ('coingecko', 'codebazan', 'tetherland')
+
+    def __init__(self, interval: int = SNAPSHOT_INTERVAL):
+        self.interval = interval
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Future] = None
+        # مصرف‌کنندگان هر snapshot جدید (تاریخچه قیمت، هشدارها و ...)
+        self._listeners: List[Callable[[MarketSnapshot], Any]] = []
+        self.source_stats: Dict[str, Dict[str, Any]] = {
+            name: {
+                'requests': 0,
+                'errors': 0,
+                'last_latency_ms': 0.0,
+                'total_latency_ms': 0.0,
+                'last_success': None,
+                'last_error': None,
+            }
+            for name in self.SOURCES
+        }
+
+    # -----------------------------
+    # 📌 دریافت از منابع
+    # -----------------------------
+    async def _fetch_coingecko(self, session) -> Tuple[Mapping[str, Any], ...]:
+        async with session.get(COINGECKO_MARKETS_URL) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            data = await response.json()
+        if not isinstance(data, list) or not data:
+            raise RuntimeError("پاسخ نامعتبر CoinGecko")
+        return tuple(MappingProxyType(dict(coin)) for coin in data)
+
+    async def _fetch_codebazan(self, session) -> int:
+        async with session.get(CODEBAZAN_URL) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            data = await response.json(content_type=None)
+        if data.get('Ok') and data.get('Result'):
+            for item in data['Result']:
+                if item.get('name') == 'دلار':
+                    # تبدیل از ریال به تومان
+                    return int(float(item.get('price', '0').replace(',', '')) / 10)
+        raise RuntimeError("نرخ دلار در پاسخ CodeBazan یافت نشد")
+
+    async def _fetch_tetherland(self, session) -> Tuple[int, float]:
+        async with session.get(TETHERLAND_URL) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            data = await response.json(content_type=None)
+        usdt_info = (data.get('data') or {}).get('currencies', {}).get('USDT', {}) if data.get('status') == 200 else {}
+        if not usdt_info:
+            raise RuntimeError("قیمت تتر در پاسخ تترلند یافت نشد")
+        return int(usdt_info.get('price', 0)), float(usdt_info.get('diff24d', '0'))
+
+    async def _timed(self, name: str, coro):
+        """اجرای یک منبع با ثبت زمان پاسخ و خطا"""
+        stats = self.source_stats[name]
+        stats['requests'] += 1
+        started = time.monotonic()
+        try:
+            value = await coro
+            stats['last_success'] = time.time()
+            return value
+        except Exception as e:
+            stats['errors'] += 1
+            stats['last_error'] = str(e) or e.__class__.__name__
+            logger.warning(f"⚠️ خطا در دریافت قیمت از {name}: {stats['last_error']}")
+            raise
+        finally:
+            latency = (time.monotonic() - started) * 1000
+            stats['last_latency_ms'] = round(latency, 1)
+            stats['total_latency_ms'] += latency
+
+    # -----------------------------
+    # 📌 بروزرسانی snapshot
+    # -----------------------------
+    async def _refresh(self) -> MarketSnapshot:
+        session = http_sessions.get('market')
+        coins, usd_irr, tether = await asyncio.gather(
+            self._timed('coingecko', self._fetch_coingecko(session)),
+            self._timed('codebazan', self._fetch_codebazan(session)),
+            self._timed('tetherland', self._fetch_tetherland(session)),
+            return_exceptions=True,
+        )
+
+        previous = self._snapshot
+        now = time.time()
+        source_times = dict(previous.source_times) if previous else {}
+
+        # منابع ناموفق: مقدار قبلی (stale) حفظ می‌شود
+        if isinstance(coins, BaseException):
+            coins = previous.coins if previous else ()
+        else:
+            source_times['coingecko'] = now
+        if isinstance(usd_irr, BaseException):
+            usd_irr = previous.usd_irr if previous else 0
+        else:
+            source_times['codebazan'] = now
+        if isinstance(tether, BaseException):
+            tether = (previous.tether_irr, previous.tether_change_24h) if previous else (0, 0.0)
+        else:
+            source_times['tetherland'] = now
+
+        # تازگی snapshot از آخرین دریافت موفق منابع (نه زمان تلاش) تعیین می‌شود
+        fetched_at = max(source_times.values(), default=0.0)
+        any_success = fetched_at == now
+
+        if previous and (coins, usd_irr, tether) == (
+            previous.coins, previous.usd_irr, (previous.tether_irr, previous.tether_change_24h)
+        ):
+            # داده تغییری نکرده: نسخه ثابت می‌ماند و listenerها فراخوانی نمی‌شوند
+            if any_success:
+                self._snapshot = replace(
+                    previous, fetched_at=fetched_at, source_times=MappingProxyType(source_times)
+                )
+            return self._snapshot
+
+        snapshot = MarketSnapshot(
+            version=(previous.version + 1) if previous else 1,
+            fetched_at=fetched_at,
+            coins=coins,
+            usd_irr=usd_irr,
+            tether_irr=tether[0],
+            tether_change_24h=tether[1],
+            source_times=MappingProxyType(source_times),
+        )
+        self._snapshot = snapshot
+        if any_success:
+            await self._notify_listeners(snapshot)
+        return snapshot
+
+    def add_listener(self, callback: Callable[[MarketSnapshot], Any]) -> None:
+        """ثبت تابعی که بعد از هر snapshot جدید فراخوانی می‌شود (sync یا async)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    async def _notify_listeners(self, snapshot: MarketSnapshot) -> None:
+        for callback in list(self._listeners):
+            try:
+                result = callback(snapshot)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"❌ خطا در پردازش snapshot توسط {getattr(callback, '__qualname__', callback)}: {e}")
+
+    async def refresh(self) -> MarketSnapshot:
+        """بروزرسانی snapshot (درخواست‌های همزمان در یک دریافت ادغام می‌شوند)"""
+        if self._refreshing is not None and not self._refreshing.done():
+            return await asyncio.shield(self._refreshing)
+
+        future = asyncio.ensure_future(self._refresh())
+        self._refreshing = future
+        return await asyncio.shield(future)
+
+    async def get_snapshot(self) -> MarketSnapshot:
+        """
+        آخرین snapshot؛ فقط در اولین درخواست منتظر دریافت می‌ماند.
+        اگر snapshot کهنه باشد، همان برگردانده شده و بروزرسانی در پس‌زمینه انجام می‌شود.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.refresh()
+        if snapshot.age_seconds > self.interval * 2 and (self._refreshing is None or self._refreshing.done()):
+            asyncio.create_task(self.refresh())
+        return snapshot
+
+    @property
+    def snapshot(self) -> Optional[MarketSnapshot]:
+        return self._snapshot
+
+    # -----------------------------
+    # 📌 چرخه پس‌زمینه
+    # -----------------------------
+    async def _run(self) -> None:
+        logger.info(f"📈 سرویس snapshot بازار فعال شد (هر {self.interval} ثانیه)")
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ خطا در بروزرسانی snapshot بازار: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """شروع دریافت دوره‌ای در پس‌زمینه"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """توقف دریافت دوره‌ای"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # -----------------------------
+    # 📌 آمار
+    # -----------------------------
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """آمار زمان پاسخ و خطای هر منبع"""
+        result = {}
+        for name, stats in self.source_stats.items():
+            requests_count = stats['requests']
+            result[name] = {
+                'requests': requests_count,
+                'errors': stats['errors'],
+                'last_latency_ms': stats['last_latency_ms'],
+                'avg_latency_ms': round(stats['total_latency_ms'] / requests_count, 1) if requests_count else 0.0,
+                'last_success': stats['last_success'],
+                'last_error': stats['last_error'],
+            }
+        return result
+
+    def format_source_stats(self) -> str:
+        """متن خلاصه آمار منابع برای پنل ادمین"""
+        snapshot = self._snapshot
+        lines = []
+        if snapshot:
+            lines.append(f"• نسخه snapshot: {snapshot.version} ({snapshot.age_seconds:.0f} ثانیه پیش)")
+        for name, stats in self.get_source_stats().items():
+            lines.append(
+                f"• {name}: {stats['requests']} درخواست، {stats['errors']} خطا، "
+                f"میانگین {stats['avg_latency_ms']}ms"
+            )
+        return "\n".join(lines)
+
+
+market_snapshot_service = MarketSnapshotService()
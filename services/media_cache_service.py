@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Media Cache Service
+کش file_id رسانه‌های تلگرام: هر تصویر فقط یک بار آپلود می‌شود و ارسال‌های بعدی
+با file_id انجام می‌شوند (کلید: هش محتوا، آدرس منبع یا کلید دلخواه)
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from telegram.error import BadRequest
+
+logger = logging.getLogger(__name__)
+
+PhotoInput = Union[bytes, str]
+
+
+class MediaCache:
+    """لایه کش روی reply_photo / send_photo با نگهداری file_id در حافظه و دیتابیس"""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self.db = None
+        # کلید -> {'file_id', 'size'}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'uploads': 0,
+            'stale_file_ids': 0,
+            'bytes_uploaded': 0,
+            'bytes_saved': 0,
+        }
+
+    def set_db_manager(self, db_manager) -> None:
+        """تنظیم دیتابیس برای ماندگاری file_idها بین اجراها"""
+        self.db = db_manager
+
+    # -----------------------------
+    # 📌 کلید و جستجو
+    # -----------------------------
+    @staticmethod
+    def make_key(photo: PhotoInput) -> str:
+        """کلید کش: آدرس منبع برای URL و هش SHA-256 برای بایت‌ها"""
+        if isinstance(photo, (bytes, bytearray)):
+            return f"sha256:{hashlib.sha256(photo).hexdigest()}"
+        return f"url:{photo}"
+
+    def _remember(self, key: str, file_id: str, size: int) -> None:
+        self._entries[key] = {'file_id': file_id, 'size': size}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry:
+            self._entries.move_to_end(key)
+            return entry
+        if self.db and hasattr(self.db, 'get_media_file_id'):
+            row = await asyncio.to_thread(self.db.get_media_file_id, key)
+            if row:
+                self._remember(key, row['file_id'], row.get('file_size') or 0)
+                return self._entries[key]
+        return None
+
+    async def _store(self, key: str, file_id: str, size: int, persist: bool) -> None:
+        self._remember(key, file_id, size)
+        if persist and self.db and hasattr(self.db, 'save_media_file_id'):
+            await asyncio.to_thread(self.db.save_media_file_id, key, file_id, size)
+
+    async def _forget(self, key: str, persist: bool) -> None:
+        self._entries.pop(key, None)
+        if persist and self.db and hasattr(self.db, 'delete_media_file_id'):
+            await asyncio.to_thread(self.db.delete_media_file_id, key)
+
+    # -----------------------------
+    # 📌 ارسال
+    # -----------------------------
+    async def send_photo(
+        self,
+        send: Callable[..., Awaitable[Any]],
+        photo: PhotoInput,
+        cache_key: Optional[str] = None,
+        persist: bool = True,
+        **kwargs: Any,
+    ):
+        """
+        ارسال عکس با استفاده از file_id کش‌شده در صورت وجود
+
+        Args:
+            send: تابع ارسال تلگرام، مثل update.message.reply_photo یا partial(bot.send_photo, chat_id)
+            photo: بایت‌های تصویر یا آدرس URL
+            cache_key: کلید دلخواه (مثلاً برای نمودارهای زمان‌دار)؛ پیش‌فرض هش محتوا یا URL
+            persist: ذخیره file_id در دیتابیس (برای کلیدهای کوتاه‌عمر False)
+        """
+        key = cache_key or self.make_key(photo)
+        size = len(photo) if isinstance(photo, (bytes, bytearray)) else 0
+        self.stats['requests'] += 1
+
+        entry = await self._lookup(key)
+        if entry:
+            try:
+                message = await send(photo=entry['file_id'], **kwargs)
+                self.stats['hits'] += 1
+                self.stats['bytes_saved'] += entry['size'] or size
+                return message
+            except BadRequest as e:
+                # file_id منقضی یا نامعتبر: حذف و آپلود مجدد
+                self.stats['stale_file_ids'] += 1
+                logger.warning(f"⚠️ file_id نامعتبر برای {key[:60]}: {e}")
+                await self._forget(key, persist)
+
+        message = await send(photo=photo, **kwargs)
+        self.stats['uploads'] += 1
+        sent_photo = message.photo[-1] if message is not None and getattr(message, 'photo', None) else None
+        if not size and sent_photo is not None:
+            # برای ارسال با URL حجم از پاسخ تلگرام (بزرگ‌ترین اندازه عکس) گرفته می‌شود
+            size = sent_photo.file_size or 0
+        self.stats['bytes_uploaded'] += size
+        if sent_photo is not None:
+            await self._store(key, sent_photo.file_id, size, persist)
+        return message
+
+    # -----------------------------
+    # 📌 آمار
+    # -----------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        """آمار نرخ استفاده از file_id و حجم آپلود صرفه‌جویی‌شده"""
+        stats = dict(self.stats)
+        stats['hit_ratio'] = round(stats['hits'] / stats['requests'], 3) if stats['requests'] else 0.0
+        stats['entries'] = len(self._entries)
+        return stats
+
+    def format_stats(self) -> str:
+        """متن خلاصه آمار برای پنل ادمین"""
+        stats = self.get_stats()
+        return (
+            f"• درخواست‌ها: {stats['requests']} | استفاده از file_id: {stats['hit_ratio'] * 100:.0f}٪\n"
+            f"• آپلود: {stats['uploads']} ({stats['bytes_uploaded'] / 1024:.0f}KB) | "
+            f"صرفه‌جویی: {stats['bytes_saved'] / 1024:.0f}KB\n"
+            f"• file_id نامعتبر: {stats['stale_file_ids']} | ورودی‌های حافظه: {stats['entries']}"
+        )
+
+
+media_cache = MediaCache()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News De-duplication Service
+حذف اخبار تکراری بین منابع مختلف قبل از مرحله ترجمه
+(SimHash روی shingleهای عنوان نرمال‌شده + پنجره لغزان از اخبار اخیر)
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# یکسان‌سازی حروف عربی/فارسی و حذف کاراکترهای نامرئی
+_CHAR_MAP = str.maketrans({
+    'ي': 'ی',
+    'ى': 'ی',
+    'ك': 'ک',
+    'ة': 'ه',
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    '‌': ' ',  # ZWNJ
+    '‏': '',
+    '‎': '',
+})
+
+_PUNCT_RE = re.compile(r'[^\w\s]', re.UNICODE)
+_SPACE_RE = re.compile(r'\s+')
+
+# کلمات بی‌اهمیتی که در تشخیص تکرار نقشی ندارند
+_STOPWORDS = {
+    'the', 'a', 'an', 'of', 'to', 'in', 'on', 'for', 'and', 'or', 'is', 'are', 'at', 'as', 'by', 'with',
+    'از', 'به', 'در', 'با', 'و', 'که', 'را', 'این', 'آن', 'برای', 'تا', 'بر',
+}
+
+_FALLBACK_DT = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def normalize_title(title: str) -> str:
+    """نرمال‌سازی عنوان خبر برای مقایسه (حروف، اعراب، علائم و فاصله‌ها)"""
+    if not title:
+        return ''
+    text = unicodedata.normalize('NFKC', title).translate(_CHAR_MAP).lower()
+    # حذف اعراب و علائم ترکیبی
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = _PUNCT_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def title_shingles(normalized: str, size: int = 2) -> set:
+    """ساخت shingleهای کلمه‌ای (n-gram) از عنوان نرمال‌شده"""
+    words = [w for w in normalized.split() if w not in _STOPWORDS]
+    if len(words) < size:
+        return set(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)} | set(words)
+
+
+def simhash(shingles: set, bits: int = 64) -> int:
+    """محاسبه اثرانگشت SimHash برای مجموعه shingleها"""
+    vector = [0] * bits
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.md5(shingle.encode('utf-8')).digest()[:8], 'big')
+        for i in range(bits):
+            vector[i] += 1 if (digest >> i) & 1 else -1
+    fingerprint = 0
+    for i, weight in enumerate(vector):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """فاصله همینگ بین دو اثرانگشت"""
+    return bin(a ^ b).count('1')
+
+
+class NewsDeduplicator:
+    """
+    حذف خبرهای تقریباً یکسان بین منابع مختلف.
+    هر خبر با آخرین `window_size` خبر پذیرفته‌شده مقایسه می‌شود؛ اگر فاصله SimHash
+    کم یا شباهت Jaccard shingleها زیاد باشد، تکراری حساب شده و حذف می‌شود.
+    از بین نسخه‌های تکراری، نسخه معتبرترین منبع (رتبه کمتر) و سپس قدیمی‌ترین نگه داشته می‌شود.
+    """
+
+    def __init__(self, window_size: int = 100, max_distance: int = 3, jaccard_threshold: float = 0.6):
+        self.window_size = window_size
+        self.max_distance = max_distance
+        self.jaccard_threshold = jaccard_threshold
+        self.stats = {
+            'runs': 0,
+            'total_input': 0,
+            'total_dropped': 0,
+            'last_dropped': 0,
+        }
+
+    def _is_duplicate(self, fingerprint: int, shingles: set, window: deque) -> bool:
+        for seen_fp, seen_shingles in window:
+            if hamming_distance(fingerprint, seen_fp) <= self.max_distance:
+                return True
+            if shingles and seen_shingles:
+                union = len(shingles | seen_shingles)
+                if union and len(shingles & seen_shingles) / union >= self.jaccard_threshold:
+                    return True
+        return False
+
+    def deduplicate(
+        self,
+        items: List[Dict[str, Any]],
+        source_rank: Optional[Dict[str, int]] = None,
+        title_key: str = 'title',
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        حذف اخبار تکراری از لیست
+
+        Returns:
+            (لیست اخبار یکتا با حفظ ترتیب اولیه، تعداد اخبار حذف‌شده)
+        """
+        if not items:
+            return [], 0
+
+        source_rank = source_rank or {}
+        default_rank = len(source_rank)
+
+        # ترتیب بررسی: منبع معتبرتر، سپس انتشار زودتر
+        ordered = sorted(
+            enumerate(items),
+            key=lambda pair: (
+                source_rank.get(pair[1].get('source'), default_rank),
+                pair[1].get('published_dt') or _FALLBACK_DT,
+                pair[0],
+            ),
+        )
+
+        window: deque = deque(maxlen=self.window_size)
+        kept_indexes = set()
+
+        for index, item in ordered:
+            normalized = normalize_title(item.get(title_key, ''))
+            if not normalized:
+                kept_indexes.add(index)
+                continue
+            shingles = title_shingles(normalized)
+            fingerprint = simhash(shingles)
+            if self._is_duplicate(fingerprint, shingles, window):
+                continue
+            window.append((fingerprint, shingles))
+            kept_indexes.add(index)
+
+        kept = [item for index, item in enumerate(items) if index in kept_indexes]
+        dropped = len(items) - len(kept)
+
+        self.stats['runs'] += 1
+        self.stats['total_input'] += len(items)
+        self.stats['total_dropped'] += dropped
+        self.stats['last_dropped'] = dropped
+
+        if dropped:
+            logger.info(f"🧹 {dropped} خبر تکراری از {len(items)} خبر حذف شد")
+
+        return kept, dropped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """آمار عملکرد حذف تکرار"""
+        return dict(self.stats)
+
+
+news_deduplicator = NewsDeduplicator()
+
+
+def deduplicate_news(
+    items: List[Dict[str, Any]],
+    source_rank: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """حذف اخبار تکراری با نمونه مشترک NewsDeduplicator"""
+    return news_deduplicator.deduplicate(items, source_rank=source_rank)
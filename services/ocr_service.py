@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+OCR Job Service
+صف محدود درخواست‌های استخراج متن از تصویر با تعداد worker ثابت
+- تعداد worker ها برابر هسته‌های CPU است (هر worker حداکثر یک پردازش tesseract همزمان)
+- هر کاربر حداکثر چند درخواست در صف/در حال پردازش دارد و ظرفیت کل صف محدود است
+- جایگاه هر درخواست در صف برای نمایش به کاربر قابل دریافت است
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', '0')) or (os.cpu_count() or 1)
+OCR_QUEUE_SIZE = int(os.getenv('OCR_QUEUE_SIZE', str(OCR_WORKERS * 8)))
+OCR_MAX_JOBS_PER_USER = int(os.getenv('OCR_MAX_JOBS_PER_USER', '2'))
+
+
+class OCRJobService:
+    """اجرای درخواست‌های OCR در پس‌زمینه بدون مسدود کردن سایر کاربران"""
+
+    def __init__(
+        self,
+        workers: int = OCR_WORKERS,
+        max_queue: int = OCR_QUEUE_SIZE,
+        max_per_user: int = OCR_MAX_JOBS_PER_USER
+    ):
+        self.workers = max(1, workers)
+        self.max_per_user = max_per_user
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.ocr_handler = None
+        self._tasks: List[asyncio.Task] = []
+        self._ids = itertools.count(1)
+        # درخواست‌های منتظر به ترتیب ورود (برای محاسبه جایگاه در صف)
+        self._waiting: 'OrderedDict[int, int]' = OrderedDict()
+        self._user_jobs: Dict[int, int] = {}
+        self._busy = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    # -----------------------------
+    # 📌 چرخه worker ها
+    # -----------------------------
+    def start(self, ocr_handler) -> None:
+        self.ocr_handler = ocr_handler
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+        logger.info(f"📷 سرویس OCR با {self.workers} worker فعال شد")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, user_id, image_data, future = await self.queue.get()
+            self._waiting.pop(job_id, None)
+            self._busy += 1
+            try:
+                if not future.cancelled():
+                    result = await self.ocr_handler.extract_text_from_image(image_data)
+                    if not future.done():
+                        future.set_result(result)
+                    self.stats['completed' if result.get('success') else 'failed'] += 1
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"❌ خطا در پردازش درخواست OCR {job_id}: {e}")
+                self.stats['failed'] += 1
+                if not future.done():
+                    future.set_result({'success': False, 'error': f'خطا در پردازش تصویر: {str(e)}'})
+            finally:
+                self._busy -= 1
+                self._release_user(user_id)
+                self.queue.task_done()
+
+    def _release_user(self, user_id: int) -> None:
+        remaining = self._user_jobs.get(user_id, 0) - 1
+        if remaining > 0:
+            self._user_jobs[user_id] = remaining
+        else:
+            self._user_jobs.pop(user_id, None)
+
+    # -----------------------------
+    # 📌 ثبت درخواست
+    # -----------------------------
+    def submit(self, user_id: int, image_data: bytes) -> Dict[str, Any]:
+        """
+        افزودن تصویر به صف OCR
+
+        Returns:
+            در صورت موفقیت job_id و future نتیجه (خروجی extract_text_from_image)
+            و جایگاه فعلی در صف (0 یعنی پردازش بلافاصله آغاز می‌شود)
+        """
+        if not self.running:
+            return {'success': False, 'error': 'سرویس OCR در حال حاضر فعال نیست. لطفاً بعداً تلاش کنید.'}
+
+        if self._user_jobs.get(user_id, 0) >= self.max_per_user:
+            self.stats['rejected'] += 1
+            return {
+                'success': False,
+                'error': f'حداکثر {self.max_per_user} تصویر همزمان در حال پردازش است. لطفاً تا پایان پردازش قبلی صبر کنید.'
+            }
+
+        job_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job_id, user_id, image_data, future))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            return {'success': False, 'error': 'صف پردازش تصاویر پر است. لطفاً چند دقیقه دیگر تلاش کنید.'}
+
+        self._waiting[job_id] = user_id
+        self._user_jobs[user_id] = self._user_jobs.get(user_id, 0) + 1
+        self.stats['submitted'] += 1
+        return {
+            'success': True,
+            'job_id': job_id,
+            'future': future,
+            'position': self.position(job_id)
+        }
+
+    def position(self, job_id: int) -> int:
+        """جایگاه درخواست در صف (0 یعنی در حال پردازش یا آماده شروع)"""
+        if job_id not in self._waiting:
+            return 0
+        ahead = 0
+        for waiting_id in self._waiting:
+            if waiting_id == job_id:
+                break
+            ahead += 1
+        # worker های آزاد درخواست‌های ابتدای صف را بلافاصله برمی‌دارند
+        idle = self.workers - self._busy
+        return max(0, ahead + 1 - idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            workers=self.workers,
+            busy=self._busy,
+            queued=len(self._waiting),
+        )
+
+
+ocr_service = OCRJobService()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Price Alert Service
+هشدارهای قیمت کاربران (بالاتر از / پایین‌تر از / درصد تغییر)
+هشدارها در آرایه‌های مرتب per-symbol نگه داشته می‌شوند و در هر snapshot بازار
+با جستجوی دودویی (bisect) یکجا بررسی می‌شوند؛ هشدارهای فعال‌شده با یک دستور حذف می‌شوند
+"""
+
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from telegram.error import Forbidden, RetryAfter
+
+from services.market_snapshot_service import MarketSnapshot, market_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+ALERT_TYPES = ('above', 'below', 'percent')
+MAX_ALERTS_PER_USER = 20
+
+
+class _SortedThresholds:
+    """آرایه مرتب آستانه‌ها به همراه شناسه هشدار متناظر"""
+
+    __slots__ = ('levels', 'alert_ids')
+
+    def __init__(self):
+        self.levels = array('d')
+        self.alert_ids = array('q')
+
+    @classmethod
+    def from_pairs(cls, pairs: List[Tuple[float, int]]) -> '_SortedThresholds':
+        """ساخت یکجای آرایه از جفت‌های (سطح، شناسه) با یک بار مرتب‌سازی"""
+        thresholds = cls()
+        pairs.sort()
+        thresholds.levels = array('d', [level for level, _ in pairs])
+        thresholds.alert_ids = array('q', [alert_id for _, alert_id in pairs])
+        return thresholds
+
+    def insert(self, level: float, alert_id: int) -> None:
+        index = bisect_right(self.levels, level)
+        self.levels.insert(index, level)
+        self.alert_ids.insert(index, alert_id)
+
+    def remove(self, level: float, alert_id: int) -> None:
+        start = bisect_left(self.levels, level)
+        end = bisect_right(self.levels, level)
+        for index in range(start, end):
+            if self.alert_ids[index] == alert_id:
+                del self.levels[index]
+                del self.alert_ids[index]
+                return
+
+    def pop_prefix(self, end: int) -> List[int]:
+        """حذف و بازگرداندن شناسه‌های [0:end]"""
+        fired = self.alert_ids[:end].tolist()
+        del self.levels[:end]
+        del self.alert_ids[:end]
+        return fired
+
+    def pop_suffix(self, start: int) -> List[int]:
+        """حذف و بازگرداندن شناسه‌های [start:]"""
+        fired = self.alert_ids[start:].tolist()
+        del self.levels[start:]
+        del self.alert_ids[start:]
+        return fired
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+
+class PriceAlertIndex:
+    """
+    ایندکس هشدارها برای هر نماد:
+    - above: مرتب صعودی؛ با قیمت p همه آستانه‌های <= p فعال می‌شوند (پیشوند آرایه)
+    - below: مرتب صعودی؛ با قیمت p همه آستانه‌های >= p فعال می‌شوند (پسوند آرایه)
+    هشدار درصدی به صورت یک سطح above و یک سطح below ثبت می‌شود.
+    """
+
+    def __init__(self):
+        self._above: Dict[str, _SortedThresholds] = {}
+        self._below: Dict[str, _SortedThresholds] = {}
+        # alert_id -> اطلاعات هشدار و سطوح ثبت‌شده
+        self.alerts: Dict[int, Dict[str, Any]] = {}
+        self.user_alerts: Dict[int, set] = {}
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    @staticmethod
+    def levels_for(alert: Dict[str, Any]) -> List[Tuple[str, float]]:
+        alert_type = alert['alert_type']
+        threshold = float(alert['threshold'])
+        if alert_type == 'above':
+            return [('above', threshold)]
+        if alert_type == 'below':
+            return [('below', threshold)]
+        base_price = float(alert['base_price'])
+        return [('above', base_price * (1 + threshold / 100)), ('below', base_price * (1 - threshold / 100))]
+
+    def add(self, alert: Dict[str, Any]) -> None:
+        symbol = alert['symbol']
+        levels = self.levels_for(alert)
+        for side, level in levels:
+            book = self._above if side == 'above' else self._below
+            book.setdefault(symbol, _SortedThresholds()).insert(level, alert['id'])
+        self.alerts[alert['id']] = dict(alert, levels=levels)
+        self.user_alerts.setdefault(alert['user_id'], set()).add(alert['id'])
+
+    def add_many(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """
+        افزودن دسته‌ای هشدارها (بارگذاری اولیه)
+        سطوح هر نماد و جهت جمع‌آوری و یک بار مرتب می‌شوند تا درج تک‌تک در آرایه مرتب
+        (جابجایی آرایه در هر درج) تکرار نشود
+        """
+        pending: Dict[Tuple[str, str], List[Tuple[float, int]]] = {}
+        for alert in alerts:
+            levels = self.levels_for(alert)
+            for side, level in levels:
+                pending.setdefault((side, alert['symbol']), []).append((level, alert['id']))
+            self.alerts[alert['id']] = dict(alert, levels=levels)
+            self.user_alerts.setdefault(alert['user_id'], set()).add(alert['id'])
+
+        for (side, symbol), pairs in pending.items():
+            book = self._above if side == 'above' else self._below
+            existing = book.get(symbol)
+            if existing is not None:
+                pairs.extend(zip(existing.levels, existing.alert_ids))
+            book[symbol] = _SortedThresholds.from_pairs(pairs)
+
+    def remove(self, alert_id: int) -> Optional[Dict[str, Any]]:
+        alert = self.alerts.pop(alert_id, None)
+        if not alert:
+            return None
+        user_alerts = self.user_alerts.get(alert['user_id'])
+        if user_alerts is not None:
+            user_alerts.discard(alert_id)
+            if not user_alerts:
+                del self.user_alerts[alert['user_id']]
+        for side, level in alert['levels']:
+            book = self._above if side == 'above' else self._below
+            thresholds = book.get(alert['symbol'])
+            if thresholds is not None:
+                thresholds.remove(level, alert_id)
+        return alert
+
+    def symbols(self) -> List[str]:
+        return list(set(self._above) | set(self._below))
+
+    def collect_triggered(self, prices: Dict[str, float]) -> List[Dict[str, Any]]:
+        """پیدا کردن و حذف همه هشدارهای فعال‌شده برای قیمت‌های فعلی"""
+        fired_ids: List[int] = []
+        for symbol, price in prices.items():
+            above = self._above.get(symbol)
+            if above:
+                end = bisect_right(above.levels, price)
+                if end:
+                    fired_ids.extend(above.pop_prefix(end))
+            below = self._below.get(symbol)
+            if below:
+                start = bisect_left(below.levels, price)
+                if start < len(below):
+                    fired_ids.extend(below.pop_suffix(start))
+
+        fired = []
+        for alert_id in set(fired_ids):
+            # سطح دیگر هشدار درصدی هم باید حذف شود
+            alert = self.remove(alert_id)
+            if alert:
+                alert['triggered_price'] = prices[alert['symbol']]
+                fired.append(alert)
+        return fired
+
+
+class RateLimitedSender:
+    """ارسال پیام‌ها از صف با سقف نرخ (پیش‌فرض 25 پیام در ثانیه، زیر محدودیت تلگرام)"""
+
+    def __init__(self, rate_per_second: float = 25.0, max_queue: int = 100000):
+        self.interval = 1.0 / rate_per_second
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.bot = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'sent': 0, 'failed': 0, 'dropped': 0}
+
+    def start(self, bot) -> None:
+        self.bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def enqueue(self, chat_id: int, text: str, **kwargs: Any) -> bool:
+        try:
+            self.queue.put_nowait((chat_id, text, kwargs))
+            return True
+        except asyncio.QueueFull:
+            self.stats['dropped'] += 1
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            chat_id, text, kwargs = await self.queue.get()
+            started = time.monotonic()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                self.stats['sent'] += 1
+            except RetryAfter as e:
+                # تلگرام محدودیت اعمال کرده: صبر و تلاش مجدد
+                retry_after = e.retry_after
+                await asyncio.sleep(retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after))
+                self.enqueue(chat_id, text, **kwargs)
+            except Forbidden:
+                self.stats['failed'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.warning(f"⚠️ خطا در ارسال هشدار قیمت به {chat_id}: {e}")
+            finally:
+                self.queue.task_done()
+            elapsed = time.monotonic() - started
+            if elapsed < self.interval:
+                await asyncio.sleep(self.interval - elapsed)
+
+
+class PriceAlertService:
+    """مدیریت هشدارهای قیمت کاربران و بررسی آن‌ها روی هر snapshot بازار"""
+
+    def __init__(self):
+        self.db = None
+        self.index = PriceAlertIndex()
+        self.sender = RateLimitedSender()
+        self.stats = {'ticks': 0, 'fired': 0, 'last_check_ms': 0.0}
+
+    def set_db_manager(self, db_manager) -> None:
+        self.db = db_manager
+
+    def load(self) -> int:
+        """بارگذاری همه هشدارهای فعال از دیتابیس در ایندکس"""
+        if not self.db or not hasattr(self.db, 'load_price_alerts'):
+            return 0
+        self.index.add_many(self.db.load_price_alerts())
+        if len(self.index):
+            logger.info(f"🔔 {len(self.index)} هشدار قیمت بارگذاری شد")
+        return len(self.index)
+
+    def start(self, bot) -> None:
+        self.sender.start(bot)
+
+    async def stop(self) -> None:
+        await self.sender.stop()
+
+    # -----------------------------
+    # 📌 مدیریت هشدارهای کاربر
+    # -----------------------------
+    async def add_alert(self, user_id: int, symbol: str, alert_type: str, threshold: float) -> Dict[str, Any]:
+        """ثبت هشدار جدید؛ قیمت فعلی به عنوان مبنای هشدار درصدی ذخیره می‌شود"""
+        symbol = symbol.upper()
+        if alert_type not in ALERT_TYPES or threshold <= 0 or (alert_type == 'percent' and threshold >= 100):
+            return {'success': False, 'error': 'مقدار هشدار نامعتبر است'}
+
+        snapshot = await market_snapshot_service.get_snapshot()
+        current_price = _symbol_prices(snapshot).get(symbol)
+        if not current_price:
+            return {'success': False, 'error': f'نماد {symbol} در بین 250 ارز برتر پیدا نشد'}
+
+        if len(self.index.user_alerts.get(user_id, ())) >= MAX_ALERTS_PER_USER:
+            return {'success': False, 'error': f'حداکثر {MAX_ALERTS_PER_USER} هشدار فعال مجاز است'}
+
+        alert_id = await asyncio.to_thread(
+            self.db.add_price_alert, user_id, symbol, alert_type, threshold, current_price
+        )
+        if not alert_id:
+            return {'success': False, 'error': 'خطا در ذخیره هشدار'}
+
+        alert = {
+            'id': alert_id,
+            'user_id': user_id,
+            'symbol': symbol,
+            'alert_type': alert_type,
+            'threshold': threshold,
+            'base_price': current_price,
+        }
+        self.index.add(alert)
+        return {'success': True, 'alert': alert, 'current_price': current_price}
+
+    def get_user_alerts(self, user_id: int) -> List[Dict[str, Any]]:
+        return [self.index.alerts[alert_id] for alert_id in sorted(self.index.user_alerts.get(user_id, ()))]
+
+    async def remove_alert(self, user_id: int, alert_id: int) -> bool:
+        alert = self.index.alerts.get(alert_id)
+        if not alert or alert['user_id'] != user_id:
+            return False
+        self.index.remove(alert_id)
+        await asyncio.to_thread(self.db.delete_price_alerts, [alert_id])
+        return True
+
+    # -----------------------------
+    # 📌 بررسی روی هر snapshot
+    # -----------------------------
+    async def on_snapshot(self, snapshot: MarketSnapshot) -> None:
+        """بررسی یکجای هشدارها با قیمت‌های snapshot جدید"""
+        if not len(self.index):
+            return
+
+        started = time.monotonic()
+        all_prices = _symbol_prices(snapshot)
+        prices = {symbol: all_prices[symbol] for symbol in self.index.symbols() if symbol in all_prices}
+        fired = self.index.collect_triggered(prices)
+        self.stats['ticks'] += 1
+        self.stats['last_check_ms'] = round((time.monotonic() - started) * 1000, 2)
+
+        if not fired:
+            return
+
+        self.stats['fired'] += len(fired)
+        logger.info(f"🔔 {len(fired)} هشدار قیمت فعال شد ({self.stats['last_check_ms']}ms)")
+
+        # حذف همه هشدارهای فعال‌شده با یک دستور
+        if self.db and hasattr(self.db, 'delete_price_alerts'):
+            await asyncio.to_thread(self.db.delete_price_alerts, [alert['id'] for alert in fired])
+
+        for alert in fired:
+            self.sender.enqueue(alert['user_id'], format_alert_notification(alert))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            active_alerts=len(self.index),
+            queued=self.sender.queue.qsize(),
+            sent=self.sender.stats['sent'],
+            failed=self.sender.stats['failed'],
+        )
+
+
+def _symbol_prices(snapshot: MarketSnapshot) -> Dict[str, float]:
+    """نگاشت نماد به قیمت؛ برای نمادهای تکراری، ارز با رتبه بالاتر انتخاب می‌شود"""
+    prices: Dict[str, float] = {}
+    for coin in snapshot.coins:
+        symbol = (coin.get('symbol') or '').upper()
+        price = coin.get('current_price')
+        if symbol and price and symbol not in prices:
+            prices[symbol] = float(price)
+    return prices
+
+
+def format_price(value: float) -> str:
+    return f"${value:,.2f}" if value >= 1 else f"${value:.6f}"
+
+
+def describe_alert(alert: Dict[str, Any]) -> str:
+    """توضیح کوتاه هشدار برای لیست کاربر"""
+    if alert['alert_type'] == 'above':
+        return f"{alert['symbol']} بالاتر از {format_price(alert['threshold'])}"
+    if alert['alert_type'] == 'below':
+        return f"{alert['symbol']} پایین‌تر از {format_price(alert['threshold'])}"
+    return f"{alert['symbol']} تغییر {alert['threshold']:g}٪ از {format_price(alert['base_price'])}"
+
+
+def format_alert_notification(alert: Dict[str, Any]) -> str:
+    price = alert['triggered_price']
+    message = f"🔔 هشدار قیمت فعال شد!\n\n📌 {describe_alert(alert)}\n💵 قیمت فعلی: {format_price(price)}"
+    if alert['alert_type'] == 'percent' and alert.get('base_price'):
+        change = (price - alert['base_price']) / alert['base_price'] * 100
+        message += f" ({change:+.2f}%)"
+    return message
+
+
+price_alert_service = PriceAlertService()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Price History Service
+نگهداری تاریخچه قیمت هر ارز در ring buffer فشرده (array('d')) از روی snapshotهای بازار،
+ذخیره دوره‌ای در دیتابیس و رسم نمودار sparkline روزانه/هفتگی در process جداگانه
+"""
+
+import asyncio
+import io
+import logging
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.market_snapshot_service import SNAPSHOT_INTERVAL, MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+# تعداد ارزهای برتر (بر اساس market cap) که تاریخچه‌شان نگه داشته می‌شود
+PRICE_HISTORY_TOP_N = int(os.getenv('PRICE_HISTORY_TOP_N', '20'))
+
+# بازه‌های نمودار: (طول بازه به ثانیه، طول bucket کش به ثانیه، عنوان)
+CHART_WINDOWS: Dict[str, Tuple[int, int, str]] = {
+    '24h': (24 * 3600, 300, '24h'),
+    '7d': (7 * 24 * 3600, 3600, '7d'),
+}
+
+CHART_WIDTH = 800
+CHART_HEIGHT = 400
+
+
+class PriceRingBuffer:
+    """ring buffer با ظرفیت ثابت برای (زمان، قیمت) روی array('d')"""
+
+    __slots__ = ('capacity', 'timestamps', 'prices', 'head', 'count')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.prices = array('d', bytes(8 * capacity))
+        self.head = 0  # محل نوشتن بعدی
+        self.count = 0
+
+    def append(self, timestamp: float, price: float) -> None:
+        self.timestamps[self.head] = timestamp
+        self.prices[self.head] = price
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last_timestamp(self) -> float:
+        if not self.count:
+            return 0.0
+        return self.timestamps[(self.head - 1) % self.capacity]
+
+    def ordered(self) -> Tuple[array, array]:
+        """داده‌ها به ترتیب زمانی (قدیمی به جدید)"""
+        if self.count < self.capacity:
+            return self.timestamps[:self.count], self.prices[:self.count]
+        return (
+            self.timestamps[self.head:] + self.timestamps[:self.head],
+            self.prices[self.head:] + self.prices[:self.head],
+        )
+
+    def window(self, seconds: int, now: Optional[float] = None) -> Tuple[array, array]:
+        """نقاط داخل بازه زمانی اخیر"""
+        timestamps, prices = self.ordered()
+        cutoff = (now or time.time()) - seconds
+        # داده‌ها مرتب‌اند؛ اولین نقطه داخل بازه با جستجوی دودویی پیدا می‌شود
+        low, high = 0, len(timestamps)
+        while low < high:
+            mid = (low + high) // 2
+            if timestamps[mid] < cutoff:
+                low = mid + 1
+            else:
+                high = mid
+        return timestamps[low:], prices[low:]
+
+    def to_bytes(self) -> Tuple[bytes, bytes]:
+        timestamps, prices = self.ordered()
+        return timestamps.tobytes(), prices.tobytes()
+
+    @classmethod
+    def from_bytes(cls, capacity: int, timestamps_raw: bytes, prices_raw: bytes) -> 'PriceRingBuffer':
+        buffer = cls(capacity)
+        timestamps = array('d')
+        timestamps.frombytes(bytes(timestamps_raw))
+        prices = array('d')
+        prices.frombytes(bytes(prices_raw))
+        for timestamp, price in zip(timestamps[-capacity:], prices[-capacity:]):
+            buffer.append(timestamp, price)
+        return buffer
+
+
+def _downsample(values: List[float], target: int) -> List[float]:
+    """کاهش تعداد نقاط با میانگین هر bucket"""
+    if len(values) <= target:
+        return list(values)
+    step = len(values) / target
+    result = []
+    for i in range(target):
+        chunk = values[int(i * step):int((i + 1) * step)] or values[int(i * step):int(i * step) + 1]
+        result.append(sum(chunk) / len(chunk))
+    return result
+
+
+def render_sparkline_png(prices: List[float], title: str, width: int = CHART_WIDTH, height: int = CHART_HEIGHT) -> bytes:
+    """رسم نمودار sparkline با Pillow (در process جداگانه اجرا می‌شود)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    background = (18, 22, 33)
+    image = Image.new('RGB', (width, height), color=background)
+    draw = ImageDraw.Draw(image)
+
+    try:
+        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 22)
+        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
+    except Exception:
+        font = ImageFont.load_default()
+        small_font = ImageFont.load_default()
+
+    first, last = prices[0], prices[-1]
+    low, high = min(prices), max(prices)
+    span = (high - low) or max(abs(high) * 0.001, 1e-9)
+    change = ((last - first) / first * 100) if first else 0.0
+    line_color = (38, 194, 129) if last >= first else (234, 57, 67)
+    fill_color = tuple(int(c * 0.25 + b * 0.75) for c, b in zip(line_color, background))
+
+    left, right, top, bottom = 20, width - 20, 70, height - 40
+    step = (right - left) / max(1, len(prices) - 1)
+    points = [
+        (left + i * step, bottom - (price - low) / span * (bottom - top))
+        for i, price in enumerate(prices)
+    ]
+
+    draw.polygon(points + [(points[-1][0], bottom), (points[0][0], bottom)], fill=fill_color)
+    draw.line(points, fill=line_color, width=3)
+
+    def format_price(value: float) -> str:
+        return f"${value:,.2f}" if value >= 1 else f"${value:.6f}"
+
+    draw.text((left, 18), title, fill=(235, 235, 235), font=font)
+    change_text = f"{format_price(last)}  {change:+.2f}%"
+    change_width = draw.textbbox((0, 0), change_text, font=font)[2]
+    draw.text((right - change_width, 18), change_text, fill=line_color, font=font)
+    draw.text((left, bottom + 12), f"low {format_price(low)}", fill=(160, 160, 170), font=small_font)
+    high_text = f"high {format_price(high)}"
+    high_width = draw.textbbox((0, 0), high_text, font=small_font)[2]
+    draw.text((right - high_width, bottom + 12), high_text, fill=(160, 160, 170), font=small_font)
+
+    output = io.BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+class PriceHistoryService:
+    """تاریخچه قیمت ارزهای برتر و کش نمودارهای رسم‌شده"""
+
+    def __init__(self, interval: int = SNAPSHOT_INTERVAL, top_n: int = PRICE_HISTORY_TOP_N):
+        self.interval = interval
+        self.top_n = top_n
+        # ظرفیت کافی برای طولانی‌ترین بازه نمودار
+        longest_window = max(window for window, _, _ in CHART_WINDOWS.values())
+        self.capacity = math.ceil(longest_window / max(1, interval)) + 1
+        self.buffers: Dict[str, PriceRingBuffer] = {}
+        self.db = None
+        self._last_coingecko_time = 0.0
+        self._dirty = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # کش نمودار: (symbol, window) -> {'bucket', 'png'}
+        self._chart_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._rendering: Dict[Tuple[str, str, int], asyncio.Future] = {}
+
+    def set_db_manager(self, db_manager) -> None:
+        """تنظیم دیتابیس برای ذخیره دوره‌ای تاریخچه"""
+        self.db = db_manager
+
+    # -----------------------------
+    # 📌 دریافت snapshot
+    # -----------------------------
+    def on_snapshot(self, snapshot: MarketSnapshot) -> None:
+        """افزودن قیمت ارزهای برتر از snapshot جدید به ring buffer"""
+        coingecko_time = snapshot.source_times.get('coingecko', 0.0)
+        # snapshot کهنه (داده تکراری CoinGecko) ثبت نمی‌شود
+        if not coingecko_time or coingecko_time <= self._last_coingecko_time:
+            return
+        self._last_coingecko_time = coingecko_time
+
+        for coin in snapshot.coins:
+            rank = coin.get('market_cap_rank') or 0
+            price = coin.get('current_price')
+            symbol = (coin.get('symbol') or '').upper()
+            if not symbol or price is None or not rank or rank > self.top_n:
+                continue
+            buffer = self.buffers.get(symbol)
+            if buffer is None:
+                buffer = self.buffers[symbol] = PriceRingBuffer(self.capacity)
+            buffer.append(coingecko_time, float(price))
+        self._dirty = True
+
+    # -----------------------------
+    # 📌 ذخیره و بارگذاری
+    # -----------------------------
+    def load(self) -> int:
+        """بارگذاری تاریخچه ذخیره‌شده از دیتابیس"""
+        if not self.db or not hasattr(self.db, 'load_price_history'):
+            return 0
+        rows = self.db.load_price_history()
+        for row in rows:
+            self.buffers[row['symbol']] = PriceRingBuffer.from_bytes(
+                self.capacity, row['timestamps'], row['prices']
+            )
+        if rows:
+            self._last_coingecko_time = max(buffer.last_timestamp() for buffer in self.buffers.values())
+            logger.info(f"📈 تاریخچه قیمت {len(rows)} ارز بارگذاری شد")
+        return len(rows)
+
+    def _persist_sync(self) -> bool:
+        rows = [(symbol, *buffer.to_bytes()) for symbol, buffer in self.buffers.items()]
+        return self.db.save_price_history(rows)
+
+    async def persist(self) -> None:
+        """ذخیره دوره‌ای تاریخچه در دیتابیس (فقط در صورت تغییر)"""
+        if not self._dirty or not self.db or not hasattr(self.db, 'save_price_history'):
+            return
+        self._dirty = False
+        if not await asyncio.to_thread(self._persist_sync):
+            self._dirty = True
+
+    # -----------------------------
+    # 📌 نمودار
+    # -----------------------------
+    def has_symbol(self, symbol: str) -> bool:
+        buffer = self.buffers.get(symbol.upper())
+        return bool(buffer and buffer.count >= 2)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=1)
+            except Exception as e:
+                logger.warning(f"⚠️ ایجاد process برای رسم نمودار ممکن نشد: {e}")
+        return self._executor
+
+    async def _render(self, prices: List[float], title: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return await loop.run_in_executor(executor, render_sparkline_png, prices, title)
+            except Exception as e:
+                logger.warning(f"⚠️ رسم نمودار در process ناموفق بود، اجرای در thread: {e}")
+                self._executor = None
+        return await asyncio.to_thread(render_sparkline_png, prices, title)
+
+    async def get_chart(self, symbol: str, window: str) -> Optional[Dict[str, Any]]:
+        """
+        نمودار کش‌شده یا تازه برای (symbol, window) در bucket زمانی جاری
+
+        Returns:
+            {'bucket', 'png'} یا None اگر داده کافی نباشد
+        """
+        symbol = symbol.upper()
+        if window not in CHART_WINDOWS or not self.has_symbol(symbol):
+            return None
+
+        window_seconds, bucket_seconds, window_title = CHART_WINDOWS[window]
+        bucket = int(time.time() // bucket_seconds)
+        cache_key = (symbol, window)
+        cached = self._chart_cache.get(cache_key)
+        if cached and cached['bucket'] == bucket:
+            return cached
+
+        render_key = (symbol, window, bucket)
+        future = self._rendering.get(render_key)
+        if future is None:
+            _, prices = self.buffers[symbol].window(window_seconds)
+            if len(prices) < 2:
+                return None
+            future = asyncio.ensure_future(
+                self._render(_downsample(list(prices), CHART_WIDTH // 2), f"{symbol}/USD  {window_title}")
+            )
+            self._rendering[render_key] = future
+        try:
+            png = await asyncio.shield(future)
+        finally:
+            self._rendering.pop(render_key, None)
+
+        cached = self._chart_cache.get(cache_key)
+        if not cached or cached['bucket'] != bucket:
+            cached = {'bucket': bucket, 'png': png}
+            self._chart_cache[cache_key] = cached
+        return cached
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+price_history_service = PriceHistoryService()
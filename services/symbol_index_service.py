@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Symbol Index Service
+فهرست محلی نمادهای معتبر ارزها برای اعتبارسنجی جفت ارزها بدون درخواست شبکه
+نمادها از فهرست داخلی و snapshot بازار (۲۵۰ ارز برتر CoinGecko) ساخته می‌شوند؛
+اعتبارسنجی با یک جستجوی set و پیشنهادها با trie پیشوندی و difflib انجام می‌شود
+"""
+
+import difflib
+import logging
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from services.market_snapshot_service import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+QUOTE_ASSETS: Tuple[str, ...] = ('usdt',)
+
+# نمادهای پرمعامله که حتی بدون snapshot بازار معتبر هستند
+BUNDLED_BASES: Tuple[str, ...] = (
+    'btc', 'eth', 'bnb', 'sol', 'xrp', 'doge', 'ada', 'trx', 'avax', 'link',
+    'dot', 'ton', 'shib', 'ltc', 'bch', 'near', 'uni', 'apt', 'icp', 'etc',
+    'xlm', 'atom', 'fil', 'hbar', 'arb', 'op', 'inj', 'sui', 'sei', 'tia',
+    'matic', 'pol', 'vet', 'algo', 'aave', 'mkr', 'grt', 'rndr', 'render', 'imx',
+    'stx', 'ftm', 'sand', 'mana', 'axs', 'egld', 'theta', 'eos', 'xtz', 'flow',
+    'kas', 'ldo', 'crv', 'snx', 'comp', 'dydx', 'gala', 'ape', 'chz', 'enj',
+    'pepe', 'floki', 'bonk', 'wif', 'not', 'jup', 'pyth', 'wld', 'ondo', 'ena',
+    'trump', 'xmr', 'zec', 'dash', 'neo', 'iota', 'kava', 'rune', 'cake', 'one',
+    'zil', 'qtum', 'bat', 'zrx', 'ens', 'gmx', 'blur', 'ordi', 'fet', 'agix',
+    'ocean', 'tao', 'jasmy', 'cfx', 'ckb', 'rose', 'mina', 'celo', 'ar', 'hnt',
+)
+
+SYMBOL_PATTERN = re.compile(r'^[a-z]+$')
+
+
+class SymbolTrie:
+    """trie پیشوندی جفت ارزها برای پیشنهاد تکمیل ورودی‌های ناقص یا اشتباه"""
+
+    _END = '$'
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: Dict[str, dict] = {}
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word: str) -> None:
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[self._END] = word
+
+    def deepest_match(self, text: str) -> Tuple[int, Dict[str, dict]]:
+        """طولانی‌ترین پیشوند مشترک ورودی با trie و گره متناظر آن"""
+        node = self.root
+        depth = 0
+        for char in text:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return depth, node
+
+    def completions(self, node: Dict[str, dict], limit: int) -> List[str]:
+        """کلمات زیر یک گره به ترتیب طول (کوتاه‌ترین اول)"""
+        result: List[str] = []
+        level = [node]
+        while level and len(result) < limit:
+            next_level = []
+            for current in level:
+                word = current.get(self._END)
+                if word is not None:
+                    result.append(word)
+                next_level.extend(child for key, child in sorted(current.items()) if key != self._END)
+            level = next_level
+        return result[:limit]
+
+
+class SymbolIndex:
+    """فهرست نمادهای معتبر و جفت ارزهای قابل درخواست"""
+
+    def __init__(self, quotes: Tuple[str, ...] = QUOTE_ASSETS):
+        self.quotes = quotes
+        self._bases: FrozenSet[str] = frozenset()
+        self._pairs: FrozenSet[str] = frozenset()
+        self._pair_list: List[str] = []
+        self._trie = SymbolTrie()
+        self.snapshot_version: Optional[int] = None
+        self.stats = {'lookups': 0, 'rejected': 0, 'rebuilds': 0}
+        self.rebuild()
+
+    def rebuild(self, symbols: Iterable[str] = ()) -> bool:
+        """ساخت مجدد فهرست از نمادهای داخلی به همراه نمادهای داده‌شده؛ True اگر فهرست تغییر کند"""
+        bases = frozenset(BUNDLED_BASES) | frozenset(
+            symbol for symbol in (s.lower().strip() for s in symbols) if SYMBOL_PATTERN.match(symbol)
+        )
+        if bases == self._bases:
+            return False
+
+        pairs = frozenset(f"{base}{quote}" for base in bases for quote in self.quotes)
+        self._bases = bases
+        self._pairs = pairs
+        self._pair_list = sorted(pairs)
+        self._trie = SymbolTrie(self._pair_list)
+        self.stats['rebuilds'] += 1
+        logger.info(f"🔤 فهرست نمادها بروزرسانی شد: {len(bases)} نماد، {len(pairs)} جفت ارز")
+        return True
+
+    def on_snapshot(self, snapshot: MarketSnapshot) -> None:
+        """listener سرویس snapshot بازار: افزودن نمادهای ارزهای برتر"""
+        if not snapshot.coins or snapshot.version == self.snapshot_version:
+            return
+        self.snapshot_version = snapshot.version
+        self.rebuild(coin.get('symbol') or '' for coin in snapshot.coins)
+
+    def is_valid_pair(self, pair: str) -> bool:
+        """اعتبارسنجی O(1) جفت ارز (مثل btcusdt)"""
+        self.stats['lookups'] += 1
+        if pair in self._pairs:
+            return True
+        self.stats['rejected'] += 1
+        return False
+
+    def is_valid_symbol(self, symbol: str) -> bool:
+        return symbol.lower() in self._bases
+
+    def suggest(self, text: str, limit: int = 3) -> List[str]:
+        """
+        پیشنهاد جفت ارزهای نزدیک به ورودی
+
+        ابتدا تکمیل‌های طولانی‌ترین پیشوند مشترک در trie و سپس نزدیک‌ترین موارد difflib
+        """
+        text = re.sub(r'[^a-z]', '', text.lower())
+        if not text:
+            return []
+
+        suggestions: List[str] = []
+        depth, node = self._trie.deepest_match(text)
+        # پیشوند بسیار کوتاه (مثلاً فقط یک حرف) پیشنهاد مفیدی نمی‌دهد
+        if depth >= 2:
+            suggestions.extend(self._trie.completions(node, limit))
+
+        # ورودی بدون ارز مرجع (مثل btc) یا با ارز مرجع غلط‌تایپی
+        candidates = [text] if any(text.endswith(quote) for quote in self.quotes) else [
+            f"{text}{quote}" for quote in self.quotes
+        ]
+        for candidate in candidates:
+            if candidate in self._pairs and candidate not in suggestions:
+                suggestions.insert(0, candidate)
+            for match in difflib.get_close_matches(candidate, self._pair_list, n=limit, cutoff=0.75):
+                if match not in suggestions:
+                    suggestions.append(match)
+
+        return suggestions[:limit]
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, symbols=len(self._bases), pairs=len(self._pairs))
+
+
+symbol_index = SymbolIndex()